@@ -0,0 +1,129 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+
+# Сигнатура та версія формату файлу індексу
+MAGIC = b'ANTIDX01'
+
+class AntonymIndex:
+    def __init__(self, path):
+        # Відкриття файлу індексу та відображення його в пам'ять (без читання всього файлу)
+        self.path = path
+        with open(path, 'rb') as file:
+            self.mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Перевірка сигнатури файлу
+        if self.mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an antonym index file")
+
+        # Читання метаданих (префікси, з якими побудовано індекс)
+        position = len(MAGIC)
+        meta_len, = struct.unpack_from('<I', self.mm, position)
+        position += 4
+        self.metadata = json.loads(self.mm[position:position + meta_len].decode('utf-8'))
+        position += meta_len
+
+        # Кількість записів, таблиця зміщень рядків та початок даних
+        self.size, = struct.unpack_from('<I', self.mm, position)
+        self.offsets_start = position + 4
+        self.data_start = self.offsets_start + 4 * self.size
+
+    # Функція для читання запису з індексом i у вигляді пари (слово, значення)
+    def entry(self, i):
+        start = self.data_start + struct.unpack_from('<I', self.mm, self.offsets_start + 4 * i)[0]
+        end = self.mm.find(b'\n', start)
+        key, _, value = self.mm[start:end].partition(b'\t')
+        return key, value
+
+    # Функція для пошуку антоніма або негативної форми слова (None, якщо слова немає в індексі)
+    def lookup(self, word):
+        key = word.encode('utf-8')
+        low, high = 0, self.size
+
+        # Бінарний пошук по відсортованих словах
+        while low < high:
+            middle = (low + high) // 2
+            middle_key, value = self.entry(middle)
+            if middle_key < key:
+                low = middle + 1
+            elif middle_key > key:
+                high = middle
+            else:
+                # Порожнє значення означає, що слово залишається без змін
+                return value.decode('utf-8') if value else word
+        return None
+
+    # Функція для закриття відображення файлу
+    def close(self):
+        self.mm.close()
+
+    def __len__(self):
+        return self.size
+
+    # Під час серіалізації зберігається лише шлях до файлу індексу
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+# Функція для запису індексу у файл
+def write_antonym_index(entries, path, metadata):
+    # Записи сортуються за байтами UTF-8, як і під час бінарного пошуку
+    entries = sorted((key.encode('utf-8'), value.encode('utf-8') if value != key else b'')
+                     for key, value in entries.items())
+    meta = json.dumps(metadata).encode('utf-8')
+
+    offsets = []
+    data = bytearray()
+    for key, value in entries:
+        offsets.append(len(data))
+        data += key + b'\t' + value + b'\n'
+
+    with open(path, 'wb') as file:
+        file.write(MAGIC)
+        file.write(struct.pack('<I', len(meta)))
+        file.write(meta)
+        file.write(struct.pack('<I', len(offsets)))
+        file.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        file.write(data)
+
+# Функція для побудови індексу з WordNet та слів корпусу
+def build_antonym_index(path="models/antonyms.idx", corpus_files=()):
+    from nltk.corpus import wordnet
+    from text_preprocessing import TextPreprocessor
+
+    # Індекс будується з живими запитами до WordNet
+    textPreprocessor = TextPreprocessor(antonym_index_path=None)
+
+    # Словник WordNet
+    words = set(wordnet.all_lemma_names())
+
+    # Слова з корпусів після очищення та токенізації, як під час передбачення
+    for corpus_file in corpus_files:
+        if corpus_file.endswith('.csv'):
+            import pandas as pd
+            texts = pd.read_csv(corpus_file, delimiter='\t', encoding='utf-8')['text']
+        else:
+            with open(corpus_file, 'r', encoding='utf-8') as file:
+                texts = file.read().split('\n')
+        for text in texts:
+            text = textPreprocessor.cleaning_text(text)
+            if text is not None:
+                words.update(textPreprocessor.tokenize(text))
+
+    # Обчислення антоніма або негативної форми для кожного слова за поточними правилами
+    entries = {word: textPreprocessor.wordnet_antonym(word) for word in words if '\t' not in word and '\n' not in word}
+    write_antonym_index(entries, path, {'n_prefixes': textPreprocessor.n_prefixes})
+    print(f"Antonym index with {len(entries)} words saved to {path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the antonym / negative-form index from WordNet")
+    parser.add_argument('--output', default="models/antonyms.idx")
+    parser.add_argument('--corpus', nargs='*', default=[], help=".txt files or tab-separated .csv files with a 'text' column")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    build_antonym_index(args.output, args.corpus)
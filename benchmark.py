@@ -0,0 +1,648 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Функція для читання рядків текстового файлу
+def read_lines(file_path):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return [line.replace('\n', '') for line in file if line]
+
+# Функція для читання текстів з CSV датасету або з текстового файлу
+def read_texts(file_path, column='text'):
+    if file_path.endswith('.csv'):
+        import pandas as pd
+        return pd.read_csv(file_path, delimiter='\t', encoding='utf-8')[column].tolist()
+    return read_lines(file_path)
+
+# Функція для виведення результату вимірювання
+def report(name, n_lines, seconds):
+    print(f"{name:<24}{n_lines:>10} lines{seconds:>10.3f} s{n_lines / seconds:>12.1f} lines/s")
+
+# Порівняння пропускної здатності пакетного передбачення з циклом по рядках
+def benchmark_batch(args):
+    from log_model import MultinomialLR
+
+    # Кеш передбачень вимкнено, щоб повторні рядки не впливали на вимірювання
+    mlr = MultinomialLR(cache_size=0)
+    lines = read_lines(args.file) * args.repeat
+
+    # Прогрів моделі та ресурсів NLTK перед вимірюванням
+    mlr.predict_ton(lines[0])
+
+    # Передбачення тональності по одному рядку
+    start = time.perf_counter()
+    loop_predictions = [mlr.predict_ton(line) for line in lines]
+    loop_time = time.perf_counter() - start
+
+    # Передбачення тональності пакетами
+    start = time.perf_counter()
+    batch_predictions = mlr.predict_batch(lines, batch_size=args.batch_size)
+    batch_time = time.perf_counter() - start
+
+    report("per-line predict_ton", len(lines), loop_time)
+    report(f"predict_batch ({args.batch_size})", len(lines), batch_time)
+    print(f"Speedup: {loop_time / batch_time:.2f}x")
+
+    # Перевірка, що обидва способи дають однакові мітки
+    mismatches = sum(a != b for a, b in zip(loop_predictions, batch_predictions))
+    print(f"Mismatched labels: {mismatches}")
+
+# Масштабування паралельної попередньої обробки від 1 до N процесів
+def benchmark_preprocess(args):
+    from parallel_preprocessing import ParallelPreprocessor
+
+    texts = read_texts(args.file) * args.repeat
+    max_workers = args.max_workers or os.cpu_count() or 1
+
+    # Кількості процесів для вимірювання: 1, 2, 4, ..., max_workers
+    worker_counts = [1]
+    while worker_counts[-1] * 2 < max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if max_workers > 1:
+        worker_counts.append(max_workers)
+
+    reference = None
+    serial_time = None
+    for n_workers in worker_counts:
+        with ParallelPreprocessor(n_workers=n_workers, chunk_size=args.chunk_size) as engine:
+            # Вимірювання без урахування запуску процесів та завантаження WordNet
+            start = time.perf_counter()
+            cleaned = engine.map('cleaning_text', texts)
+            negated = engine.map('detect_negations', cleaned)
+            result = (cleaned, negated, engine.map('lemmatize', negated), engine.map('stem', negated))
+            elapsed = time.perf_counter() - start
+
+        if reference is None:
+            reference, serial_time = result, elapsed
+
+        report(f"{n_workers} worker(s)", len(texts), elapsed)
+        print(f"{'':<24}speedup {serial_time / elapsed:.2f}x, identical to serial: {result == reference}")
+
+# Мікробенчмарк швидкого очищення тексту та перевірка ідентичності результату
+def benchmark_cleaning(args):
+    from text_preprocessing import TextPreprocessor
+
+    texts = [text for text in read_texts(args.file) if type(text) is str] * args.repeat
+    default_preprocessor = TextPreprocessor()
+    fast_preprocessor = TextPreprocessor(fast_cleaning=True)
+
+    # Вимірювання часу обох режимів очищення
+    timings = {}
+    results = {}
+    for name, preprocessor in (('cleaning_text', default_preprocessor), ('fast cleaning_text', fast_preprocessor)):
+        start = time.perf_counter()
+        results[name] = [preprocessor.cleaning_text(text) for text in texts]
+        timings[name] = time.perf_counter() - start
+        report(name, len(texts), timings[name])
+        print(f"{'':<24}{timings[name] / len(texts) * 1e6:.2f} us/tweet")
+
+    print(f"Speedup: {timings['cleaning_text'] / timings['fast cleaning_text']:.2f}x")
+
+    # Перевірка побайтової ідентичності результатів
+    mismatches = [(text, a, b) for text, a, b in zip(texts, results['cleaning_text'], results['fast cleaning_text']) if a != b]
+    print(f"Mismatched outputs: {len(mismatches)}")
+    for text, a, b in mismatches[:10]:
+        print(f"  {text!r}\n    default: {a!r}\n    fast:    {b!r}")
+
+# Код, що виконується в новому процесі для вимірювання холодного старту
+STARTUP_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from log_model import MultinomialLR
+imported = time.perf_counter()
+mlr = MultinomialLR(cache_size=0)
+created = time.perf_counter()
+mlr.predict_ton({text!r})
+predicted = time.perf_counter()
+print(json.dumps({{'import': imported - start, 'construct': created - imported,
+                  'first prediction': predicted - created, 'time to first prediction': predicted - start}}))
+"""
+
+# Вимірювання часу імпорту та часу до першого передбачення в новому процесі
+def benchmark_startup(args):
+    runs = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT.format(text=args.text)],
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        result['process total'] = time.perf_counter() - start
+        runs.append(result)
+
+    # Медіана та мінімум по всіх запусках
+    for name in runs[0]:
+        values = [run[name] for run in runs]
+        print(f"{name:<28}median {statistics.median(values) * 1000:>9.1f} ms   min {min(values) * 1000:>9.1f} ms")
+
+# Порівняння завантаження артефакту моделі з joblib та перевірка еквівалентності передбачень
+def benchmark_artifact(args):
+    import joblib
+    import numpy as np
+    from log_model import MODEL_PATH, MultinomialLR
+    from model_artifact import ModelArtifact
+    from text_vectorizing import VECTORIZER_PATH
+
+    # Експорт артефакту з поточних файлів joblib
+    joblib_model = MultinomialLR(cache_size=0)
+    joblib_model.export_artifact(args.path)
+
+    # Час завантаження файлів joblib
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        joblib.load(VECTORIZER_PATH)
+        joblib.load(MODEL_PATH)
+    print(f"{'joblib.load':<32}{(time.perf_counter() - start) / args.repeat * 1000:>10.2f} ms")
+
+    # Час відображення артефакту в пам'ять та відновлення об'єктів sklearn
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        ModelArtifact(args.path)
+    print(f"{'ModelArtifact (mmap)':<32}{(time.perf_counter() - start) / args.repeat * 1000:>10.2f} ms")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        ModelArtifact(args.path).to_sklearn()
+    print(f"{'ModelArtifact.to_sklearn':<32}{(time.perf_counter() - start) / args.repeat * 1000:>10.2f} ms")
+
+    # Порівняння передбачень моделі з joblib та з артефакту
+    lines = read_lines(args.file)
+    artifact_model = MultinomialLR(cache_size=0, artifact_path=args.path)
+    expected = joblib_model.predict_proba_batch(lines)
+    actual = artifact_model.predict_proba_batch(lines)
+    print(f"Mismatched labels on {args.file}: {int(np.sum(expected.argmax(axis=1) != actual.argmax(axis=1)))} of {len(lines)}")
+    print(f"Max probability difference: {np.max(np.abs(expected - actual)) if len(lines) else 0.0:.3g}")
+
+# Затримка рушія NumPy порівняно з sklearn для пакетів розміром 1, 64 та 4096
+def benchmark_numpy(args):
+    import numpy as np
+    from log_model import MultinomialLR
+    from numpy_inference import FLOAT32_TOLERANCE, FLOAT64_TOLERANCE, NumpyInferenceEngine
+
+    mlr = MultinomialLR(cache_size=0)
+    vectorizer = mlr.vectorizer
+
+    # Попередньо оброблені тексти (однакові для обох рушіїв)
+    texts = vectorizer.preprocess_cleaned_texts([vectorizer.textPreprocessor.cleaning_text(line) for line in read_lines(args.file)])
+
+    engines = {'numpy float64': (NumpyInferenceEngine.from_sklearn(vectorizer.vectorizer, mlr.mlr, 'float64'), FLOAT64_TOLERANCE),
+               'numpy float32': (NumpyInferenceEngine.from_sklearn(vectorizer.vectorizer, mlr.mlr, 'float32'), FLOAT32_TOLERANCE)}
+
+    # Перевірка еквівалентності на всіх текстах
+    expected = mlr.mlr.predict_proba(vectorizer.vectorizer.transform(texts))
+    for name, (engine, tolerance) in engines.items():
+        actual = engine.predict_proba(texts)
+        labels_match = np.array_equal(expected.argmax(axis=1), actual.argmax(axis=1))
+        difference = float(np.max(np.abs(expected - actual))) if len(texts) else 0.0
+        print(f"{name}: labels identical: {labels_match}, max probability difference {difference:.3g} (tolerance {tolerance:g})")
+
+    # Вимірювання затримки для кожного розміру пакета
+    for batch_size in args.batch_sizes:
+        batch = (texts * (batch_size // max(len(texts), 1) + 1))[:batch_size]
+        repeat = max(1, args.budget // batch_size)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            mlr.mlr.predict_proba(vectorizer.vectorizer.transform(batch))
+        print(f"batch {batch_size:>5}  {'sklearn':<16}{(time.perf_counter() - start) / repeat * 1000:>10.3f} ms/batch")
+
+        for name, (engine, _) in engines.items():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                engine.predict_proba(batch)
+            print(f"batch {batch_size:>5}  {name:<16}{(time.perf_counter() - start) / repeat * 1000:>10.3f} ms/batch")
+
+# Порівняння точності, пам'яті та швидкості TF-IDF зі словником та хешування ознак
+def benchmark_hashing(args):
+    import pickle
+    import pandas as pd
+    from sklearn.metrics import accuracy_score, f1_score
+    from sklearn.model_selection import train_test_split
+    from log_model import MultinomialLR
+    from text_vectorizing import TextVectorizer
+
+    # Попередньо оброблений датасет (без SMOTE, однаковий розподіл для всіх векторизаторів)
+    dataset = pd.read_csv(args.file, delimiter='\t', encoding='utf-8').dropna()
+    texts_train, texts_test, y_train, y_test = train_test_split(dataset["neg_cleaned_text"].tolist(),
+                                                                dataset["label"],
+                                                                stratify=dataset["label"],
+                                                                test_size=0.2,
+                                                                random_state=42)
+
+    configurations = [('tfidf (vocabulary)', TextVectorizer(load=False))]
+    for n_features in args.n_features:
+        configurations.append((f'hashing 2^{n_features.bit_length() - 1}', TextVectorizer(load=False, hashing=True, n_features=n_features)))
+
+    print(f"{'vectorizer':<22}{'features':>10}{'accuracy':>10}{'macro F1':>10}{'size MB':>10}{'fit s':>8}{'lines/s':>12}")
+    for name, textVectorizer in configurations:
+        textVectorizer.set_vectorizer()
+        vectorizer = textVectorizer.vectorizer
+
+        # Навчання векторизатора та класифікатора
+        start = time.perf_counter()
+        X_train = vectorizer.fit_transform(texts_train)
+        fit_time = time.perf_counter() - start
+        classifier = MultinomialLR.build_classifier()
+        classifier.fit(X_train, y_train)
+
+        # Пропускна здатність векторизації та передбачення
+        start = time.perf_counter()
+        y_pred = classifier.predict(vectorizer.transform(texts_test))
+        throughput = len(texts_test) / (time.perf_counter() - start)
+
+        # Розмір серіалізованого векторизатора та коефіцієнтів моделі
+        size = (len(pickle.dumps(vectorizer)) + classifier.coef_.nbytes) / 2 ** 20
+        print(f"{name:<22}{X_train.shape[1]:>10}{accuracy_score(y_test, y_pred):>10.4f}"
+              f"{f1_score(y_test, y_pred, average='macro'):>10.4f}{size:>10.2f}{fit_time:>8.2f}{throughput:>12.1f}")
+
+# Фрагменти для синтетичного корпусу твітів (скорочення, заперечення, згадки, хештеги, посилання)
+SYNTHETIC_FRAGMENTS = ["don't", "can't", "isn't", "I'm", "you're", "won't", "not", "never", "no",
+                       "@user", "#happy", "#fail", "http://t.co/abc123", "www.example.com", "2017", "!!!", "?", ":)"]
+
+# Функція для створення синтетичного корпусу твітів зі слів заданих текстів
+def synthetic_tweets(texts, n_tweets, seed=42):
+    rng = random.Random(seed)
+    words = [word for text in texts for word in text.split()] or ["good"]
+    tweets = []
+    for _ in range(n_tweets):
+        tokens = [rng.choice(SYNTHETIC_FRAGMENTS) if rng.random() < 0.2 else rng.choice(words)
+                  for _ in range(rng.randint(5, 25))]
+        tweets.append(' '.join(tokens))
+    return tweets
+
+# Функція для вимірювання етапу: затримка кожного виклику, пропускна здатність та пік пам'яті
+def measure_stage(function, inputs, memory_sample=1000):
+    outputs = []
+    latencies = []
+    start = time.perf_counter()
+    for value in inputs:
+        call_start = time.perf_counter()
+        outputs.append(function(value))
+        latencies.append(time.perf_counter() - call_start)
+    total = time.perf_counter() - start
+
+    # Пік пам'яті вимірюється окремим проходом, бо tracemalloc сповільнює виконання
+    tracemalloc.start()
+    for value in inputs[:memory_sample]:
+        function(value)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    latencies.sort()
+    def percentile(q):
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+
+    result = {'n': len(inputs),
+              'seconds': total,
+              'throughput': len(inputs) / total if total > 0 else 0.0,
+              'p50_ms': percentile(0.5),
+              'p95_ms': percentile(0.95),
+              'p99_ms': percentile(0.99),
+              'peak_memory_kb': peak / 1024}
+    return result, outputs
+
+# Функція для вимірювання всіх етапів конвеєра на одному корпусі
+def run_stages(texts, train=False):
+    import contractions
+    from log_model import MultinomialLR
+
+    mlr = MultinomialLR(cache_size=0)
+    textPreprocessor = mlr.vectorizer.textPreprocessor
+    # Прогрів моделі та ресурсів NLTK
+    mlr.predict_ton(texts[0])
+
+    results = {}
+    # Функція для вимірювання етапу з порожніми кешами TextPreprocessor
+    def stage(name, function, inputs):
+        textPreprocessor.clear_caches()
+        results[name], outputs = measure_stage(function, inputs)
+        return outputs
+
+    cleaned = stage('cleaning_text', textPreprocessor.cleaning_text, texts)
+    stage('contractions.fix', contractions.fix, texts)
+    negated = stage('detect_negations', textPreprocessor.detect_negations, cleaned)
+    stage('remove_stop_words', textPreprocessor.remove_stop_words, cleaned)
+    stage('lemmatize', textPreprocessor.lemmatize, negated)
+    stage('stem', textPreprocessor.stem, negated)
+    vectors = stage('vectorize_text', mlr.vectorizer.vectorize_text, texts)
+    stage('predict_proba', mlr.mlr.predict_proba, vectors)
+    stage('predict_ton', mlr.predict_ton, texts)
+
+    # Навчання моделі без показу матриці помилок та без перезапису збережених моделей
+    if train:
+        stage('train_model', lambda _: MultinomialLR(cache_size=0).train_model(draw=False, save=False, use_cache=False), [None])
+
+    return results
+
+# Функція для порівняння результатів з базовими (повертає список сповільнених етапів)
+def find_regressions(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get('stages', {}).get(name)
+        if expected is None or result['throughput'] == 0:
+            continue
+        # Сповільнення: у скільки разів зменшилась пропускна здатність відносно базової
+        slowdown = expected['throughput'] / result['throughput'] - 1
+        if slowdown > threshold:
+            regressions.append((name, slowdown))
+    return regressions
+
+# Вимірювання кожного етапу конвеєра з порогами регресії продуктивності
+def benchmark_stages(args):
+    texts = [text for text in read_lines(args.file) if text.strip()]
+    corpora = {'test': texts * args.repeat,
+               'synthetic': synthetic_tweets(texts, args.synthetic_size)}
+
+    results = {}
+    for corpus_name, corpus in corpora.items():
+        for name, result in run_stages(corpus, train=args.train and corpus_name == 'test').items():
+            results[f"{corpus_name}/{name}"] = result
+
+    print(f"{'stage':<32}{'n':>8}{'lines/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'peak KB':>10}")
+    for name, result in results.items():
+        print(f"{name:<32}{result['n']:>8}{result['throughput']:>12.1f}{result['p50_ms']:>10.3f}"
+              f"{result['p95_ms']:>10.3f}{result['p99_ms']:>10.3f}{result['peak_memory_kb']:>10.1f}")
+
+    # Збереження результатів як нових базових значень
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as file:
+            json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                       'python': platform.python_version(),
+                       'platform': platform.platform(),
+                       'stages': results}, file, indent=4)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    # Порівняння з базовими значеннями: код завершення 1, якщо є сповільнені етапи
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = find_regressions(results, baseline, args.threshold)
+        for name, slowdown in regressions:
+            print(f"REGRESSION {name}: {slowdown * 100:.1f}% slower than baseline (threshold {args.threshold * 100:.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"No stage is more than {args.threshold * 100:.0f}% slower than {args.baseline}")
+
+# Профілювання одного пакета: таймери етапів, статистика кешів та знімки стеку
+def benchmark_profile(args):
+    import instrumentation
+    from log_model import MultinomialLR
+
+    mlr = MultinomialLR(cache_size=0)
+    lines = read_lines(args.file) * args.repeat
+    # Прогрів моделі та ресурсів NLTK
+    mlr.predict_ton(lines[0])
+
+    instrumentation.instrument_model(mlr)
+    instrumentation.metrics.reset()
+    instrumentation.enable()
+    try:
+        with instrumentation.SamplingProfiler(args.interval / 1000) as profiler:
+            mlr.predict_batch(lines, batch_size=args.batch_size)
+    finally:
+        instrumentation.disable()
+
+    # Таймери етапів від найбільшого сумарного часу
+    timers = instrumentation.metrics.snapshot()['timers']
+    print(f"{'stage':<44}{'calls':>10}{'total s':>10}{'mean ms':>10}{'p99 ms':>10}")
+    for name, timer in sorted(timers.items(), key=lambda item: -item[1]['total_seconds']):
+        print(f"{name:<44}{timer['count']:>10}{timer['total_seconds']:>10.3f}"
+              f"{timer['mean_seconds'] * 1000:>10.3f}{timer['p99_seconds'] * 1000:>10.3f}")
+
+    print(f"\nCaches: {json.dumps(instrumentation.metrics.snapshot()['collectors'], indent=4)}\n")
+    print(profiler.report(args.top))
+    if args.collapsed:
+        profiler.save_collapsed(args.collapsed)
+        print(f"Collapsed stacks saved to {args.collapsed}")
+
+# Порівняння стратегій балансування класів: час навчання, пік пам'яті та macro F1
+def benchmark_rebalance(args):
+    import warnings
+    import pandas as pd
+    from sklearn.exceptions import ConvergenceWarning
+    from sklearn.metrics import f1_score
+    from sklearn.model_selection import train_test_split
+    from log_model import MultinomialLR
+    from rebalancing import class_weight_params, rebalance
+    from text_vectorizing import TextVectorizer
+
+    # Датасет розділяється до балансування, тому синтетичні приклади не потрапляють у тестовий набір
+    dataset = pd.read_csv(args.file, delimiter='\t', encoding='utf-8').dropna()
+    texts_train, texts_test, y_train, y_test = train_test_split(dataset["neg_cleaned_text"].tolist(),
+                                                                dataset["label"].to_numpy(),
+                                                                stratify=dataset["label"],
+                                                                test_size=0.2,
+                                                                random_state=42)
+    textVectorizer = TextVectorizer(load=False)
+    textVectorizer.set_vectorizer()
+    X_train = textVectorizer.vectorizer.fit_transform(texts_train)
+    X_test = textVectorizer.vectorizer.transform(texts_test)
+    print(f"{X_train.shape[0]} training rows, {X_train.shape[1]} features")
+
+    print(f"{'strategy':<20}{'rows':>9}{'resample s':>12}{'fit s':>9}{'peak MB':>10}{'macro F1':>10}")
+    for strategy in args.strategies:
+        # Пік пам'яті балансування та навчання (масиви NumPy та SciPy враховуються tracemalloc)
+        tracemalloc.start()
+        start = time.perf_counter()
+        X_resampled, y_resampled = rebalance(X_train, y_train, strategy)
+        resample_time = time.perf_counter() - start
+
+        classifier = MultinomialLR.build_classifier(**class_weight_params(strategy))
+        start = time.perf_counter()
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', ConvergenceWarning)
+            classifier.fit(X_resampled, y_resampled)
+        fit_time = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        macro_f1 = f1_score(y_test, classifier.predict(X_test), average='macro')
+        print(f"{strategy:<20}{X_resampled.shape[0]:>9}{resample_time:>12.2f}{fit_time:>9.2f}"
+              f"{peak / 2 ** 20:>10.1f}{macro_f1:>10.4f}")
+
+# Зменшення словника до k ознак: розмір, час завантаження, затримка та точність
+def benchmark_prune(args):
+    import pickle
+    import pandas as pd
+    from sklearn.metrics import accuracy_score, f1_score
+    from sklearn.model_selection import train_test_split
+    from log_model import MultinomialLR
+    from model_pruning import prune_model
+    from text_vectorizing import TextVectorizer
+
+    # Повна модель навчається на навчальній частині, точність перевіряється на відкладеній
+    dataset = pd.read_csv(args.file, delimiter='\t', encoding='utf-8').dropna()
+    texts_train, texts_test, y_train, y_test = train_test_split(dataset["neg_cleaned_text"].tolist(),
+                                                                dataset["label"].to_numpy(),
+                                                                stratify=dataset["label"],
+                                                                test_size=0.2,
+                                                                random_state=42)
+    textVectorizer = TextVectorizer(load=False)
+    textVectorizer.set_vectorizer()
+    vectorizer = textVectorizer.vectorizer
+    classifier = MultinomialLR.build_classifier().fit(vectorizer.fit_transform(texts_train), y_train)
+
+    configurations = [('full', vectorizer, classifier)]
+    for k in args.k:
+        if k < len(vectorizer.vocabulary_):
+            start = time.perf_counter()
+            # Перенавчання без балансування, як і повна модель
+            pruned_vectorizer, pruned_classifier = prune_model(vectorizer, classifier, texts_train, y_train, k,
+                                                               args.method, not args.no_refit, rebalance=None)
+            print(f"pruned to {k} features in {time.perf_counter() - start:.2f} s")
+            configurations.append((f'{args.method} k={k}', pruned_vectorizer, pruned_classifier))
+
+    print(f"{'model':<18}{'features':>10}{'size MB':>9}{'load ms':>9}{'ms/1000':>9}{'accuracy':>10}{'macro F1':>10}")
+    for name, model_vectorizer, model_classifier in configurations:
+        data = pickle.dumps((model_vectorizer, model_classifier))
+
+        # Час завантаження серіалізованої пари
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            pickle.loads(data)
+        load_time = (time.perf_counter() - start) / args.repeat
+
+        # Затримка векторизації та передбачення тестових текстів
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            y_pred = model_classifier.predict(model_vectorizer.transform(texts_test))
+        latency = (time.perf_counter() - start) / args.repeat / len(texts_test) * 1000
+
+        print(f"{name:<18}{len(model_vectorizer.vocabulary_):>10}{len(data) / 2 ** 20:>9.2f}{load_time * 1000:>9.1f}"
+              f"{latency * 1000:>9.1f}{accuracy_score(y_test, y_pred):>10.4f}{f1_score(y_test, y_pred, average='macro'):>10.4f}")
+
+# Пропускна здатність швидкого токенізатора та звіт про відмінності токенів від word_tokenize
+def benchmark_tokenizer(args):
+    import difflib
+    from collections import Counter
+    from text_preprocessing import TextPreprocessor
+
+    # Токенізатор отримує очищений текст, як у process_document
+    cleaner = TextPreprocessor(fast_cleaning=True)
+    texts = [cleaner.cleaning_text(text) for text in read_texts(args.file) if type(text) is str]
+    texts = [text for text in texts if text is not None] * args.repeat
+
+    timings = {}
+    results = {}
+    for tokenizer in ('nltk', 'regex'):
+        textPreprocessor = TextPreprocessor(tokenizer=tokenizer)
+        start = time.perf_counter()
+        results[tokenizer] = [textPreprocessor.tokenize(text) for text in texts]
+        timings[tokenizer] = time.perf_counter() - start
+        report(f"{tokenizer} tokenize", len(texts), timings[tokenizer])
+
+    print(f"Speedup: {timings['nltk'] / timings['regex']:.2f}x")
+
+    # Відмінні ділянки токенів: (токени word_tokenize, токени regex) -> кількість
+    differences = Counter()
+    n_mismatched = 0
+    for expected, actual in zip(results['nltk'], results['regex']):
+        if expected != actual:
+            n_mismatched += 1
+            matcher = difflib.SequenceMatcher(None, expected, actual, autojunk=False)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                if tag != 'equal':
+                    differences[(' '.join(expected[i1:i2]), ' '.join(actual[j1:j2]))] += 1
+
+    print(f"Texts with different tokens: {n_mismatched} of {len(texts)}")
+    for (expected, actual), count in differences.most_common(args.top):
+        print(f"{count:>8}  nltk: {expected!r:<30} regex: {actual!r}")
+
+# Словник доступних бенчмарків
+BENCHMARKS = {
+    'batch': benchmark_batch,
+    'preprocess': benchmark_preprocess,
+    'cleaning': benchmark_cleaning,
+    'startup': benchmark_startup,
+    'artifact': benchmark_artifact,
+    'numpy': benchmark_numpy,
+    'hashing': benchmark_hashing,
+    'stages': benchmark_stages,
+    'profile': benchmark_profile,
+    'rebalance': benchmark_rebalance,
+    'prune': benchmark_prune,
+    'tokenizer': benchmark_tokenizer,
+}
+
+# Функція для створення парсера аргументів командного рядка
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmarks for the tonality analysis pipeline")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    batch_parser = subparsers.add_parser('batch', help="per-line loop vs predict_batch throughput")
+    batch_parser.add_argument('--file', default='test.txt')
+    batch_parser.add_argument('--repeat', type=int, default=1)
+    batch_parser.add_argument('--batch-size', type=int, default=1000)
+
+    preprocess_parser = subparsers.add_parser('preprocess', help="parallel preprocessing scaling from 1 to N workers")
+    preprocess_parser.add_argument('--file', default='test.txt', help=".txt file or tab-separated .csv with a 'text' column")
+    preprocess_parser.add_argument('--repeat', type=int, default=1)
+    preprocess_parser.add_argument('--max-workers', type=int, default=None)
+    preprocess_parser.add_argument('--chunk-size', type=int, default=500)
+
+    cleaning_parser = subparsers.add_parser('cleaning', help="fast vs default cleaning_text speed and equivalence")
+    cleaning_parser.add_argument('--file', default='test.txt', help=".txt file or tab-separated .csv with a 'text' column")
+    cleaning_parser.add_argument('--repeat', type=int, default=1)
+
+    startup_parser = subparsers.add_parser('startup', help="cold-start import time and time-to-first-prediction")
+    startup_parser.add_argument('--repeat', type=int, default=5)
+    startup_parser.add_argument('--text', default="What a great day!!! Looks like dream.")
+
+    artifact_parser = subparsers.add_parser('artifact', help="model artifact vs joblib load time and prediction equivalence")
+    artifact_parser.add_argument('--path', default="models/artifact")
+    artifact_parser.add_argument('--file', default='test.txt')
+    artifact_parser.add_argument('--repeat', type=int, default=5)
+
+    numpy_parser = subparsers.add_parser('numpy', help="NumPy inference engine vs sklearn latency and equivalence")
+    numpy_parser.add_argument('--file', default='test.txt')
+    numpy_parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 64, 4096])
+    numpy_parser.add_argument('--budget', type=int, default=20000, help="approximate number of texts scored per batch size")
+
+    hashing_parser = subparsers.add_parser('hashing', help="TF-IDF vocabulary vs hashing vectorizer accuracy, size and throughput")
+    hashing_parser.add_argument('--file', default="dataset/pre_semeval_dataset.csv")
+    hashing_parser.add_argument('--n-features', type=int, nargs='+', default=[2 ** 16, 2 ** 18, 2 ** 20])
+
+    stages_parser = subparsers.add_parser('stages', help="per-stage throughput, latency percentiles and peak memory with regression check")
+    stages_parser.add_argument('--file', default='test.txt')
+    stages_parser.add_argument('--repeat', type=int, default=1)
+    stages_parser.add_argument('--synthetic-size', type=int, default=20000, help="number of synthetic tweets")
+    stages_parser.add_argument('--train', action='store_true', help="also time train_model (needs dataset/pre_semeval_dataset.csv)")
+    stages_parser.add_argument('--save-baseline', default=None, help="write results to this JSON file")
+    stages_parser.add_argument('--baseline', default=None, help="compare with this JSON file and exit with 1 on regression")
+    stages_parser.add_argument('--threshold', type=float, default=0.2, help="allowed slowdown relative to the baseline (0.2 = 20%%)")
+
+    profile_parser = subparsers.add_parser('profile', help="instrumented and sampled profile of a single predict_batch call")
+    profile_parser.add_argument('--file', default='test.txt')
+    profile_parser.add_argument('--repeat', type=int, default=10)
+    profile_parser.add_argument('--batch-size', type=int, default=1000)
+    profile_parser.add_argument('--interval', type=float, default=1.0, help="sampling interval in ms")
+    profile_parser.add_argument('--top', type=int, default=20)
+    profile_parser.add_argument('--collapsed', default=None, help="save collapsed stacks for flame graphs to this file")
+
+    rebalance_parser = subparsers.add_parser('rebalance', help="class rebalancing strategies: training time, peak memory and macro F1")
+    rebalance_parser.add_argument('--file', default="dataset/pre_semeval_dataset.csv")
+    rebalance_parser.add_argument('--strategies', nargs='+', default=['smote', 'class_weight', 'random_oversample', 'sparse_smote'])
+
+    prune_parser = subparsers.add_parser('prune', help="top-k vocabulary pruning: model size, load time, latency and accuracy")
+    prune_parser.add_argument('--file', default="dataset/pre_semeval_dataset.csv")
+    prune_parser.add_argument('--k', type=int, nargs='+', default=[1000, 5000, 20000, 50000])
+    prune_parser.add_argument('--method', choices=['chi2', 'coef'], default='chi2')
+    prune_parser.add_argument('--no-refit', action='store_true', help="slice the coefficients instead of refitting")
+    prune_parser.add_argument('--repeat', type=int, default=3)
+
+    tokenizer_parser = subparsers.add_parser('tokenizer', help="regex vs word_tokenize throughput and token differences")
+    tokenizer_parser.add_argument('--file', default="dataset/semeval-2017.csv", help=".txt file or tab-separated .csv with a 'text' column")
+    tokenizer_parser.add_argument('--repeat', type=int, default=1)
+    tokenizer_parser.add_argument('--top', type=int, default=20, help="number of most frequent differences to list")
+
+    return parser
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    BENCHMARKS[args.benchmark](args)
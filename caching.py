@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+class LRUCache:
+    def __init__(self, maxsize=50000):
+        # Максимальна кількість записів (0 - кешування вимкнене)
+        self.maxsize = maxsize
+        # Записи в порядку від найдавніше до найнедавніше використаних
+        self.data = OrderedDict()
+        # Блокування для безпечного використання з кількох потоків
+        self.lock = threading.Lock()
+        # Статистика використання кешу
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Функція для отримання значення з кешу (None, якщо ключа немає)
+    def get(self, key):
+        with self.lock:
+            value = self.data.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.data.move_to_end(key)  # Позначення запису як нещодавно використаного
+            return value
+
+    # Функція для додавання значення в кеш з витісненням найдавніше використаних записів
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+                self.evictions += 1
+
+    # Функція для очищення кешу та скидання статистики
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    # Функція для отримання статистики використання кешу
+    def stats(self):
+        with self.lock:
+            requests = self.hits + self.misses
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'size': len(self.data),
+                    'maxsize': self.maxsize,
+                    'hit_rate': self.hits / requests if requests else 0.0}
+
+    def __len__(self):
+        return len(self.data)
+
+# Функція для отримання розмірів та часу зміни файлів (швидка перевірка змін)
+def files_signature(paths):
+    signature = []
+    for path in paths:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            signature.append((path, stat.st_size, stat.st_mtime_ns))
+        else:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+# Функція для обчислення відбитка вмісту файлів
+def files_fingerprint(paths):
+    sha1 = hashlib.sha1()
+    for path in paths:
+        sha1.update(path.encode('utf-8') + b'\0')
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                for block in iter(lambda: file.read(1 << 20), b''):
+                    sha1.update(block)
+        sha1.update(b'\0')
+    return sha1.hexdigest()
+
+class PredictionCache:
+    def __init__(self, maxsize=10000, path=None, fingerprint=''):
+        # Кеш у пам'яті: ключ очищеного тексту -> ймовірності класів
+        self.memory = LRUCache(maxsize)
+        # Відбиток файлів моделі, для якої збережені передбачення
+        self.fingerprint = fingerprint
+        # Необов'язкове сховище на диску (SQLite), що зберігається між перезапусками
+        self.path = path
+        self.connection = None
+        self.lock = threading.Lock()
+        # Статистика влучань у сховище на диску
+        self.store_hits = 0
+
+        if path is not None:
+            self.open_store()
+
+    # Функція для обчислення ключа кешу з очищеного тексту
+    @staticmethod
+    def key(cleaned_text):
+        if cleaned_text is None:
+            return None
+        return hashlib.sha1(cleaned_text.encode('utf-8')).hexdigest()
+
+    # Функція для відкриття сховища на диску
+    def open_store(self):
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS predictions (key TEXT PRIMARY KEY, probabilities TEXT)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+            row = self.connection.execute("SELECT value FROM meta WHERE name = 'fingerprint'").fetchone()
+
+        # Збережені передбачення іншої версії моделі стають недійсними
+        if row is None or row[0] != self.fingerprint:
+            self.clear_store()
+
+    # Функція для очищення сховища на диску та запису відбитка поточної моделі
+    def clear_store(self):
+        if self.connection is None:
+            return
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM predictions")
+            self.connection.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('fingerprint', ?)", (self.fingerprint,))
+
+    # Функція для встановлення відбитка моделі (при зміні кеш стає недійсним)
+    def set_fingerprint(self, fingerprint):
+        if fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            self.invalidate()
+
+    # Функція для видалення всіх збережених передбачень
+    def invalidate(self):
+        with self.memory.lock:
+            self.memory.data.clear()
+        self.clear_store()
+
+    # Функція для отримання збережених ймовірностей для списку ключів
+    def get_many(self, keys):
+        found = {}
+        missing = []
+        for key in set(keys):
+            if key is None:
+                continue
+            probabilities = self.memory.get(key)
+            if probabilities is None:
+                missing.append(key)
+            else:
+                found[key] = probabilities
+
+        # Пошук ключів, яких немає в пам'яті, у сховищі на диску
+        if missing and self.connection is not None:
+            with self.lock:
+                for start in range(0, len(missing), 500):
+                    part = missing[start:start + 500]
+                    rows = self.connection.execute(
+                        f"SELECT key, probabilities FROM predictions WHERE key IN ({','.join('?' * len(part))})", part).fetchall()
+                    for key, probabilities in rows:
+                        found[key] = tuple(json.loads(probabilities))
+                        self.store_hits += 1
+            for key in missing:
+                if key in found:
+                    self.memory.put(key, found[key])
+
+        return found
+
+    # Функція для збереження ймовірностей для словника ключ -> ймовірності
+    def put_many(self, items):
+        for key, probabilities in items.items():
+            self.memory.put(key, tuple(probabilities))
+
+        if self.connection is not None and items:
+            with self.lock, self.connection:
+                self.connection.executemany("INSERT OR REPLACE INTO predictions (key, probabilities) VALUES (?, ?)",
+                                            [(key, json.dumps(list(map(float, probabilities)))) for key, probabilities in items.items()])
+
+    # Функція для отримання статистики кешу (для вибору його розміру)
+    def stats(self):
+        stats = self.memory.stats()
+        # Промахи кешу в пам'яті, знайдені на диску, враховуються як влучання
+        stats['memory_hits'] = stats['hits']
+        stats['store_hits'] = self.store_hits
+        stats['hits'] = stats['memory_hits'] + self.store_hits
+        stats['misses'] = stats['misses'] - self.store_hits
+        requests = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / requests if requests else 0.0
+        if self.connection is not None:
+            with self.lock:
+                stats['store_size'] = self.connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        return stats
+
+    # Функція для закриття сховища на диску
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
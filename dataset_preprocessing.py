@@ -1,74 +1,99 @@
+import argparse
 import pandas as pd
 import matplotlib.pyplot as plt
-from text_preprocessing import TextPreprocessor  # Імпорт класу TextPreprocessor з файлу text_preprocessing.py
-
-# створення екземпляру класу TextPreprocessor
-textPreprocessor = TextPreprocessor() 
-
-# Завантаження датасету
-dataset = pd.read_csv("dataset/semeval-2017.csv", delimiter='\t', encoding='utf-8')
-
-# Виведення кількості елементів у кожній категорії міток
-print(dataset['label'].value_counts())
-
-# Створення списку для позначень класів
-s_label = ['Neutral', 'Positive', 'Negative']
-
-# Отримання міток класів та їх кількостей, сортування за індексом, конвертація індексів у слова
-x_axis = dataset['label'].value_counts().sort_index().index
-x_axis = [s_label[x] for x in x_axis]
-
-# Отримання кількостей класів, сортування за індексом
-y_axis = dataset['label'].value_counts().sort_index()
-
-# Створення стовпчикової діаграми з мітками по x_axis та кількостями по y_axis
-plt.bar(x_axis, y_axis)
-# Налаштування розміру шрифту для підписів по осі x
-plt.xticks(fontsize=12)
-# Налаштування розміру шрифту для підписів по осі y
-plt.yticks(fontsize=12)
-
-# Додавання заголовку до графіку
-plt.title('The count of tonality classes', fontsize=16)
-# Додавання підпису до осі x
-plt.xlabel('Tonality', fontsize=14)
-# Додавання підпису до осі y
-plt.ylabel('Count', fontsize=14)
-
-# Відображення графіку
-plt.show()
-
-# Фільтрація даних за міткою класу
-d_pos = dataset[dataset['label'] == 1].reset_index(drop=True)
-d_neu = dataset[dataset['label'] == 0].reset_index(drop=True)
-d_neg = dataset[dataset['label'] == -1].reset_index(drop=True)
-
-# Виконання очищення тексту для кожного класу
-d_pos['cleaned_text'] = d_pos['text'].apply(textPreprocessor.cleaning_text)
-d_neu['cleaned_text'] = d_neu['text'].apply(textPreprocessor.cleaning_text)
-d_neg['cleaned_text'] = d_neg['text'].apply(textPreprocessor.cleaning_text)
-
-# Виконання виявлення заперечень у тексті для кожного класу
-d_pos['neg_cleaned_text'] = d_pos['cleaned_text'].apply(textPreprocessor.detect_negations)
-d_neg['neg_cleaned_text'] = d_neg['cleaned_text'].apply(textPreprocessor.detect_negations)
-d_neu['neg_cleaned_text'] = d_neu['cleaned_text'].apply(textPreprocessor.remove_stop_words)
-
-# Виконання лематизації тексту для кожного класу
-d_pos['lemmatized'] = d_pos['neg_cleaned_text'].apply(textPreprocessor.lemmatize)
-d_neu['lemmatized'] = d_neu['neg_cleaned_text'].apply(textPreprocessor.lemmatize)
-d_neg['lemmatized'] = d_neg['neg_cleaned_text'].apply(textPreprocessor.lemmatize)
-
-# Виконання стемінгу тексту для кожного класу
-d_pos['stemmed'] = d_pos['neg_cleaned_text'].apply(textPreprocessor.stem)
-d_neu['stemmed'] = d_neu['neg_cleaned_text'].apply(textPreprocessor.stem)
-d_neg['stemmed'] = d_neg['neg_cleaned_text'].apply(textPreprocessor.stem)
-
-# Об'єднання оброблених даних для всіх класів
-dataset = pd.concat([d_pos, d_neu, d_neg])
-# Випадкове перемішування даних та збереження порядку індексів
-dataset = dataset.sample(frac=1).reset_index(drop=True)
-# Видалення рядків з нульовими значеннями
-dataset = dataset.dropna()
-
-# Збереження обробленого датасету у CSV-файл
-dataset.to_csv("dataset/pre_semeval_dataset.csv", sep='\t', index=False)
\ No newline at end of file
+from parallel_preprocessing import ParallelPreprocessor  # Імпорт паралельного обробника з файлу parallel_preprocessing.py
+from incremental_preprocessing import STORE_PATH, preprocess_incremental  # Імпорт інкрементальної обробки з файлу incremental_preprocessing.py
+
+# Функція для побудови стовпчикової діаграми кількості елементів у кожному класі
+def plot_label_counts(counts):
+    # Створення списку для позначень класів
+    s_label = ['Neutral', 'Positive', 'Negative']
+
+    # Отримання міток класів та їх кількостей, сортування за індексом, конвертація індексів у слова
+    x_axis = counts.sort_index().index
+    x_axis = [s_label[x] for x in x_axis]
+
+    # Отримання кількостей класів, сортування за індексом
+    y_axis = counts.sort_index()
+
+    # Створення стовпчикової діаграми з мітками по x_axis та кількостями по y_axis
+    plt.bar(x_axis, y_axis)
+    # Налаштування розміру шрифту для підписів по осі x
+    plt.xticks(fontsize=12)
+    # Налаштування розміру шрифту для підписів по осі y
+    plt.yticks(fontsize=12)
+
+    # Додавання заголовку до графіку
+    plt.title('The count of tonality classes', fontsize=16)
+    # Додавання підпису до осі x
+    plt.xlabel('Tonality', fontsize=14)
+    # Додавання підпису до осі y
+    plt.ylabel('Count', fontsize=14)
+
+    # Відображення графіку
+    plt.show()
+
+# Захист від повторного виконання скрипта в робочих процесах
+if __name__ == "__main__":
+    # Аргументи командного рядка
+    parser = argparse.ArgumentParser(description="Preprocessing of the SemEval dataset")
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes (default: number of CPU cores)")
+    parser.add_argument('--chunk-size', type=int, default=500, help="number of rows sent to a worker at once")
+    parser.add_argument('--tokenizer', choices=['nltk', 'regex'], default='nltk', help="TextPreprocessor tokenizer backend")
+    parser.add_argument('--incremental', action='store_true',
+                        help="process only new or changed rows, resuming from the results saved in --store")
+    parser.add_argument('--store', default=STORE_PATH, help="SQLite file with processed rows (incremental mode)")
+    parser.add_argument('--read-chunk-size', type=int, default=10000, help="rows read from the input at once (incremental mode)")
+    args = parser.parse_args()
+
+    # Інкрементальна обробка: вхідний файл читається частинами, оброблені рядки беруться зі сховища,
+    # а порядок рядків вхідного файлу зберігається (без перемішування)
+    if args.incremental:
+        with ParallelPreprocessor(n_workers=args.workers, chunk_size=args.chunk_size, tokenizer=args.tokenizer) as engine:
+            counts = preprocess_incremental(engine, "dataset/semeval-2017.csv", "dataset/pre_semeval_dataset.csv",
+                                            args.store, args.read_chunk_size)
+        print(counts)
+        plot_label_counts(counts)
+    else:
+        # Завантаження датасету
+        dataset = pd.read_csv("dataset/semeval-2017.csv", delimiter='\t', encoding='utf-8')
+
+        # Виведення кількості елементів у кожній категорії міток
+        print(dataset['label'].value_counts())
+
+        # Побудова діаграми кількості елементів у кожному класі
+        plot_label_counts(dataset['label'].value_counts())
+
+        # Фільтрація даних за міткою класу
+        d_pos = dataset[dataset['label'] == 1].reset_index(drop=True)
+        d_neu = dataset[dataset['label'] == 0].reset_index(drop=True)
+        d_neg = dataset[dataset['label'] == -1].reset_index(drop=True)
+
+        # Паралельна обробка тексту: NLTK та WordNet ініціалізуються один раз у кожному процесі,
+        # а порядок рядків зберігається
+        with ParallelPreprocessor(n_workers=args.workers, chunk_size=args.chunk_size, tokenizer=args.tokenizer) as engine:
+            # Виконання очищення тексту для кожного класу
+            d_pos['cleaned_text'] = engine.map('cleaning_text', d_pos['text'])
+            d_neu['cleaned_text'] = engine.map('cleaning_text', d_neu['text'])
+            d_neg['cleaned_text'] = engine.map('cleaning_text', d_neg['text'])
+
+            # Виявлення заперечень (для нейтрального класу - лише видалення стоп-слів), лематизація
+            # та стемінг з однією токенізацією кожного документа
+            pos_documents = engine.map('process_document', d_pos['cleaned_text'])
+            neu_documents = engine.map('process_document', d_neu['cleaned_text'], negations=False)
+            neg_documents = engine.map('process_document', d_neg['cleaned_text'])
+
+        # Додавання колонок neg_cleaned_text, lemmatized та stemmed для кожного класу
+        for frame, documents in ((d_pos, pos_documents), (d_neu, neu_documents), (d_neg, neg_documents)):
+            for column in ('neg_cleaned_text', 'lemmatized', 'stemmed'):
+                frame[column] = [document[column] for document in documents]
+
+        # Об'єднання оброблених даних для всіх класів
+        dataset = pd.concat([d_pos, d_neu, d_neg])
+        # Випадкове перемішування даних та збереження порядку індексів
+        dataset = dataset.sample(frac=1).reset_index(drop=True)
+        # Видалення рядків з нульовими значеннями
+        dataset = dataset.dropna()
+
+        # Збереження обробленого датасету у CSV-файл
+        dataset.to_csv("dataset/pre_semeval_dataset.csv", sep='\t', index=False)
\ No newline at end of file
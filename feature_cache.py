@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import shutil
+import joblib
+import numpy as np
+
+# Імпорт функції обчислення відбитка файлів з файлу caching.py
+from caching import files_fingerprint
+# Імпорт функції перетворення параметрів sklearn у JSON з файлу model_artifact.py
+from model_artifact import json_params
+
+# Каталог кешу матриць ознак
+FEATURE_CACHE_DIR = "models/feature_cache"
+# Версія формату кешу (зміна робить старі записи недійсними)
+FEATURE_CACHE_VERSION = 1
+
+# Функція для обчислення ключа кешу з вмісту датасету та параметрів векторизації
+def feature_cache_key(dataset_path, vectorizer, smote, **params):
+    config = {'version': FEATURE_CACHE_VERSION,
+              'dataset': files_fingerprint([dataset_path]),
+              'vectorizer': type(vectorizer).__name__,
+              'vectorizer_params': json_params(vectorizer.get_params()),
+              'smote_params': json_params(smote.get_params()) if smote is not None else None,
+              **params}
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+
+class FeatureCache:
+    def __init__(self, path=FEATURE_CACHE_DIR):
+        self.path = path
+
+    # Функція для отримання каталогу запису кешу
+    def entry_path(self, key):
+        return os.path.join(self.path, key)
+
+    # Функція для перевірки наявності запису
+    def __contains__(self, key):
+        return os.path.exists(os.path.join(self.entry_path(key), 'complete'))
+
+    # Функція для збереження навчених матриць, міток та векторизатора
+    def save(self, key, vectorizer, X_train, X_test, y_train, y_test):
+        import scipy.sparse as sp
+
+        # Запис виконується у тимчасовий каталог, який потім перейменовується
+        entry_path = self.entry_path(key)
+        temporary_path = entry_path + '.tmp'
+        shutil.rmtree(temporary_path, ignore_errors=True)
+        os.makedirs(temporary_path)
+
+        sp.save_npz(os.path.join(temporary_path, 'X_train.npz'), sp.csr_matrix(X_train))
+        sp.save_npz(os.path.join(temporary_path, 'X_test.npz'), sp.csr_matrix(X_test))
+        # Текстові мітки зберігаються як рядки Unicode, щоб не використовувати pickle
+        y_train, y_test = np.asarray(y_train), np.asarray(y_test)
+        if y_train.dtype == object:
+            y_train, y_test = y_train.astype(str), y_test.astype(str)
+        np.savez(os.path.join(temporary_path, 'labels.npz'), y_train=y_train, y_test=y_test)
+        joblib.dump(vectorizer, os.path.join(temporary_path, 'vectorizer.pkl'))
+        # Позначка завершеного запису
+        open(os.path.join(temporary_path, 'complete'), 'w').close()
+
+        shutil.rmtree(entry_path, ignore_errors=True)
+        os.replace(temporary_path, entry_path)
+
+    # Функція для завантаження запису (None, якщо його немає)
+    def load(self, key):
+        import scipy.sparse as sp
+
+        if key not in self:
+            return None
+        entry_path = self.entry_path(key)
+        with np.load(os.path.join(entry_path, 'labels.npz'), allow_pickle=False) as labels:
+            y_train, y_test = labels['y_train'], labels['y_test']
+        return {'vectorizer': joblib.load(os.path.join(entry_path, 'vectorizer.pkl')),
+                'X_train': sp.load_npz(os.path.join(entry_path, 'X_train.npz')),
+                'X_test': sp.load_npz(os.path.join(entry_path, 'X_test.npz')),
+                'y_train': y_train,
+                'y_test': y_test}
+
+    # Функція для видалення всіх записів кешу
+    def clear(self):
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -0,0 +1,237 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import time
+from multiprocessing import Pool
+import numpy as np
+
+# Імпорт шляху до датасету з файлу text_vectorizing.py
+from text_vectorizing import DATASET_PATH
+
+# Сітка параметрів за замовчуванням: параметри set_vectorizer та LogisticRegression
+DEFAULT_GRID = {
+    'vectorizer': {'ngram_range': [[1, 1], [1, 2]],
+                   'max_df': [1.0, 0.9],
+                   'min_df': [0, 2],
+                   'norm': ['l2']},
+    'classifier': {'C': [0.1, 1, 10],
+                   'tol': [1e-4],
+                   'solver': ['sag', 'lbfgs']},
+}
+
+# Розв'язувачі, що підтримують warm_start для мультиноміальної моделі
+WARM_START_SOLVERS = ('lbfgs', 'newton-cg', 'sag', 'saga')
+
+# Тексти та мітки датасету, що завантажуються один раз у кожному робочому процесі
+_texts = None
+_labels = None
+
+# Функція для читання тексту та міток датасету
+def read_dataset(path):
+    import pandas as pd
+
+    dataset = pd.read_csv(path, delimiter='\t', encoding='utf-8').dropna()
+    return np.array(dataset["neg_cleaned_text"].tolist(), dtype=object), dataset["label"].to_numpy()
+
+# Функція ініціалізації робочого процесу
+def _init_worker(path):
+    global _texts, _labels
+    if _texts is None:
+        _texts, _labels = read_dataset(path)
+
+# Функція для отримання всіх комбінацій параметрів сітки
+def expand_grid(grid):
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+# Функція для перетворення параметрів з JSON у формат sklearn
+def vectorizer_kwargs(params):
+    return {**params, 'ngram_range': tuple(params['ngram_range'])} if 'ngram_range' in params else dict(params)
+
+# Функція для отримання стратегії балансування, з якою оцінюються налаштування: 'rebalance' із сітки,
+# інакше SMOTE з --smote або без балансування (та сама стратегія передається train_model для --train-best)
+def rebalance_strategy(vectorizer_params, smote):
+    return vectorizer_params.get('rebalance', 'smote' if smote else 'none')
+
+# Функція для оцінки всіх налаштувань LR на одній частині крос-валідації з однією векторизацією
+def _evaluate_fold(task):
+    import warnings
+    from sklearn.exceptions import ConvergenceWarning
+    from sklearn.metrics import accuracy_score, confusion_matrix, f1_score
+    from log_model import MultinomialLR
+    from rebalancing import class_weight_params, rebalance
+    from text_vectorizing import TextVectorizer
+
+    vectorizer_params, classifier_configs, train_index, test_index, smote = task
+    y_train, y_test = _labels[train_index], _labels[test_index]
+
+    # Векторизація частини виконується один раз для всіх налаштувань LR
+    start = time.perf_counter()
+    textVectorizer = TextVectorizer(load=False)
+    textVectorizer.set_vectorizer(**vectorizer_kwargs(vectorizer_params))
+    X_train = textVectorizer.vectorizer.fit_transform(_texts[train_index])
+    X_test = textVectorizer.vectorizer.transform(_texts[test_index])
+    # Балансування застосовується лише до навчальної частини,
+    # щоб синтетичні приклади не потрапили в перевірку
+    strategy = rebalance_strategy(vectorizer_params, smote)
+    X_train, y_train = rebalance(X_train, y_train, strategy)
+    weights = class_weight_params(strategy)
+    vectorize_time = time.perf_counter() - start
+
+    # Налаштування групуються за розв'язувачем і сортуються за C, щоб продовжувати навчання
+    # з коефіцієнтів попередньої моделі (warm start)
+    results = []
+    classifiers = {}
+    for index, params in sorted(enumerate(classifier_configs), key=lambda item: (str(item[1].get('solver')), item[1].get('C', 1))):
+        solver = params.get('solver', 'sag')
+        warm_start = solver in WARM_START_SOLVERS
+        group = json.dumps({name: value for name, value in params.items() if name != 'C'}, sort_keys=True)
+        classifier = classifiers.get(group) if warm_start else None
+        if classifier is None:
+            classifier = MultinomialLR.build_classifier(**{**weights, **params}, warm_start=warm_start)
+            classifiers[group] = classifier
+        else:
+            classifier.set_params(**params)
+
+        start = time.perf_counter()
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', ConvergenceWarning)
+            classifier.fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
+
+        y_pred = classifier.predict(X_test)
+        results.append({'index': index,
+                        'accuracy': float(accuracy_score(y_test, y_pred)),
+                        'macro_f1': float(f1_score(y_test, y_pred, average='macro')),
+                        'fit_seconds': fit_time,
+                        'n_iter': int(np.max(classifier.n_iter_)),
+                        'confusion_matrix': confusion_matrix(y_pred, y_test, labels=classifier.classes_).tolist()})
+
+    return {'vectorize_seconds': vectorize_time, 'n_features': X_train.shape[1], 'results': results}
+
+# Функція для запису результатів пошуку у файли
+def write_results(ranked, output_dir, plot_top):
+    from log_model import MultinomialLR
+
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, 'results.json'), 'w', encoding='utf-8') as file:
+        json.dump(ranked, file, indent=4)
+
+    # Таблиця результатів без матриць помилок
+    with open(os.path.join(output_dir, 'results.csv'), 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['rank', 'vectorizer', 'classifier', 'macro_f1_mean', 'macro_f1_std',
+                         'accuracy_mean', 'accuracy_std', 'vectorize_seconds', 'fit_seconds'])
+        for result in ranked:
+            writer.writerow([result['rank'], json.dumps(result['vectorizer']), json.dumps(result['classifier']),
+                             result['macro_f1_mean'], result['macro_f1_std'], result['accuracy_mean'],
+                             result['accuracy_std'], result['vectorize_seconds'], result['fit_seconds']])
+
+    # Найкращі параметри у форматі аргументів train_model
+    with open(os.path.join(output_dir, 'best_params.json'), 'w', encoding='utf-8') as file:
+        json.dump({'vectorizer_params': ranked[0]['vectorizer'], 'classifier_params': ranked[0]['classifier']}, file, indent=4)
+
+    # Сумарні матриці помилок по всіх частинах для найкращих налаштувань
+    for result in ranked[:plot_top]:
+        MultinomialLR.plot_confusion_matrix(np.array(result['confusion_matrix']),
+                                            os.path.join(output_dir, f"confusion_rank{result['rank']}.png"),
+                                            title=f"Rank {result['rank']}: macro F1 {result['macro_f1_mean']:.4f}")
+
+# Функція для запуску пошуку гіперпараметрів
+def search(args):
+    from sklearn.model_selection import StratifiedKFold
+
+    grid = DEFAULT_GRID
+    if args.grid:
+        with open(args.grid, 'r', encoding='utf-8') as file:
+            grid = json.load(file)
+
+    # Усі комбінації або випадкова вибірка з них
+    combinations = list(itertools.product(expand_grid(grid['vectorizer']), expand_grid(grid['classifier'])))
+    if args.n_iter and args.n_iter < len(combinations):
+        combinations = random.Random(args.seed).sample(combinations, args.n_iter)
+
+    # Налаштування LR групуються за векторизатором, щоб векторизувати кожну частину один раз
+    groups = {}
+    for vectorizer_params, classifier_params in combinations:
+        groups.setdefault(json.dumps(vectorizer_params, sort_keys=True), []).append(classifier_params)
+
+    texts, labels = read_dataset(args.data)
+    folds = list(StratifiedKFold(n_splits=args.folds, shuffle=True, random_state=args.seed).split(texts, labels))
+    tasks = [(json.loads(key), configs, train_index, test_index, args.smote)
+             for key, configs in groups.items() for train_index, test_index in folds]
+    print(f"{len(combinations)} configurations, {len(groups)} vectorizer settings x {args.folds} folds = {len(tasks)} tasks")
+
+    start = time.perf_counter()
+    if args.workers == 1:
+        global _texts, _labels
+        _texts, _labels = texts, labels
+        outputs = [_evaluate_fold(task) for task in tasks]
+    else:
+        with Pool(args.workers, initializer=_init_worker, initargs=(args.data,)) as pool:
+            outputs = pool.map(_evaluate_fold, tasks, chunksize=1)
+    elapsed = time.perf_counter() - start
+
+    # Об'єднання результатів усіх частин для кожної комбінації параметрів
+    scores = {}
+    for (vectorizer_params, configs, _, _, _), output in zip(tasks, outputs):
+        for result in output['results']:
+            key = (json.dumps(vectorizer_params, sort_keys=True), json.dumps(configs[result['index']], sort_keys=True))
+            entry = scores.setdefault(key, {'accuracy': [], 'macro_f1': [], 'fit_seconds': [], 'vectorize_seconds': [],
+                                            'n_iter': [], 'confusion_matrix': 0})
+            for name in ('accuracy', 'macro_f1', 'fit_seconds', 'n_iter'):
+                entry[name].append(result[name])
+            entry['vectorize_seconds'].append(output['vectorize_seconds'])
+            entry['n_features'] = output['n_features']
+            entry['confusion_matrix'] = entry['confusion_matrix'] + np.array(result['confusion_matrix'])
+
+    ranked = [{'vectorizer': json.loads(vectorizer_key),
+               'classifier': json.loads(classifier_key),
+               'macro_f1_mean': float(np.mean(entry['macro_f1'])),
+               'macro_f1_std': float(np.std(entry['macro_f1'])),
+               'accuracy_mean': float(np.mean(entry['accuracy'])),
+               'accuracy_std': float(np.std(entry['accuracy'])),
+               'vectorize_seconds': float(np.sum(entry['vectorize_seconds'])),
+               'fit_seconds': float(np.sum(entry['fit_seconds'])),
+               'max_iterations': int(np.max(entry['n_iter'])),
+               'n_features': entry['n_features'],
+               'confusion_matrix': entry['confusion_matrix'].tolist()}
+              for (vectorizer_key, classifier_key), entry in scores.items()]
+    ranked.sort(key=lambda result: -result['macro_f1_mean'])
+    for rank, result in enumerate(ranked, start=1):
+        result['rank'] = rank
+
+    write_results(ranked, args.output_dir, args.plot_top)
+
+    print(f"Search finished in {elapsed:.1f} s, results saved to {args.output_dir}")
+    for result in ranked[:args.plot_top]:
+        print(f"{result['rank']:>3}. macro F1 {result['macro_f1_mean']:.4f} ± {result['macro_f1_std']:.4f}  "
+              f"{json.dumps(result['vectorizer'])}  {json.dumps(result['classifier'])}")
+
+    # Навчання та збереження робочої моделі з найкращими параметрами та тим самим балансуванням класів
+    if args.train_best:
+        from log_model import MultinomialLR
+
+        vectorizer_params = vectorizer_kwargs(ranked[0]['vectorizer'])
+        vectorizer_params['rebalance'] = rebalance_strategy(vectorizer_params, args.smote)
+        MultinomialLR(cache_size=0).train_model(draw=False,
+                                                vectorizer_params=vectorizer_params,
+                                                classifier_params=ranked[0]['classifier'])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel k-fold hyperparameter search for the vectorizer and LR")
+    parser.add_argument('--data', default=DATASET_PATH)
+    parser.add_argument('--grid', default=None, help="JSON file with 'vectorizer' and 'classifier' parameter lists")
+    parser.add_argument('--n-iter', type=int, default=None, help="evaluate a random sample of this many configurations")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--smote', action='store_true',
+                        help="oversample each training fold with SMOTE (a 'rebalance' grid entry takes precedence)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output-dir', default='search_results')
+    parser.add_argument('--plot-top', type=int, default=3, help="save confusion matrices of the best N configurations")
+    parser.add_argument('--train-best', action='store_true', help="train and save the model with the best parameters")
+    search(parser.parse_args())
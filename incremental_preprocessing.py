@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import Counter
+
+# Шлях до сховища оброблених рядків
+STORE_PATH = "dataset/preprocessing_store.sqlite"
+# Версія обробки (зміна робить усі збережені рядки недійсними)
+PREPROCESSING_VERSION = 1
+# Колонки, що додаються до вхідного датасету
+OUTPUT_COLUMNS = ('cleaned_text', 'neg_cleaned_text', 'lemmatized', 'stemmed')
+# Мітки класів датасету SemEval
+LABELS = (-1, 0, 1)
+
+# Функція для отримання налаштувань TextPreprocessor, від яких залежить результат обробки
+def preprocessing_config(textPreprocessor):
+    return {'version': PREPROCESSING_VERSION, **textPreprocessor.settings()}
+
+# Функція для обчислення ключа рядка з налаштувань, мітки (нейтральний клас обробляється
+# без заперечень) та тексту
+def row_key(config_json, label, text):
+    return hashlib.sha1(f"{config_json}\0{label}\0{text}".encode('utf-8')).hexdigest()
+
+class PreprocessingStore:
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS rows (key TEXT PRIMARY KEY, cleaned_text TEXT, "
+                                    "neg_cleaned_text TEXT, lemmatized TEXT, stemmed TEXT)")
+
+    # Функція для отримання збережених результатів для списку ключів
+    def get_many(self, keys):
+        found = {}
+        keys = list(set(keys))
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            rows = self.connection.execute(
+                f"SELECT key, {', '.join(OUTPUT_COLUMNS)} FROM rows WHERE key IN ({','.join('?' * len(part))})", part).fetchall()
+            for row in rows:
+                found[row[0]] = dict(zip(OUTPUT_COLUMNS, row[1:]))
+        return found
+
+    # Функція для збереження результатів (одна транзакція - контрольна точка)
+    def put_many(self, items):
+        with self.connection:
+            self.connection.executemany(f"INSERT OR REPLACE INTO rows (key, {', '.join(OUTPUT_COLUMNS)}) VALUES (?, ?, ?, ?, ?)",
+                                        [(key, *(values[column] for column in OUTPUT_COLUMNS)) for key, values in items.items()])
+
+    # Функція для отримання кількості збережених рядків
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+    # Функція для закриття сховища
+    def close(self):
+        self.connection.close()
+
+# Функція для обробки лише нових або змінених рядків датасету.
+# Вхідний файл читається частинами, результати кожної частини зберігаються у сховищі одразу,
+# тому перерваний запуск продовжується з першої необробленої частини.
+# Повертає кількість рядків кожного класу
+def preprocess_incremental(engine, input_path, output_path, store_path=STORE_PATH, read_chunk_size=10000):
+    import pandas as pd
+    from text_preprocessing import TextPreprocessor
+
+    config_json = json.dumps(preprocessing_config(TextPreprocessor(**engine.preprocessor_kwargs)), sort_keys=True)
+    store = PreprocessingStore(store_path)
+    counts = Counter()
+    n_cached = n_computed = 0
+    start = time.perf_counter()
+
+    # Результат записується у тимчасовий файл, який замінює попередній лише після завершення
+    temporary_path = output_path + '.tmp'
+    header = True
+    try:
+        for chunk in pd.read_csv(input_path, delimiter='\t', encoding='utf-8', chunksize=read_chunk_size):
+            # Лише рядки з текстом та відомою міткою
+            chunk = chunk[chunk['label'].isin(LABELS) & chunk['text'].notna()].reset_index(drop=True)
+            counts.update(chunk['label'].tolist())
+            keys = [row_key(config_json, label, text) for label, text in zip(chunk['label'], chunk['text'])]
+            results = store.get_many(keys)
+
+            # Обробка рядків, яких немає у сховищі (однакові рядки обробляються один раз)
+            missing = {}
+            for index, key in enumerate(keys):
+                if key not in results and key not in missing:
+                    missing[key] = index
+            if missing:
+                rows = chunk.loc[list(missing.values())]
+                cleaned = engine.map('cleaning_text', rows['text'])
+                neutral = (rows['label'] == 0).tolist()
+                # Виявлення заперечень для нейтрального класу не виконується
+                documents = {}
+                for negations in (True, False):
+                    positions = [position for position, is_neutral in enumerate(neutral) if is_neutral != negations]
+                    processed = engine.map('process_document', [cleaned[position] for position in positions], negations=negations)
+                    documents.update(zip(positions, processed))
+
+                computed = {}
+                for position, key in enumerate(missing):
+                    computed[key] = {'cleaned_text': cleaned[position], **documents[position]}
+                store.put_many(computed)
+                results.update(computed)
+            n_computed += len(missing)
+            n_cached += len(keys) - len(missing)
+
+            for column in OUTPUT_COLUMNS:
+                chunk[column] = [results[key][column] for key in keys]
+            chunk.dropna().to_csv(temporary_path, sep='\t', index=False, header=header, mode='w' if header else 'a')
+            header = False
+            print(f"{n_cached + n_computed} rows: {n_computed} processed, {n_cached} from {store_path} "
+                  f"({time.perf_counter() - start:.1f} s)")
+        if header:
+            raise ValueError(f"No labeled rows in {input_path}")
+    finally:
+        store.close()
+
+    os.replace(temporary_path, output_path)
+    return pd.Series(counts).sort_index()
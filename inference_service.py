@@ -0,0 +1,313 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Імпорт реєстру вимірювань з файлу instrumentation.py
+import instrumentation
+
+# Мітки класів у порядку колонок ймовірностей
+TONALITY = ['negative', 'neutral', 'positive']
+
+# Повідомлення для кодів статусу HTTP
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+# Максимальний розмір тіла запиту
+MAX_BODY_SIZE = 1 << 20
+
+# Виняток для тіла запиту, більшого за MAX_BODY_SIZE
+class PayloadTooLarge(Exception):
+    pass
+
+# Функція для читання одного повідомлення HTTP (None, якщо з'єднання закрите;
+# PayloadTooLarge для завеликого тіла, ValueError для некоректних заголовків)
+async def read_http_message(reader):
+    start_line = await reader.readline()
+    if not start_line:
+        return None
+
+    # Заголовки до порожнього рядка (назви заголовків без урахування регістру)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    # Тіло повідомлення фіксованої довжини
+    length = int(headers.get('content-length', 0))
+    if length < 0:
+        raise ValueError("Negative Content-Length")
+    if length > MAX_BODY_SIZE:
+        raise PayloadTooLarge()
+    body = await reader.readexactly(length) if length else b''
+    return start_line.decode('latin-1').rstrip('\r\n'), headers, body
+
+class MicroBatcher:
+    def __init__(self, mlr, max_batch_size=64, max_wait_ms=5.0, max_queue_size=1024):
+        # Модель, завантажена один раз для всіх запитів
+        self.mlr = mlr
+        # Максимальна кількість текстів в одному пакеті
+        self.max_batch_size = max_batch_size
+        # Час очікування інших запитів після першого запиту пакета
+        self.max_wait = max_wait_ms / 1000
+        # Обмежена черга: при заповненні нові запити відхиляються (503)
+        self.queue = asyncio.Queue(max_queue_size)
+        # Передбачення виконуються в одному окремому потоці, щоб не блокувати цикл подій
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.task = None
+
+        # Метрики сервісу
+        self.started = time.time()
+        self.requests = 0
+        self.rejected = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_texts = 0
+        self.latencies = deque(maxlen=10000)  # Час обробки останніх запитів (с)
+
+    # Функція для запуску обробки черги
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self.run())
+
+    # Функція для зупинки обробки черги
+    async def close(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        self.executor.shutdown(wait=True)
+
+    # Функція для виконання передбачення в окремому потоці
+    async def predict(self, texts):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self.mlr.predict_proba_batch, texts)
+
+    # Функція для додавання тексту в чергу (QueueFull, якщо черга заповнена)
+    def submit(self, text):
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((text, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            instrumentation.metrics.increment('rejected')
+            raise
+        self.requests += 1
+        instrumentation.metrics.increment('requests')
+        return future
+
+    # Функція для збирання наступного пакета: перший запит та всі, що надійдуть протягом вікна
+    async def next_batch(self):
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Запити, що вже чекають у черзі, беруться без очікування
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    # Функція для безперервної обробки черги пакетами
+    async def run(self):
+        while True:
+            batch = await self.next_batch()
+            # Запити, клієнти яких уже відключилися, не обробляються
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                continue
+
+            try:
+                probabilities = await self.predict([text for text, _, _ in batch])
+            except Exception as error:
+                self.errors += len(batch)
+                instrumentation.metrics.increment('errors', len(batch))
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            self.batches += 1
+            self.batched_texts += len(batch)
+            instrumentation.metrics.increment('batches')
+            instrumentation.metrics.increment('batched_texts', len(batch))
+            now = time.perf_counter()
+            for (_, future, received), row in zip(batch, probabilities):
+                self.latencies.append(now - received)
+                if not future.done():
+                    future.set_result(row)
+
+    # Функція для отримання метрик сервісу
+    def metrics(self):
+        latencies = sorted(self.latencies)
+
+        # Значення перцентиля серед останніх запитів (мс)
+        def percentile(q):
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else 0.0
+
+        return {'uptime_seconds': time.time() - self.started,
+                'requests': self.requests,
+                'rejected': self.rejected,
+                'errors': self.errors,
+                'batches': self.batches,
+                'mean_batch_size': self.batched_texts / self.batches if self.batches else 0.0,
+                'queue_size': self.queue.qsize(),
+                'queue_capacity': self.queue.maxsize,
+                'latency_p50_ms': percentile(0.5),
+                'latency_p99_ms': percentile(0.99),
+                'prediction_cache': self.mlr.prediction_cache.stats(),
+                'instrumentation': instrumentation.metrics.snapshot() if instrumentation.is_enabled() else None}
+
+class InferenceService:
+    def __init__(self, batcher, host='127.0.0.1', port=8000):
+        self.batcher = batcher
+        self.host = host
+        self.port = port
+        self.server = None
+
+    # Функція для формування відповіді з кодом статусу та тілом JSON (або текстом для рядка)
+    @staticmethod
+    def response(status, payload, keep_alive=True):
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), 'text/plain; version=0.0.4'
+        else:
+            body, content_type = json.dumps(payload).encode('utf-8'), 'application/json'
+        headers = (f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                   f"Content-Type: {content_type}\r\n"
+                   f"Content-Length: {len(body)}\r\n"
+                   f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        return headers.encode('latin-1') + body
+
+    # Функція для передбачення тональності одного тексту
+    async def predict(self, body):
+        try:
+            text = json.loads(body)['text']
+        except (ValueError, KeyError, TypeError):
+            return 400, {'error': "Request body must be a JSON object with a 'text' field"}
+        if not isinstance(text, str):
+            return 400, {'error': "'text' must be a string"}
+
+        # Заповнена черга означає перевантаження: клієнт має повторити запит пізніше
+        try:
+            future = self.batcher.submit(text)
+        except asyncio.QueueFull:
+            return 503, {'error': "Service overloaded, retry later"}
+
+        try:
+            probabilities = await future
+        except Exception as error:
+            return 500, {'error': str(error)}
+        return 200, {'label': TONALITY[int(probabilities.argmax())],
+                     'probabilities': dict(zip(TONALITY, map(float, probabilities)))}
+
+    # Функція для вибору обробника за методом та шляхом запиту
+    async def route(self, method, path, body):
+        if path == '/predict':
+            if method != 'POST':
+                return 405, {'error': "Use POST"}
+            return await self.predict(body)
+        if path == '/health':
+            return 200, {'status': 'ok', 'queue_size': self.batcher.queue.qsize()}
+        if path == '/metrics':
+            return 200, self.batcher.metrics()
+        if path == '/metrics/prometheus':
+            return 200, instrumentation.metrics.prometheus()
+        return 404, {'error': f"Unknown path: {path}"}
+
+    # Функція для обробки одного з'єднання (з підтримкою keep-alive)
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    message = await read_http_message(reader)
+                except PayloadTooLarge:
+                    instrumentation.metrics.increment('responses_413')
+                    writer.write(self.response(413, {'error': "Payload too large"}, keep_alive=False))
+                    break
+                except ValueError:
+                    instrumentation.metrics.increment('responses_400')
+                    writer.write(self.response(400, {'error': "Malformed HTTP request"}, keep_alive=False))
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if message is None:
+                    break
+
+                start_line, headers, body = message
+                method, path, version = (start_line.split(' ') + ['', '', ''])[:3]
+                keep_alive = headers.get('connection', '').lower() != 'close' and version != 'HTTP/1.0'
+
+                status, payload = await self.route(method, path.split('?', 1)[0], body)
+                instrumentation.metrics.increment(f"responses_{status}")
+                writer.write(self.response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # Функція для запуску сервера
+    async def start(self):
+        self.batcher.start()
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+
+    # Функція для зупинки сервера та обробки черги
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.batcher.close()
+
+# Функція для запуску сервісу до переривання
+async def serve(args):
+    from log_model import MultinomialLR
+
+    # Модель завантажується один раз до початку прийому запитів
+    mlr = MultinomialLR(cache_size=args.cache_size, artifact_path=args.artifact, backend=args.backend)
+    instrumentation.instrument_model(mlr)
+    if args.instrument:
+        instrumentation.enable()
+    batcher = MicroBatcher(mlr, args.max_batch_size, args.max_wait_ms, args.max_queue_size)
+    await batcher.predict(["warm up"])
+
+    service = InferenceService(batcher, args.host, args.port)
+    await service.start()
+    print(f"Serving on http://{args.host}:{args.port} (POST /predict, GET /health, GET /metrics)")
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTTP tonality inference service with micro-batching")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help="time window for collecting a micro-batch")
+    parser.add_argument('--max-queue-size', type=int, default=1024, help="pending requests before answering 503")
+    parser.add_argument('--cache-size', type=int, default=10000)
+    parser.add_argument('--artifact', default=None, help="load the model from a model artifact directory")
+    parser.add_argument('--backend', default='sklearn', choices=['sklearn', 'numpy'])
+    parser.add_argument('--instrument', action='store_true', help="record per-stage timers exported by /metrics/prometheus")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,260 @@
+import bisect
+import functools
+import importlib
+import sys
+import threading
+import time
+from collections import Counter
+
+# Методи, що вимірюються після виклику enable(): (модуль, клас, метод).
+# Час етапу включає час вкладених етапів (наприклад, detect_negations містить get_antonym)
+INSTRUMENTED_METHODS = [
+    ('text_preprocessing', 'TextPreprocessor', 'cleaning_text'),
+    ('text_preprocessing', 'TextPreprocessor', 'tokenize'),
+    ('text_preprocessing', 'TextPreprocessor', 'detect_negations'),
+    ('text_preprocessing', 'TextPreprocessor', 'process_document'),
+    ('text_preprocessing', 'TextPreprocessor', 'get_antonym'),
+    ('text_preprocessing', 'TextPreprocessor', 'wordnet_antonym'),
+    ('text_preprocessing', 'TextPreprocessor', 'pos_tag'),
+    ('text_preprocessing', 'TextPreprocessor', 'lemmatize_tokens'),
+    ('text_preprocessing', 'TextPreprocessor', 'stem_tokens'),
+    ('antonym_index', 'AntonymIndex', 'lookup'),
+    ('text_vectorizing', 'TextVectorizer', 'preprocess_cleaned_texts'),
+    ('text_vectorizing', 'TextVectorizer', 'transform'),
+    ('log_model', 'MultinomialLR', 'predict_proba_batch'),
+    ('log_model', 'MultinomialLR', 'predict_proba_cleaned'),
+    ('numpy_inference', 'NumpyInferenceEngine', 'predict_proba'),
+]
+
+# Верхні межі кошиків гістограми затримок (с)
+LATENCY_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        # Кількість значень у кожному кошику (останній - більші за всі межі)
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    # Функція для додавання значення
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    # Функція для наближеної оцінки перцентиля за межами кошиків
+    def percentile(self, q):
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return self.max
+
+    # Функція для отримання стану гістограми у вигляді словника
+    def snapshot(self):
+        return {'count': self.count,
+                'total_seconds': self.sum,
+                'mean_seconds': self.sum / self.count if self.count else 0.0,
+                'max_seconds': self.max,
+                'p50_seconds': self.percentile(0.5),
+                'p99_seconds': self.percentile(0.99),
+                'buckets': dict(zip([str(bound) for bound in self.buckets] + ['+Inf'], self.counts))}
+
+class Metrics:
+    def __init__(self):
+        # Гістограми затримок етапів, лічильники та функції, що повертають статистику кешів
+        self.timers = {}
+        self.counters = Counter()
+        self.collectors = {}
+        self.lock = threading.Lock()
+
+    # Функція для запису тривалості етапу
+    def observe(self, name, seconds):
+        with self.lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                timer = self.timers[name] = Histogram()
+            timer.observe(seconds)
+
+    # Функція для збільшення лічильника
+    def increment(self, name, value=1):
+        with self.lock:
+            self.counters[name] += value
+
+    # Функція для реєстрації джерела статистики (викликається під час експорту)
+    def register_collector(self, name, function):
+        self.collectors[name] = function
+
+    # Функція для очищення всіх вимірювань
+    def reset(self):
+        with self.lock:
+            self.timers.clear()
+            self.counters.clear()
+
+    # Функція для отримання всіх вимірювань у вигляді словника
+    def snapshot(self):
+        with self.lock:
+            result = {'enabled': is_enabled(),
+                      'timers': {name: timer.snapshot() for name, timer in self.timers.items()},
+                      'counters': dict(self.counters)}
+        result['collectors'] = {name: function() for name, function in self.collectors.items()}
+        return result
+
+    # Функція для експорту вимірювань у текстовому форматі Prometheus
+    def prometheus(self, prefix='tonality'):
+        snapshot = self.snapshot()
+        lines = [f"# TYPE {prefix}_stage_seconds histogram"]
+        for name, timer in snapshot['timers'].items():
+            cumulative = 0
+            for bound, count in timer['buckets'].items():
+                cumulative += count
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {timer["total_seconds"]}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {timer["count"]}')
+
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        for name, value in snapshot['counters'].items():
+            lines.append(f'{prefix}_events_total{{name="{name}"}} {value}')
+
+        # Числові значення статистики кешів як gauge
+        lines.append(f"# TYPE {prefix}_collector gauge")
+        for collector, values in snapshot['collectors'].items():
+            for key, value in flatten(values):
+                lines.append(f'{prefix}_collector{{collector="{collector}",key="{key}"}} {float(value)}')
+        return '\n'.join(lines) + '\n'
+
+# Функція для перетворення вкладеного словника на пари (ключ.ключ, число)
+def flatten(values, prefix=''):
+    for key, value in values.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from flatten(value, name + '.')
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, value
+
+# Глобальний реєстр вимірювань
+metrics = Metrics()
+# Оригінальні методи класів, замінені під час enable()
+_originals = {}
+
+# Функція для створення обгортки, що вимірює тривалість виклику методу
+def timed(name, function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            metrics.observe(name, time.perf_counter() - start)
+    return wrapper
+
+# Функція для ввімкнення вимірювань. Методи класів замінюються обгортками лише тут,
+# тому у вимкненому стані код виконується без жодних додаткових перевірок
+def enable(methods=INSTRUMENTED_METHODS):
+    for module_name, class_name, method_name in methods:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        if (cls, method_name) not in _originals:
+            _originals[(cls, method_name)] = cls.__dict__[method_name]
+            setattr(cls, method_name, timed(f"{class_name}.{method_name}", cls.__dict__[method_name]))
+
+# Функція для вимкнення вимірювань та відновлення оригінальних методів
+def disable():
+    for (cls, method_name), method in _originals.items():
+        setattr(cls, method_name, method)
+    _originals.clear()
+
+# Функція для перевірки, чи ввімкнені вимірювання
+def is_enabled():
+    return bool(_originals)
+
+# Функція для реєстрації статистики кешів моделі (кеш передбачень та кеші TextPreprocessor)
+def instrument_model(mlr):
+    metrics.register_collector('prediction_cache', mlr.prediction_cache.stats)
+
+    # Кеші TextPreprocessor доступні лише після завантаження TextVectorizer
+    def preprocessor_stats():
+        if mlr._vectorizer is None:
+            return {}
+        return mlr._vectorizer.textPreprocessor.cache_stats()
+    metrics.register_collector('text_preprocessor', preprocessor_stats)
+
+class SamplingProfiler:
+    def __init__(self, interval=0.001, thread_id=None):
+        # Інтервал між знімками стеку (с) та потік, що профілюється (за замовчуванням - поточний)
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        # Кількість знімків, у яких функція була на вершині стеку або будь-де в стеку
+        self.self_samples = Counter()
+        self.total_samples = Counter()
+        # Кількість знімків для кожного повного стеку (формат collapsed stacks для flame graph)
+        self.stacks = Counter()
+        self.samples = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    # Функція для опису кадру стеку
+    @staticmethod
+    def frame_name(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({code.co_filename.replace(chr(92), '/').rsplit('/', 1)[-1]}:{code.co_firstlineno})"
+
+    # Функція для періодичного знімання стеку потоку
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self.frame_name(frame))
+                frame = frame.f_back
+            self.samples += 1
+            self.self_samples[stack[0]] += 1
+            self.total_samples.update(set(stack))
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    # Функція для запуску профілювання
+    def start(self):
+        # Потік профілювальника отримує GIL не рідше, ніж раз на інтервал знімків
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self.switch_interval, self.interval))
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    # Функція для зупинки профілювання
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+            sys.setswitchinterval(self.switch_interval)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    # Функція для формування звіту про найзатратніші функції
+    def report(self, top=20):
+        lines = [f"{self.samples} samples every {self.interval * 1000:g} ms",
+                 f"{'self %':>8}{'total %':>9}  function"]
+        for name, count in self.self_samples.most_common(top):
+            lines.append(f"{count / self.samples * 100:>8.1f}{self.total_samples[name] / self.samples * 100:>9.1f}  {name}")
+        return '\n'.join(lines)
+
+    # Функція для збереження стеків у форматі collapsed stacks (flamegraph.pl, speedscope)
+    def save_collapsed(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            for stack, count in self.stacks.items():
+                file.write(f"{stack} {count}\n")
@@ -0,0 +1,70 @@
+import argparse
+import asyncio
+import json
+import time
+
+# Імпорт функції читання повідомлень HTTP з файлу inference_service.py
+from inference_service import read_http_message
+
+# Функція для читання текстів запитів з файлу
+def read_texts(file_path):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return [line.replace('\n', '') for line in file if line.strip()]
+
+# Функція для надсилання запитів через одне з'єднання keep-alive
+async def client(host, port, texts, counter, n_requests, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while counter[0] < n_requests:
+            text = texts[counter[0] % len(texts)]
+            counter[0] += 1
+
+            body = json.dumps({'text': text}).encode('utf-8')
+            request = (f"POST /predict HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                       f"Content-Length: {len(body)}\r\n\r\n").encode('latin-1') + body
+
+            # Час від надсилання запиту до отримання повної відповіді
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            start_line, _, _ = await read_http_message(reader)
+            latencies.append(time.perf_counter() - start)
+
+            status = int(start_line.split(' ')[1])
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+# Функція для отримання значення перцентиля з відсортованого списку
+def percentile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+# Функція для запуску навантаження та виведення статистики
+async def run(args):
+    texts = read_texts(args.file)
+    counter = [0]
+    latencies = []
+    statuses = {}
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client(args.host, args.port, texts, counter, args.requests, latencies, statuses)
+                           for _ in range(args.concurrency)])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"Requests:     {len(latencies)} in {elapsed:.2f} s with {args.concurrency} connections")
+    print(f"Throughput:   {len(latencies) / elapsed:.1f} requests/s")
+    print(f"Latency p50:  {percentile(latencies, 0.5) * 1000:.2f} ms")
+    print(f"Latency p99:  {percentile(latencies, 0.99) * 1000:.2f} ms")
+    print(f"Status codes: {dict(sorted(statuses.items()))}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load generator for inference_service.py")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--file', default='test.txt')
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
@@ -1,35 +1,194 @@
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import classification_report, confusion_matrix
-import matplotlib.pyplot as plt
-import seaborn as sns
+# Модулі для навчання (sklearn.linear_model, sklearn.metrics, matplotlib, seaborn)
+# імпортуються лише під час навчання, щоб не сповільнювати запуск передбачення
+import hashlib
+import json
 import numpy as np
 import joblib
 import os
 
 # Імпорт класу TextVectorizer з файлу text_vectorizing.py
-from text_vectorizing import TextVectorizer
+from text_vectorizing import TextVectorizer, VECTORIZER_PATH, HASHING_VECTORIZER_PATH
+# Імпорт класу TextPreprocessor з файлу text_preprocessing.py
+from text_preprocessing import TextPreprocessor
+# Імпорт кешу передбачень з файлу caching.py
+from caching import PredictionCache, files_signature, files_fingerprint
+# Імпорт функцій для роботи з артефактом моделі з файлу model_artifact.py
+from model_artifact import ARTIFACT_PATH, ModelArtifact, artifact_files, export_artifact, read_manifest
+# Імпорт рушія передбачення на NumPy з файлу numpy_inference.py
+from numpy_inference import NumpyInferenceEngine
+
+# Шлях до файлу з моделлю
+MODEL_PATH = "models/mlr.pkl"
+# Шлях до файлу з моделлю для режиму хешування ознак
+HASHING_MODEL_PATH = "models/mlr_hashing.pkl"
+
+# Функція для збереження об'єкта joblib через тимчасовий файл у тому ж каталозі:
+# процеси, що читають файл, бачать або попередню, або нову версію повністю
+def dump_atomic(value, path):
+    temporary_path = f"{path}.tmp{os.getpid()}"
+    joblib.dump(value, temporary_path)
+    os.replace(temporary_path, path)
 
 class MultinomialLR():
-    def __init__(self):
-        # Завантаження моделі
-        self.load_model()
-        
-        # Ініціалізація об'єкту TextVectorizer для векторизації тексту
-        self.vectorizer = TextVectorizer()
+    def __init__(self, cache_size=10000, cache_path=None, artifact_path=None, backend='sklearn', dtype='float64',
+                 hashing=False, n_features=2 ** 18):
+        # Перевірка рушія передбачення
+        if backend not in ('sklearn', 'numpy'):
+            raise ValueError(f"Unknown backend: {backend}")
+        # Артефакт та рушій NumPy потребують словника, якого немає в режимі хешування ознак
+        if hashing and (backend != 'sklearn' or artifact_path is not None):
+            raise ValueError("Hashing mode supports only the sklearn backend without an artifact")
+
+        # Модель, TextVectorizer та рушій NumPy завантажуються під час першого використання
+        self._mlr = None
+        self._vectorizer = None
+        self._engine = None
+        # Рушій передбачення: 'sklearn' або 'numpy' (тип даних 'float64' або 'float32')
+        self.backend = backend
+        self.dtype = dtype
+        # Каталог артефакту моделі (None - завантаження з файлів joblib)
+        self.artifact_path = artifact_path
+        # Режим хешування ознак (окремі файли моделі та ваг IDF)
+        self.hashing = hashing
+        self.n_features = n_features
+
+        # Кеш передбачень за очищеним текстом. Відбиток вмісту файлів моделі та налаштувань
+        # попередньої обробки потрібен лише сховищу на диску, тому без cache_path він не обчислюється
+        # (запуск не читає файли моделі та індекс антонімів повністю)
+        self.model_signature = files_signature(self.model_files())
+        self.model_fingerprint = None
+        self.preprocessing_settings = None
+        self.prediction_cache = PredictionCache(cache_size,
+                                                cache_path,
+                                                self.cache_fingerprint(self.expected_preprocessor()) if cache_path is not None else '')
+
+    # Функція для отримання списку файлів, з яких завантажується модель
+    def model_files(self):
+        if self.artifact_path is not None:
+            return artifact_files(self.artifact_path)
+        if self.hashing:
+            return (HASHING_MODEL_PATH, HASHING_VECTORIZER_PATH)
+        return (MODEL_PATH, VECTORIZER_PATH)
+
+    # Функція для отримання налаштувань попередньої обробки та шляху до індексу антонімів
+    @staticmethod
+    def preprocessing_state(textPreprocessor):
+        index = textPreprocessor.antonym_index
+        return textPreprocessor.settings(), index.path if index is not None else None
+
+    # Функція для отримання TextPreprocessor, з яким оброблятимуться тексти (без завантаження векторизатора)
+    def expected_preprocessor(self):
+        if self._vectorizer is not None:
+            return self._vectorizer.textPreprocessor
+        textPreprocessor = TextPreprocessor()
+        if self.artifact_path is not None:
+            textPreprocessor.apply_settings(read_manifest(self.artifact_path)['preprocessing'])
+        return textPreprocessor
+
+    # Функція для обчислення відбитка кешу передбачень: ключ кешу залежить лише від очищеного тексту,
+    # тому відбиток містить файли моделі, налаштування попередньої обробки та вміст індексу антонімів
+    def cache_fingerprint(self, textPreprocessor):
+        if self.model_fingerprint is None:
+            self.model_fingerprint = files_fingerprint(self.model_files())
+        self.preprocessing_settings = self.preprocessing_state(textPreprocessor)
+        settings, index_path = self.preprocessing_settings
+        config = {'model': self.model_fingerprint,
+                  'preprocessing': settings,
+                  'antonym_index': files_fingerprint([index_path]) if index_path is not None else None}
+        return hashlib.sha1(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+
+    # Функція для скидання кешу передбачень після зміни моделі або налаштувань попередньої обробки
+    def refresh_cache(self, textPreprocessor):
+        if self.prediction_cache.path is None:
+            # Кеш лише в пам'яті: замість відбитка вмісту достатньо очищення
+            self.preprocessing_settings = self.preprocessing_state(textPreprocessor)
+            self.prediction_cache.invalidate()
+        else:
+            self.prediction_cache.set_fingerprint(self.cache_fingerprint(textPreprocessor))
+
+    # Функція для отримання шляху до файлу моделі для поточного режиму
+    def model_path(self):
+        return HASHING_MODEL_PATH if self.hashing else MODEL_PATH
+
+    # Модель логістичної регресії (завантажується під час першого використання)
+    @property
+    def mlr(self):
+        if self._mlr is None:
+            self.load_model()
+        return self._mlr
+
+    @mlr.setter
+    def mlr(self, mlr):
+        self._mlr = mlr
+        self._engine = None  # Рушій NumPy буде створено заново з новою моделлю
+
+    # Об'єкт TextVectorizer для векторизації тексту (створюється під час першого використання)
+    @property
+    def vectorizer(self):
+        if self._vectorizer is None:
+            if self.artifact_path is not None:
+                self.load_artifact(self.artifact_path)
+            else:
+                self._vectorizer = TextVectorizer(hashing=self.hashing, n_features=self.n_features)
+        return self._vectorizer
+
+    @vectorizer.setter
+    def vectorizer(self, vectorizer):
+        self._vectorizer = vectorizer
+
+    # Рушій передбачення на NumPy (створюється під час першого використання)
+    @property
+    def engine(self):
+        if self._engine is None:
+            if self.artifact_path is not None:
+                self.load_artifact(self.artifact_path)
+            else:
+                self._engine = NumpyInferenceEngine.from_sklearn(self.vectorizer.vectorizer, self.mlr, self.dtype)
+        return self._engine
+
+    # Функція для перевірки, що кількість ознак векторизатора збігається з кількістю коефіцієнтів моделі
+    def features_match(self):
+        vectorizer = self.vectorizer.vectorizer
+        if vectorizer is None or self._mlr is None:
+            return True
+        n_features = len(vectorizer.vocabulary_) if hasattr(vectorizer, 'vocabulary_') else vectorizer.n_features
+        return n_features == self._mlr.coef_.shape[1]
+
+    # Функція для отримання міток класів моделі
+    def classes(self):
+        if self.backend == 'numpy':
+            return self.engine.classes
+        return self.mlr.classes_
+
+    # Функція для створення мультиноміальної логістичної регресії з параметрами навчання
+    # (params замінюють параметри за замовчуванням, наприклад, знайдені пошуком гіперпараметрів)
+    @staticmethod
+    def build_classifier(**params):
+        from sklearn.linear_model import LogisticRegression
+
+        return LogisticRegression(**{'multi_class': 'multinomial',
+                                     'solver': 'sag',
+                                     'penalty': 'l2',
+                                     'max_iter': 1000,
+                                     'random_state': 42,
+                                     'C': 1,
+                                     'tol': 1e-4,
+                                     **params})
+
+    # Функція для тренування моделі (draw - показати матрицю помилок, save - зберегти моделі,
+    # use_cache - використати збережені матриці ознак, якщо датасет та параметри не змінилися,
+    # vectorizer_params та classifier_params - параметри set_vectorizer та LogisticRegression)
+    def train_model(self, draw=True, save=True, use_cache=True, vectorizer_params=None, classifier_params=None):
+        from sklearn.metrics import classification_report
+        from rebalancing import class_weight_params
 
-    # Функція для тренування моделі
-    def train_model(self):
         # Ініціалізація мультиноміальної логістичної регресії з певними параметрами
-        self.mlr = LogisticRegression(multi_class='multinomial',
-                                      solver='sag',
-                                      penalty='l2',
-                                      max_iter=1000,
-                                      random_state=42,
-                                      C=1,
-                                      tol=1e-4)
+        # (стратегія 'class_weight' замінює оверсемплінг вагами класів у функції втрат)
+        rebalance = (vectorizer_params or {}).get('rebalance', 'smote')
+        self.mlr = self.build_classifier(**{**class_weight_params(rebalance), **(classifier_params or {})})
         
         # Навчання моделі для векторизації тексту за допомогою TextVectorizer
-        self.vectorizer.train_vectorizer()
+        self.vectorizer.train_vectorizer(save=save, use_cache=use_cache, vectorizer_params=vectorizer_params)
         
         # Отримання тренувального та тестового наборів даних з TextVectorizer
         X_train, X_test, y_train, y_test = self.vectorizer.get_train_test()
@@ -49,21 +208,40 @@ class MultinomialLR():
         print(f"\nClassification report: \n{cr}\n")
         
         # Побудова матриці помилок
-        self.draw_confusion_matrix(y_pred, y_test)
+        if draw:
+            self.draw_confusion_matrix(y_pred, y_test)
         
         # Збереження навченої моделі
-        self.save_model()
+        if save:
+            self.save_model()
+
+    # Функція для побудови матриці помилок (path - зберегти у файл замість показу вікна)
+    def draw_confusion_matrix(self, y_pred, y_test, path=None):
+        from sklearn.metrics import confusion_matrix
 
-    # Функція для побудови матриці помилок
-    def draw_confusion_matrix(self, y_pred, y_test):
         # Обчислення матриці помилок
         cm = confusion_matrix(y_pred, y_test)
+        self.plot_confusion_matrix(cm, path)
+
+    # Функція для побудови теплокарти матриці помилок
+    @staticmethod
+    def plot_confusion_matrix(cm, path=None, title='Confusion Matrix'):
+        import seaborn as sns
+
         labels = ['negative', 'neutral', 'positive']  # Мітки класів
 
+        # Для збереження у файл графік створюється без pyplot, тому вікно не відкривається
+        if path is None:
+            import matplotlib.pyplot as plt
+            figure = plt.figure(figsize=(8, 6))  # Розміри графіку
+        else:
+            from matplotlib.figure import Figure
+            figure = Figure(figsize=(8, 6))  # Розміри графіку
+
         # Побудова теплокарти
-        plt.figure(figsize=(8, 6))  # Розміри графіку
         sns.set(font_scale=1.2)  # Масштаб шрифту
         ax = sns.heatmap(cm,  # Виведення теплокарти
+                         ax=figure.add_subplot(),  # Вісі графіку
                          annot=True,  # Виведення значень в клітинах
                          fmt="d",  # Формат значень: десятковий цілочисельний
                          cmap="Blues",  # Колірна карта
@@ -74,32 +252,95 @@ class MultinomialLR():
         ax.invert_xaxis()  # Обертання вісі X
 
         # Додавання підписів до вісей та заголовку графіку
-        plt.xlabel('Predicted polarity', fontsize=16)  # Підпис для осі X
-        plt.ylabel('Expected polarity', fontsize=16)  # Підпис для осі Y
-        plt.title('Confusion Matrix', fontsize=18)  # Заголовок графіку
-        plt.show()  # Показати графік
+        ax.set_xlabel('Predicted polarity', fontsize=16)  # Підпис для осі X
+        ax.set_ylabel('Expected polarity', fontsize=16)  # Підпис для осі Y
+        ax.set_title(title, fontsize=18)  # Заголовок графіку
+
+        if path is None:
+            plt.show()  # Показати графік
+        else:
+            figure.savefig(path, bbox_inches='tight')  # Збереження графіку у файл
 
     # Функція для збереження моделі
     def save_model(self):
-        # Збереження моделі за допомогою joblib
-        joblib.dump(self.mlr, "models/mlr.pkl")
+        # Збереження моделі за допомогою joblib (файл замінюється атомарно)
+        dump_atomic(self.mlr, self.model_path())
 
     # Функція для завантаження моделі
     def load_model(self):
+        # Завантаження з артефакту, якщо його задано
+        if self.artifact_path is not None:
+            self.load_artifact(self.artifact_path)
         # Перевірка наявності файлу з моделлю
-        if os.path.exists("models/mlr.pkl"):
+        elif os.path.exists(self.model_path()):
             # Завантаження моделі за допомогою joblib
-            self.mlr = joblib.load("models/mlr.pkl") 
+            self.mlr = joblib.load(self.model_path())
         else:
             # Повідомлення про відсутність моделі
             print("No MLR model found.")
                     
+    # Функція для експорту моделі та векторизатора в артефакт, що відображається в пам'ять
+    def export_artifact(self, path=ARTIFACT_PATH):
+        if self.hashing:
+            raise ValueError("Model artifact requires a vocabulary and is not available in hashing mode")
+        # Налаштування попередньої обробки, з якими навчена модель
+        export_artifact(self.vectorizer.vectorizer, self.mlr, path, self.vectorizer.textPreprocessor.settings())
+
+    # Функція для завантаження моделі та векторизатора з артефакту
+    def load_artifact(self, path=ARTIFACT_PATH):
+        artifact = ModelArtifact(path)
+
+        # Створення TextVectorizer без завантаження файлу joblib
+        if self._vectorizer is None:
+            self._vectorizer = TextVectorizer(load=False)
+
+        if self.backend == 'numpy':
+            # Рушій NumPy працює безпосередньо з масивами, відображеними в пам'ять
+            self._engine = NumpyInferenceEngine.from_artifact(artifact, self.dtype)
+        else:
+            self._vectorizer.vectorizer, self.mlr = artifact.to_sklearn()
+
+        # Застосування збережених налаштувань попередньої обробки
+        self._vectorizer.textPreprocessor.apply_settings(artifact.preprocessing)
+
+    # Функція для перезавантаження моделі та очищення кешу, якщо файли моделі змінилися
+    def reload_if_changed(self):
+        signature = files_signature(self.model_files())
+        if signature != self.model_signature:
+            fingerprint = files_fingerprint(self.model_files())
+            if fingerprint != self.model_fingerprint:
+                if self.artifact_path is not None:
+                    try:
+                        self.load_artifact(self.artifact_path)
+                    except (OSError, ValueError) as error:
+                        # Артефакт саме замінюється: використовується завантажена модель, спроба повториться
+                        print(f"Model reload postponed: {error}")
+                        return
+                else:
+                    self.load_model()
+                    self.vectorizer.load_vectorizer()
+                    # Векторизатор вже замінено, а модель ще ні: спроба повториться після заміни моделі
+                    if not self.features_match():
+                        print("Model reload postponed: vectorizer and model have different numbers of features")
+                        return
+                self.model_fingerprint = fingerprint
+                self.refresh_cache(self.vectorizer.textPreprocessor)
+            self.model_signature = signature
+
+        # Налаштування попередньої обробки могли змінитися після створення кешу (наприклад, з артефакту)
+        if self._vectorizer is not None:
+            textPreprocessor = self._vectorizer.textPreprocessor
+            state = self.preprocessing_state(textPreprocessor)
+            if self.preprocessing_settings is None:
+                # Кеш у пам'яті заповнювався з поточними налаштуваннями
+                self.preprocessing_settings = state
+            elif state != self.preprocessing_settings:
+                self.refresh_cache(textPreprocessor)
+
     # Функція для передбачення ймовірностей тексту
     def predict_pr(self, text):
-        # Векторизація попередньо обробленого тексту
-        vectorized_text = self.vectorizer.vectorize_text(text)
-        # Передбачення ймовірностей класів за допомогою моделі
-        return self.mlr.predict_proba(vectorized_text)
+        # Передбачення ймовірностей класів через кеш передбачень
+        return self.predict_proba_batch([text])
 
     # Функція для передбачення тональності тексту
     def predict_ton(self, text):
@@ -108,4 +349,53 @@ class MultinomialLR():
         tonality = ['negative', 'neutral', 'positive']  # Мітки класів
         
         # Передбачення тональності тексту за допомогою максимальної ймовірності
-        return tonality[np.argmax(prediction)]
\ No newline at end of file
+        return tonality[np.argmax(prediction)]
+
+    # Функція для передбачення ймовірностей для списку текстів
+    def predict_proba_batch(self, texts, batch_size=1000):
+        texts = list(texts)
+        probabilities = np.empty((len(texts), len(self.classes())))
+
+        # Перевірка, чи не змінилися файли моделі з моменту завантаження
+        self.reload_if_changed()
+
+        # Обробка текстів пакетами: один transform та один predict_proba на пакет
+        for start in range(0, len(texts), batch_size):
+            # Очищення текстів та обчислення ключів кешу
+            cleaned_texts = [self.vectorizer.textPreprocessor.cleaning_text(text) for text in texts[start:start + batch_size]]
+            keys = [PredictionCache.key(text) for text in cleaned_texts]
+            cached = self.prediction_cache.get_many(keys)
+
+            # Тексти, яких немає в кеші (однакові тексти обробляються один раз)
+            missing = {}
+            for index, key in enumerate(keys):
+                if key not in cached and key not in missing:
+                    missing[key] = index
+
+            if missing:
+                predicted = self.predict_proba_cleaned([cleaned_texts[index] for index in missing.values()])
+                computed = dict(zip(missing.keys(), predicted))
+                self.prediction_cache.put_many({key: value for key, value in computed.items() if key is not None})
+                cached.update(computed)
+
+            # Заповнення рядків матриці ймовірностей
+            for index, key in enumerate(keys):
+                probabilities[start + index] = cached[key]
+
+        # Матриця ймовірностей усіх текстів
+        return probabilities
+
+    # Функція для передбачення ймовірностей для вже очищених текстів обраним рушієм
+    def predict_proba_cleaned(self, cleaned_texts):
+        if self.backend == 'numpy':
+            return self.engine.predict_proba(self.vectorizer.preprocess_cleaned_texts(cleaned_texts))
+        return self.mlr.predict_proba(self.vectorizer.vectorize_cleaned_texts(cleaned_texts))
+
+    # Функція для передбачення тональності списку текстів
+    def predict_batch(self, texts, batch_size=1000):
+        # Отримання передбачень ймовірностей для всіх текстів
+        probabilities = self.predict_proba_batch(texts, batch_size)
+        tonality = np.array(['negative', 'neutral', 'positive'])  # Мітки класів
+
+        # Передбачення тональності кожного тексту за допомогою максимальної ймовірності
+        return tonality[np.argmax(probabilities, axis=1)]
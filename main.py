@@ -1,13 +1,19 @@
 import os
 import sys
-import json
+import time
+import queue
+import threading
 import tkinter as tk
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from tkinter import filedialog, messagebox
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 # Імпорт класу MultinomialLR з файлу log_model.py
 from log_model import MultinomialLR
+# Імпорт потокового аналізатора з файлу text_scoring.py
+from text_scoring import ResultSink, StreamingScorer, export_json
+# Імпорт посторінкового переглядача результатів з файлу results_viewer.py
+from results_viewer import ResultsViewer
 
 class TextAnalysisApp(tk.Tk):	
 	def __init__(self):
@@ -20,17 +26,26 @@ class TextAnalysisApp(tk.Tk):
 		# Словник для зберігання даних про тональність тексту
 		self.tonality = {'negative': 0, 'neutral': 0, 'positive': 0}
 
-		# Екземпляр моделі MultinomialLR для аналізу тональності
+		# Екземпляр моделі MultinomialLR для аналізу тональності (модель завантажується під час першого аналізу)
 		self.mlr = MultinomialLR()
 
-		# Ініціалізація змінних для додаткових вікон та текстових полів
+		# Потоковий аналізатор файлів з обмеженим використанням пам'яті
+		self.scorer = StreamingScorer(self.mlr)
+
+		# Ініціалізація змінних для додаткових вікон
 		self.json_window = None
-		self.json_text_area = None
 		self.analysis_window = None
 
-		# Видалення існуючого файлу "text_tonality.json", якщо такий існує
-		if os.path.isfile("text_tonality.json"):
-			os.remove("text_tonality.json")
+		# Черга повідомлень від фонового потоку аналізу та подія для його скасування
+		self.progress_queue = None
+		self.cancel_event = None
+		# Мінімальний інтервал між оновленнями графіка під час аналізу (с)
+		self.plot_interval = 0.5
+
+		# Видалення існуючих файлів з результатами, якщо такі існують
+		for results_file in ("text_tonality.json", "text_tonality.jsonl"):
+			if os.path.isfile(results_file):
+				os.remove(results_file)
 
 		# Створення віджетів для інтерфейсу користувача
 		self.create_widgets()
@@ -43,6 +58,9 @@ class TextAnalysisApp(tk.Tk):
 
 	# Функція для закриття вікна та завершення роботи програми
 	def on_closing(self):
+		# Зупинка фонового аналізу, якщо він виконується
+		if self.cancel_event is not None:
+			self.cancel_event.set()
 		self.destroy()
 		sys.exit()
 
@@ -64,8 +82,8 @@ class TextAnalysisApp(tk.Tk):
 		self.view_json_button = tk.Button(self.button_frame, text="View prediction of text", command=self.view_json_file)  # Створення кнопки
 		self.view_json_button.pack(side='left', padx=10)  # Розміщення кнопки зліва з відступом від краю
 
-		# Вимкнення кнопки перегляду прогнозу, якщо файл "text_tonality.json" не існує
-		if not os.path.isfile('text_tonality.json'):  # Перевірка наявності файлу
+		# Вимкнення кнопки перегляду прогнозу, якщо файл "text_tonality.jsonl" не існує
+		if not os.path.isfile('text_tonality.jsonl'):  # Перевірка наявності файлу
 			self.view_json_button.config(state='disabled')  # Вимкнення кнопки, якщо файл не існує
 
 		# Створення фрейму для графіка та його розміщення
@@ -73,7 +91,8 @@ class TextAnalysisApp(tk.Tk):
 		self.graph_frame.pack(pady=(5, 0))  # Розміщення фрейму з відступом від верхнього краю
 
 		# Створення графіка для відображення кількості класів тональності
-		self.fig, self.ax = plt.subplots()  # Створення об'єктів графіка та вісей
+		self.fig = Figure()  # Створення об'єкта графіка без pyplot
+		self.ax = self.fig.add_subplot()  # Створення вісей графіка
 		self.ax.set_title("The count of tonality classes")  # Встановлення заголовку графіка
 		self.ax.set_xlabel("Tonality")  # Встановлення підпису для вісі X
 		self.ax.set_ylabel("Count")  # Встановлення підпису для вісі Y
@@ -91,45 +110,103 @@ class TextAnalysisApp(tk.Tk):
 	def browse_file(self):
 		file_path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt")])
 		if file_path:
-			self.start_analysis()
-			self.after(20, lambda: self.analyze_file(file_path))
-
-	# Функція для аналізу текстового файлу
-	def analyze_file(self, file_path):
+			# Вимкнення кнопок, щоб не запускати інший аналіз до завершення поточного
+			self.browse_button.config(state='disabled')
+			self.text_entry_button.config(state='disabled')
+			# Файл результатів перезаписується: переглядач індексує лише завершений файл,
+			# тому він закривається і стає доступним після завершення аналізу
+			self.view_json_button.config(state='disabled')
+			if self.json_window is not None:
+				self.on_json_window_close()
+			self.start_analysis(cancellable=True)
+
+			# Аналіз виконується у фоновому потоці, а головний цикл Tk лише читає чергу прогресу
+			self.progress_queue = queue.Queue()
+			self.cancel_event = threading.Event()
+			self.analysis_start = time.perf_counter()
+			self.last_plot_update = 0.0
+			threading.Thread(target=self.analyze_file, args=(file_path, self.progress_queue, self.cancel_event), daemon=True).start()
+			self.after(100, self.poll_progress)
+
+	# Функція для аналізу текстового файлу (виконується у фоновому потоці)
+	def analyze_file(self, file_path, progress_queue, cancel_event):
 		try:
-			with open(file_path, 'r', encoding='utf-8') as file:
-				self.tonality = {'negative': 0, 'neutral': 0, 'positive': 0}
-				self.text_pred = {}
-				
-				# Читання файлу по рядках а визначення тональності
-				for line in file:
-					if line:
-						line = line.replace('\n', '')
-						prediction = self.mlr.predict_ton(line)
-						self.tonality[prediction] += 1
-						self.text_pred[line] = prediction
-				
-				# Оновлення графіка з новими даними
-				self.update_plot()
-				
-				# Запис прогнозів у файл "text_tonality.json"
-				with open('text_tonality.json', 'w') as f:
-					json.dump(self.text_pred, f, indent=4)
-				
-				# Активування кнопки перегляду прогнозу
-				self.view_json_button.config(state='normal')
-				
-				# Оновлення вмісту JSON вікна, якщо воно відкрите
-				if self.json_window is not None:
-					self.update_json_content(self.text_pred)
-		
-		# Обробка виключень, що виникають під час читання файлу
+			# Потоковий аналіз файлу частинами із записом результатів у "text_tonality.jsonl"
+			# та фінальним експортом прогнозів у файл "text_tonality.json"
+			tonality = self.scorer.score_file(file_path, 'text_tonality.jsonl', json_path='text_tonality.json',
+				progress=lambda *state: progress_queue.put(('progress', state)), cancel_event=cancel_event)
+			progress_queue.put(('done', tonality))
+
+		# Виключення передається в головний потік для відображення
 		except Exception as e:
-			messagebox.showerror("Error", f"An error occurred while reading the file: {e}")
-		
+			progress_queue.put(('error', e))
+
+	# Функція для обробки повідомлень фонового потоку в головному циклі Tk
+	def poll_progress(self):
+		progress = None
+		while True:
+			try:
+				kind, value = self.progress_queue.get_nowait()
+			except queue.Empty:
+				break
+
+			if kind == 'progress':
+				# Відображається лише останній стан прогресу
+				progress = value
+			elif kind == 'done':
+				self.finish_file_analysis(value)
+				return
+			else:
+				self.finish_file_analysis(None)
+				messagebox.showerror("Error", f"An error occurred while reading the file: {value}")
+				return
+
+		if progress is not None:
+			lines_done, total_lines, tonality = progress
+			self.tonality = tonality
+			self.show_progress(lines_done, total_lines)
+
+			# Графік оновлюється не частіше, ніж раз на plot_interval секунд
+			if time.perf_counter() - self.last_plot_update >= self.plot_interval:
+				self.update_plot()
+				self.last_plot_update = time.perf_counter()
+
+		self.after(100, self.poll_progress)
+
+	# Функція для відображення кількості оброблених рядків, швидкості та часу, що залишився
+	def show_progress(self, lines_done, total_lines):
+		if self.analysis_window is None or self.cancel_event.is_set():
+			return
+		elapsed = time.perf_counter() - self.analysis_start
+		speed = lines_done / elapsed if elapsed > 0 else 0.0
+		eta = (total_lines - lines_done) / speed if speed > 0 else 0.0
+		self.analysis_label.config(text=f"{lines_done} / {total_lines} lines\n{speed:.0f} lines/s\nETA {eta:.0f} s")
+
+	# Функція для завершення аналізу файлу в головному потоці
+	def finish_file_analysis(self, tonality):
+		if tonality is not None:
+			self.tonality = tonality
+
+			# Оновлення графіка з новими даними
+			self.update_plot()
+
+		# Активування кнопки перегляду прогнозу: запис файлу результатів завершено
+		# (після помилки у файлі залишаються результати вже оброблених частин)
+		if os.path.isfile('text_tonality.jsonl'):
+			self.view_json_button.config(state='normal')
+
 		# Кінець аналізу
-		finally:
-			self.stop_analysis()
+		self.progress_queue = None
+		self.cancel_event = None
+		self.browse_button.config(state='normal')
+		self.text_entry_button.config(state='normal')
+		self.stop_analysis()
+
+	# Функція для скасування аналізу файлу (зупиняється після поточної частини)
+	def cancel_analysis(self):
+		if self.cancel_event is not None:
+			self.cancel_event.set()
+			self.analysis_label.config(text="Cancelling...")
 
 	# Функція для відкриття вікна введення тексту
 	def open_text_entry_window(self):
@@ -171,29 +248,28 @@ class TextAnalysisApp(tk.Tk):
 	def analyze_text(self, text_entry):
 		try:
 			self.tonality = {'negative': 0, 'neutral': 0, 'positive': 0}
-			self.text_pred = {}
 			entered_text = text_entry.get("1.0", tk.END)
 			
-			# Аналіз кожного рядка введеного тексту та його визначення тональності
-			for line in entered_text.split('\n'):
-				if line:
-					prediction = self.mlr.predict_ton(line)
-					self.tonality[prediction] += 1
-					self.text_pred[line] = prediction
+			# Аналіз усіх рядків введеного тексту та визначення їх тональності пакетом
+			lines = [line for line in entered_text.split('\n') if line]
+			predictions = self.mlr.predict_batch(lines)
+			for prediction in predictions:
+				self.tonality[prediction] += 1
 
 			# Оновлення графіка з новими даними
 			self.update_plot()
 
-			# Запис прогнозів у файл "text_tonality.json"
-			with open('text_tonality.json', 'w') as f:
-				json.dump(self.text_pred, f, indent=4)
+			# Запис прогнозів у файл "text_tonality.jsonl" та експорт у файл "text_tonality.json"
+			with ResultSink('text_tonality.jsonl') as sink:
+				sink.write(lines, predictions)
+			export_json('text_tonality.jsonl', 'text_tonality.json')
 
 			# Активування кнопки перегляду прогнозу
 			self.view_json_button.config(state='normal')
 
-			# Оновлення вмісту JSON вікна, якщо воно відкрите
+			# Оновлення вмісту вікна результатів, якщо воно відкрите
 			if self.json_window is not None:
-				self.update_json_content(self.text_pred)
+				self.json_window.reload()
 
 		# Обробка виключень, що виникають під час читання тексту
 		except Exception as e:
@@ -204,35 +280,19 @@ class TextAnalysisApp(tk.Tk):
 			self.stop_analysis()
 		
 
-	# Функція для перегляду JSON файлу з прогнозами тональності
+	# Функція для перегляду прогнозів тональності у посторінковому вікні
 	def view_json_file(self):
-		if os.path.isfile('text_tonality.json'):
-			with open('text_tonality.json', 'r') as file:
-				data = json.load(file)
-				self.show_json_content(data)
+		if os.path.isfile('text_tonality.jsonl'):
+			# Записи читаються з файлу "text_tonality.jsonl" по одній сторінці
+			if self.json_window is None:
+				self.json_window = ResultsViewer(self, 'text_tonality.jsonl')
+				self.json_window.protocol("WM_DELETE_WINDOW", self.on_json_window_close)
+			else:
+				self.json_window.reload()
 		else:
-			messagebox.showerror("Error", "The text_tonality.json file does not exist.")
-
-	# Функція для відображення вмісту JSON файлу у новому вікні
-	def show_json_content(self, data):
-		if self.json_window is None:
-			self.json_window = tk.Toplevel(self)
-			self.json_window.title("Text Tonality")
-			self.json_window.protocol("WM_DELETE_WINDOW", self.on_json_window_close)
-			
-			self.json_text_area = tk.Text(self.json_window, wrap='word', font=("Courier New", 14))
-			self.json_text_area.pack(expand=True, fill='both')
-		
-		self.update_json_content(data)
-
-	# Функція для оновлення вмісту текстової області з JSON даними
-	def update_json_content(self, data):
-		self.json_text_area.config(state='normal')
-		self.json_text_area.delete('1.0', tk.END)
-		self.json_text_area.insert('1.0', json.dumps(data, indent=4))
-		self.json_text_area.config(state='disabled')
+			messagebox.showerror("Error", "The text_tonality.jsonl file does not exist.")
 
-	# Функція для обробки закриття JSON вікна
+	# Функція для обробки закриття вікна результатів
 	def on_json_window_close(self):
 		self.json_window.destroy()
 		self.json_window = None
@@ -242,9 +302,9 @@ class TextAnalysisApp(tk.Tk):
 		# Створення списку лічильників для кожного класу тональності
 		counts = [self.tonality['negative'], self.tonality['neutral'], self.tonality['positive']]
 
-		# Оновлення висоти стовпців графіка
+		# Оновлення висоти існуючих стовпців графіка
 		for bar, count in zip(self.bar_plot, counts):
-			bar.set_height(0)
+			bar.set_height(count)
 
 		# Встановлення максимального значення по осі y
 		y_max = max(counts) * 1.1
@@ -253,18 +313,16 @@ class TextAnalysisApp(tk.Tk):
 		else:
 			self.ax.set_ylim(0, y_max)
 
-		# Оновлення графіка
-		self.bar_plot = self.ax.bar(["negative", "neutral", "positive"], counts, color='blue')
-		self.canvas.draw()
-		self.canvas.get_tk_widget().pack()
+		# Перемальовування графіка
+		self.canvas.draw_idle()
 
 	# Функція для початку аналізу тексту
-	def start_analysis(self):
+	def start_analysis(self, cancellable=False):
 		# Створення вікна для відображення процесу аналізу, якщо воно ще не створене
 		if self.analysis_window is None:  # Перевірка, чи вікно аналізу вже створено
 			self.analysis_window = tk.Toplevel(self)  # Створення нового вікна
 			self.analysis_window.title("")  # Встановлення заголовку вікна
-			self.analysis_window.geometry("200x100")  # Встановлення розміру вікна
+			self.analysis_window.geometry("240x140")  # Встановлення розміру вікна
 
 			# Визначення положення вікна аналізу відносно головного вікна програми
 			main_x = self.winfo_rootx()  # Отримання координати X головного вікна
@@ -272,8 +330,8 @@ class TextAnalysisApp(tk.Tk):
 			main_width = self.winfo_width()  # Отримання ширини головного вікна
 			main_height = self.winfo_height()  # Отримання висоти головного вікна
 
-			analysis_width = 200  # Ширина вікна аналізу
-			analysis_height = 100  # Висота вікна аналізу
+			analysis_width = 240  # Ширина вікна аналізу
+			analysis_height = 140  # Висота вікна аналізу
 
 			analysis_x = main_x + (main_width - analysis_width) // 2  # Розрахунок координати X для вікна аналізу
 			analysis_y = main_y + (main_height - analysis_height) // 2  # Розрахунок координати Y для вікна аналізу
@@ -284,6 +342,11 @@ class TextAnalysisApp(tk.Tk):
 			self.analysis_label = tk.Label(self.analysis_window, text="Analyzing...", font=("Courier New", 12))  # Створення напису
 			self.analysis_label.pack(expand=True)  # Розміщення напису у вікні аналізу
 
+			# Кнопка скасування та закриття вікна скасовують фоновий аналіз файлу
+			if cancellable:
+				tk.Button(self.analysis_window, text="Cancel", command=self.cancel_analysis).pack(pady=(0, 5))
+				self.analysis_window.protocol("WM_DELETE_WINDOW", self.cancel_analysis)
+
 	# Функція для завершення аналізу тексту та закриття вікна процесу аналізу
 	def stop_analysis(self):
 		if self.analysis_window is not None:
@@ -0,0 +1,141 @@
+import json
+import os
+import shutil
+import numpy as np
+
+# Версія формату артефакту моделі
+FORMAT_VERSION = 1
+# Каталог артефакту за замовчуванням
+ARTIFACT_PATH = "models/artifact"
+# Масиви, що зберігаються в окремих .npy файлах
+ARRAY_NAMES = ('vocabulary', 'vocabulary_columns', 'idf', 'coef', 'intercept', 'classes')
+
+# Функція для перетворення параметрів моделі sklearn у формат JSON
+def json_params(params):
+    result = {}
+    for name, value in params.items():
+        # Користувацькі функції неможливо зберегти в артефакті
+        if callable(value) and name != 'dtype':
+            raise ValueError(f"Parameter {name} is a callable and cannot be exported")
+        if name == 'dtype':
+            value = np.dtype(value).name
+        elif isinstance(value, tuple):
+            value = list(value)
+        if value is None or isinstance(value, (bool, int, float, str, list)):
+            result[name] = value
+    return result
+
+# Функція для визначення, чи модель використовує softmax (мультиноміальна) замість one-vs-rest
+def is_multinomial(mlr):
+    multi_class = mlr.get_params().get('multi_class', 'auto')
+    ovr = multi_class in ('ovr', 'warn') or (multi_class in ('auto', 'deprecated') and
+                                              (len(mlr.classes_) <= 2 or mlr.solver == 'liblinear'))
+    return not ovr
+
+# Функція для отримання списку файлів артефакту
+def artifact_files(path=ARTIFACT_PATH):
+    return tuple([os.path.join(path, 'manifest.json')] + [os.path.join(path, name + '.npy') for name in ARRAY_NAMES])
+
+# Функція для експорту векторизатора та моделі у версійований бінарний формат.
+# Артефакт записується в сусідній тимчасовий каталог і лише потім замінює попередній,
+# тому процеси з reload_if_changed ніколи не читають суміш старих та нових масивів
+def export_artifact(vectorizer, mlr, path=ARTIFACT_PATH, preprocessing=None):
+    path = os.path.normpath(path)
+    temporary_path = f"{path}.tmp{os.getpid()}"
+    shutil.rmtree(temporary_path, ignore_errors=True)
+    os.makedirs(temporary_path)
+
+    # Терміни словника в порядку колонок матриці ознак
+    vocabulary = vectorizer.vocabulary_
+    terms = [term.encode('utf-8') for term in sorted(vocabulary, key=vocabulary.get)]
+
+    # Відсортована таблиця рядків для бінарного пошуку та відповідні їм номери колонок
+    order = sorted(range(len(terms)), key=terms.__getitem__)
+    width = max((len(term) for term in terms), default=1)
+
+    arrays = {'vocabulary': np.array([terms[i] for i in order], dtype=f'S{width}'),
+              'vocabulary_columns': np.array(order, dtype=np.int32),
+              'idf': np.asarray(vectorizer.idf_, dtype=np.float64),
+              'coef': np.asarray(mlr.coef_, dtype=np.float64),
+              'intercept': np.asarray(mlr.intercept_, dtype=np.float64),
+              'classes': np.asarray(mlr.classes_)}
+
+    # Кожен масив записується окремим .npy файлом, щоб його можна було відобразити в пам'ять
+    for name, array in arrays.items():
+        np.save(os.path.join(temporary_path, name + '.npy'), np.ascontiguousarray(array), allow_pickle=False)
+
+    # Розміри масивів у маніфесті дозволяють завантажувачу перевірити, що файли належать одному експорту
+    manifest = {'format_version': FORMAT_VERSION,
+                'vectorizer_params': json_params(vectorizer.get_params()),
+                'classifier_params': json_params(mlr.get_params()),
+                'multinomial': is_multinomial(mlr),
+                'preprocessing': preprocessing or {},
+                'arrays': list(ARRAY_NAMES),
+                'shapes': {name: list(array.shape) for name, array in arrays.items()}}
+    with open(os.path.join(temporary_path, 'manifest.json'), 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=4)
+
+    # Заміна каталогу: попередній артефакт перейменовується і видаляється після появи нового.
+    # Процеси, що вже відобразили старі файли в пам'ять, продовжують їх використовувати
+    previous_path = f"{path}.old{os.getpid()}"
+    if os.path.exists(path):
+        os.replace(path, previous_path)
+    os.replace(temporary_path, path)
+    shutil.rmtree(previous_path, ignore_errors=True)
+
+# Функція для читання маніфесту артефакту
+def read_manifest(path=ARTIFACT_PATH):
+    with open(os.path.join(path, 'manifest.json'), 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+class ModelArtifact:
+    def __init__(self, path=ARTIFACT_PATH, mmap_mode='r'):
+        self.path = path
+
+        # Читання маніфесту та перевірка версії формату
+        manifest = read_manifest(path)
+        if manifest['format_version'] > FORMAT_VERSION:
+            raise ValueError(f"Unsupported model artifact version: {manifest['format_version']}")
+
+        self.vectorizer_params = manifest['vectorizer_params']
+        self.classifier_params = manifest['classifier_params']
+        self.multinomial = manifest['multinomial']
+        self.preprocessing = manifest['preprocessing']
+
+        # Масиви відображаються в пам'ять: процеси на одному хості спільно використовують сторінки файлів
+        shapes = manifest.get('shapes', {})
+        for name in manifest['arrays']:
+            array = np.load(os.path.join(path, name + '.npy'), mmap_mode=mmap_mode, allow_pickle=False)
+            # Масив іншого експорту (артефакт замінено під час читання)
+            if name in shapes and list(array.shape) != shapes[name]:
+                raise ValueError(f"Array {name} has shape {array.shape}, manifest expects {tuple(shapes[name])}")
+            setattr(self, name, array)
+
+    # Функція для отримання словника термін -> колонка
+    def vocabulary_dict(self):
+        return {term.decode('utf-8'): int(column) for term, column in zip(self.vocabulary.tolist(), self.vocabulary_columns)}
+
+    # Функція для відновлення TfidfVectorizer та LogisticRegression з артефакту.
+    # Ваги IDF, коефіцієнти та зсуви залишаються відображеними в пам'ять (без копіювання),
+    # але словник sklearn - це словник Python у пам'яті процесу; спільно весь артефакт
+    # використовує лише рушій NumPy (backend='numpy')
+    def to_sklearn(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+
+        # Відновлення векторизатора з фіксованим словником та збереженими вагами IDF
+        params = dict(self.vectorizer_params)
+        params['ngram_range'] = tuple(params['ngram_range'])
+        params['dtype'] = getattr(np, params['dtype'])
+        params['vocabulary'] = self.vocabulary_dict()
+        vectorizer = TfidfVectorizer(**params)
+        vectorizer.idf_ = np.asarray(self.idf)
+
+        # Відновлення моделі логістичної регресії з коефіцієнтами та зсувами
+        mlr = LogisticRegression(**self.classifier_params)
+        mlr.coef_ = np.asarray(self.coef)
+        mlr.intercept_ = np.asarray(self.intercept)
+        mlr.classes_ = np.array(self.classes)
+        mlr.n_features_in_ = mlr.coef_.shape[1]
+
+        return vectorizer, mlr
@@ -0,0 +1,131 @@
+import argparse
+import copy
+import os
+import time
+import joblib
+import numpy as np
+
+# Імпорт шляхів до моделей з файлів log_model.py та text_vectorizing.py
+from log_model import MODEL_PATH, dump_atomic
+from text_vectorizing import DATASET_PATH, VECTORIZER_PATH
+
+# Каталог для збереження зменшених моделей
+PRUNED_DIR = "models/pruned"
+# Методи відбору ознак
+METHODS = ('chi2', 'coef')
+
+# Функція для оцінки важливості ознак: chi2 за навчальними даними або найбільший модуль коефіцієнта серед класів
+def feature_scores(method, X=None, y=None, classifier=None):
+    if method == 'chi2':
+        from sklearn.feature_selection import chi2
+
+        scores, _ = chi2(X, y)
+        # Ознаки без жодного входження мають chi2 = NaN
+        return np.nan_to_num(scores, nan=0.0)
+    if method == 'coef':
+        return np.abs(classifier.coef_).max(axis=0)
+    raise ValueError(f"Unknown feature selection method: {method}")
+
+# Функція для вибору номерів k найважливіших ознак (у порядку зростання номерів)
+def select_features(scores, k):
+    if k >= len(scores):
+        return np.arange(len(scores))
+    return np.sort(np.argpartition(-scores, k - 1)[:k])
+
+# Функція для створення TfidfVectorizer лише з обраними ознаками
+def prune_vectorizer(vectorizer, keep):
+    if not hasattr(vectorizer, 'vocabulary_'):
+        raise ValueError("Vocabulary pruning requires a fitted TfidfVectorizer (not available in hashing mode)")
+
+    # Словник перебудовується з новими послідовними номерами ознак
+    terms = np.empty(len(vectorizer.vocabulary_), dtype=object)
+    for term, index in vectorizer.vocabulary_.items():
+        terms[index] = term
+    pruned = copy.deepcopy(vectorizer)
+    pruned.vocabulary_ = {term: index for index, term in enumerate(terms[keep])}
+    # Ваги IDF встановлюються після словника, бо sklearn перевіряє їхню довжину
+    pruned.idf_ = vectorizer.idf_[keep]
+    # Список відкинутих max_df/min_df слів потрібен лише для аналізу і збільшує файл
+    if hasattr(pruned, 'stop_words_'):
+        pruned.stop_words_ = None
+    return pruned
+
+# Функція для створення класифікатора лише з коефіцієнтами обраних ознак (без перенавчання)
+def prune_classifier(classifier, keep):
+    pruned = copy.deepcopy(classifier)
+    pruned.coef_ = np.ascontiguousarray(classifier.coef_[:, keep])
+    pruned.n_features_in_ = len(keep)
+    return pruned
+
+# Функція для створення зменшеної пари векторизатора та класифікатора.
+# Після видалення ознак змінюється L2 норма рядків TF-IDF, тому за замовчуванням класифікатор
+# перенавчається на нових ознаках (texts - очищені тексти з виявленими запереченнями,
+# rebalance - стратегія балансування класів для перенавчання, None - без балансування)
+def prune_model(vectorizer, classifier, texts, labels, k, method='chi2', refit=True, rebalance='smote'):
+    from log_model import MultinomialLR
+    from rebalancing import class_weight_params, rebalance as rebalance_classes
+
+    if k < 1:
+        raise ValueError(f"Number of features to keep must be at least 1, got {k}")
+    X = vectorizer.transform(texts) if method == 'chi2' else None
+    keep = select_features(feature_scores(method, X, labels, classifier), k)
+    pruned_vectorizer = prune_vectorizer(vectorizer, keep)
+
+    if not refit:
+        return pruned_vectorizer, prune_classifier(classifier, keep)
+
+    X_pruned, y_pruned = pruned_vectorizer.transform(texts), labels
+    if rebalance is not None:
+        X_pruned, y_pruned = rebalance_classes(X_pruned, y_pruned, rebalance)
+    pruned_classifier = MultinomialLR.build_classifier(**{**classifier.get_params(), **class_weight_params(rebalance)})
+    pruned_classifier.fit(X_pruned, y_pruned)
+    return pruned_vectorizer, pruned_classifier
+
+# Функція для перевірки кількості ознак у аргументах командного рядка
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+# Функція для зменшення робочої моделі
+def prune(args):
+    from text_vectorizing import TextVectorizer
+    from hyperparameter_search import read_dataset
+
+    vectorizer = TextVectorizer().vectorizer
+    classifier = joblib.load(MODEL_PATH)
+    texts, labels = read_dataset(args.data)
+
+    start = time.perf_counter()
+    pruned_vectorizer, pruned_classifier = prune_model(vectorizer, classifier, texts, labels, args.k,
+                                                       args.method, not args.no_refit, args.rebalance)
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    vectorizer_path = os.path.join(args.output_dir, os.path.basename(VECTORIZER_PATH))
+    model_path = os.path.join(args.output_dir, os.path.basename(MODEL_PATH))
+    joblib.dump(pruned_vectorizer, vectorizer_path)
+    joblib.dump(pruned_classifier, model_path)
+    print(f"Kept {len(pruned_vectorizer.vocabulary_)} of {len(vectorizer.vocabulary_)} features ({args.method}) in {elapsed:.2f} s")
+    print(f"Size: {(os.path.getsize(VECTORIZER_PATH) + os.path.getsize(MODEL_PATH)) / 2 ** 20:.2f} MB -> "
+          f"{(os.path.getsize(vectorizer_path) + os.path.getsize(model_path)) / 2 ** 20:.2f} MB, saved to {args.output_dir}")
+
+    # Заміна робочої моделі: сервіси з reload_if_changed підхоплять її без перезапуску.
+    # Кожен файл замінюється атомарно, модель - останньою, тому сервіс не завантажить
+    # обрізаний файл, а нову пару векторизатора та моделі прийме лише після заміни обох
+    if args.promote:
+        dump_atomic(pruned_vectorizer, VECTORIZER_PATH)
+        dump_atomic(pruned_classifier, MODEL_PATH)
+        print(f"Pruned model promoted to {MODEL_PATH} and {VECTORIZER_PATH}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep only the top-k vocabulary features of the trained model")
+    parser.add_argument('--k', type=positive_int, required=True, help="number of features to keep")
+    parser.add_argument('--method', choices=METHODS, default='chi2')
+    parser.add_argument('--data', default=DATASET_PATH, help="dataset for chi2 scores and refitting")
+    parser.add_argument('--no-refit', action='store_true', help="slice the coefficients instead of refitting the classifier")
+    parser.add_argument('--rebalance', default='smote', help="class rebalancing strategy used for refitting")
+    parser.add_argument('--output-dir', default=PRUNED_DIR)
+    parser.add_argument('--promote', action='store_true', help="also overwrite the working model files")
+    prune(parser.parse_args())
@@ -0,0 +1,181 @@
+import re
+import numpy as np
+
+# Допустимі відхилення ймовірностей від sklearn.predict_proba (мітки argmax збігаються)
+FLOAT64_TOLERANCE = 1e-8
+FLOAT32_TOLERANCE = 1e-4
+
+class NumpyInferenceEngine:
+    def __init__(self, vocabulary, idf, coef, intercept, classes, vectorizer_params, multinomial,
+                 vocabulary_columns=None, dtype=np.float64):
+        # Підтримується лише аналізатор слів без користувацьких функцій
+        if vectorizer_params.get('analyzer', 'word') != 'word':
+            raise ValueError("NumpyInferenceEngine supports only analyzer='word'")
+        if vectorizer_params.get('strip_accents') is not None:
+            raise ValueError("NumpyInferenceEngine does not support strip_accents")
+        if vectorizer_params.get('preprocessor') is not None or vectorizer_params.get('tokenizer') is not None:
+            raise ValueError("NumpyInferenceEngine does not support custom preprocessor or tokenizer")
+
+        self.dtype = np.dtype(dtype)
+
+        # Словник: або словник Python термін -> колонка, або відсортована таблиця рядків з номерами колонок
+        self.vocabulary = vocabulary
+        self.vocabulary_columns = vocabulary_columns
+        self.n_features = len(vocabulary)
+
+        # Параметри аналізу тексту як у TfidfVectorizer
+        self.lowercase = vectorizer_params.get('lowercase', True)
+        self.token_pattern = re.compile(vectorizer_params.get('token_pattern', r"(?u)\b\w\w+\b"))
+        self.ngram_range = tuple(vectorizer_params.get('ngram_range', (1, 1)))
+        stop_words = vectorizer_params.get('stop_words')
+        if stop_words == 'english':
+            from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+            stop_words = ENGLISH_STOP_WORDS
+        self.stop_words = frozenset(stop_words) if stop_words is not None else None
+
+        # Параметри зважування TF-IDF
+        self.binary = vectorizer_params.get('binary', False)
+        self.sublinear_tf = vectorizer_params.get('sublinear_tf', False)
+        self.norm = vectorizer_params.get('norm', 'l2')
+        self.idf = np.asarray(idf, dtype=self.dtype) if vectorizer_params.get('use_idf', True) else None
+
+        # Параметри моделі (масиви, відображені в пам'ять, не копіюються, якщо тип даних збігається)
+        self.coef = np.asarray(coef, dtype=self.dtype)
+        self.intercept = np.asarray(intercept, dtype=self.dtype)
+        self.classes = np.asarray(classes)
+        self.multinomial = multinomial
+
+    # Функція для створення рушія з артефакту моделі
+    @classmethod
+    def from_artifact(cls, artifact, dtype=np.float64):
+        return cls(artifact.vocabulary, artifact.idf, artifact.coef, artifact.intercept, artifact.classes,
+                   artifact.vectorizer_params, artifact.multinomial,
+                   vocabulary_columns=artifact.vocabulary_columns, dtype=dtype)
+
+    # Функція для створення рушія з навчених TfidfVectorizer та LogisticRegression
+    @classmethod
+    def from_sklearn(cls, vectorizer, mlr, dtype=np.float64):
+        from model_artifact import is_multinomial
+
+        if not hasattr(vectorizer, 'vocabulary_'):
+            raise ValueError("NumpyInferenceEngine requires a fitted TfidfVectorizer")
+        # Без use_idf векторизатор не має атрибута idf_
+        return cls(vectorizer.vocabulary_, getattr(vectorizer, 'idf_', None), mlr.coef_, mlr.intercept_, mlr.classes_,
+                   vectorizer.get_params(), is_multinomial(mlr), dtype=dtype)
+
+    # Функція для розбиття тексту на терміни (токени та n-грами) як у TfidfVectorizer
+    def analyze(self, text):
+        if self.lowercase:
+            text = text.lower()
+        tokens = self.token_pattern.findall(text)
+        if self.stop_words is not None:
+            tokens = [token for token in tokens if token not in self.stop_words]
+
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+
+        terms = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            for i in range(len(tokens) - n + 1):
+                terms.append(' '.join(tokens[i:i + n]))
+        return terms
+
+    # Функція для пошуку колонок термінів у словнику (-1 для невідомих термінів)
+    def lookup(self, terms):
+        if isinstance(self.vocabulary, dict):
+            get = self.vocabulary.get
+            return np.fromiter((get(term, -1) for term in terms), dtype=np.int64, count=len(terms))
+
+        # Бінарний пошук у відсортованій таблиці рядків UTF-8
+        columns = np.full(len(terms), -1, dtype=np.int64)
+        width = self.vocabulary.dtype.itemsize
+        encoded = [term.encode('utf-8') for term in terms]
+        # Терміни, довші за ширину таблиці, не можуть бути в словнику
+        candidates = np.array([i for i, term in enumerate(encoded) if len(term) <= width], dtype=np.int64)
+        if len(candidates) == 0 or self.n_features == 0:
+            return columns
+
+        keys = np.array([encoded[i] for i in candidates], dtype=self.vocabulary.dtype)
+        positions = np.minimum(np.searchsorted(self.vocabulary, keys), self.n_features - 1)
+        found = self.vocabulary[positions] == keys
+        columns[candidates[found]] = self.vocabulary_columns[positions[found]]
+        return columns
+
+    # Функція для векторизації текстів у розріджений формат (рядки, колонки, значення)
+    def transform(self, texts):
+        n_docs = len(texts)
+        terms = []
+        rows = []
+        for row, text in enumerate(texts):
+            doc_terms = self.analyze(text)
+            terms.extend(doc_terms)
+            rows.extend([row] * len(doc_terms))
+
+        # Залишаються лише терміни зі словника
+        columns = self.lookup(terms)
+        mask = columns >= 0
+        rows = np.asarray(rows, dtype=np.int64)[mask]
+        columns = columns[mask]
+
+        # Підрахунок частоти кожного терміну в документі
+        keys, counts = np.unique(rows * self.n_features + columns, return_counts=True)
+        rows = keys // self.n_features
+        columns = keys % self.n_features
+        values = np.ones(len(keys), dtype=self.dtype) if self.binary else counts.astype(self.dtype)
+
+        # Зважування TF-IDF
+        if self.sublinear_tf:
+            values = np.log(values) + 1
+        if self.idf is not None:
+            values *= self.idf[columns]
+
+        # Нормалізація кожного документа (документи з нульовою нормою не змінюються)
+        if self.norm in ('l1', 'l2'):
+            weights = np.abs(values) if self.norm == 'l1' else values * values
+            norms = np.bincount(rows, weights=weights, minlength=n_docs)
+            if self.norm == 'l2':
+                norms = np.sqrt(norms)
+            norms[norms == 0] = 1
+            values /= norms[rows].astype(self.dtype)
+
+        return rows, columns, values
+
+    # Функція для обчислення значень лінійної функції для кожного класу
+    def decision_function(self, texts):
+        rows, columns, values = self.transform(texts)
+        n_docs = len(texts)
+
+        # Добуток розрідженої матриці ознак на щільну матрицю коефіцієнтів
+        contributions = self.coef[:, columns] * values
+        scores = np.empty((n_docs, self.coef.shape[0]), dtype=self.dtype)
+        for k in range(self.coef.shape[0]):
+            scores[:, k] = np.bincount(rows, weights=contributions[k], minlength=n_docs)
+        return scores + self.intercept
+
+    # Функція для передбачення ймовірностей класів
+    def predict_proba(self, texts):
+        scores = self.decision_function(texts)
+
+        if self.multinomial:
+            # Для двох класів sklearn використовує softmax від (-z, z)
+            if scores.shape[1] == 1:
+                scores = np.hstack([-scores, scores])
+            # Softmax зі зсувом на максимум для числової стабільності
+            scores = scores - scores.max(axis=1, keepdims=True)
+            np.exp(scores, out=scores)
+            return scores / scores.sum(axis=1, keepdims=True)
+
+        # One-vs-rest: сигмоїда для кожного класу з нормалізацією
+        probabilities = 1 / (1 + np.exp(-scores))
+        if probabilities.shape[1] == 1:
+            return np.hstack([1 - probabilities, probabilities])
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+    # Функція для передбачення міток класів
+    def predict(self, texts):
+        scores = self.decision_function(texts)
+        # Для двох класів з одним рядком коефіцієнтів клас визначається знаком
+        if scores.shape[1] == 1:
+            return self.classes[(scores[:, 0] > 0).astype(np.int64)]
+        return self.classes[np.argmax(scores, axis=1)]
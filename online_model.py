@@ -0,0 +1,262 @@
+import argparse
+import json
+import os
+import time
+import joblib
+import numpy as np
+
+# Імпорт функції визначення мультиноміальної моделі з файлу model_artifact.py
+from model_artifact import is_multinomial
+# Імпорт функції обчислення відбитка файлів з файлу caching.py
+from caching import files_fingerprint
+
+# Каталог версійованих контрольних точок моделі
+CHECKPOINT_DIR = "models/checkpoints"
+
+class OnlineTrainer:
+    def __init__(self, mlr, learning_rate=0.5, alpha=1e-4, batch_size=256, epochs=1, random_state=42):
+        # Модель MultinomialLR, коефіцієнти якої оновлюються на місці
+        self.mlr = mlr
+        # Крок SGD, коефіцієнт L2 регуляризації, розмір міні-пакета та кількість проходів по нових даних
+        self.learning_rate = learning_rate
+        self.alpha = alpha
+        self.batch_size = batch_size
+        self.epochs = epochs
+        self.rng = np.random.default_rng(random_state)
+        # Кількість виконаних кроків та врахованих прикладів
+        self.steps = 0
+        self.n_samples = 0
+
+    # Функція для перетворення міток на номери класів моделі
+    def class_indices(self, labels):
+        classes = self.mlr.mlr.classes_
+        lookup = {label: index for index, label in enumerate(classes.tolist())}
+        try:
+            return np.array([lookup[label] for label in np.asarray(labels).tolist()], dtype=np.int64)
+        except KeyError as error:
+            raise ValueError(f"Unknown label {error.args[0]!r}, expected one of {classes.tolist()}")
+
+    # Функція для оновлення моделі на нових векторизованих прикладах (простір ознак не змінюється)
+    def partial_fit(self, X, labels):
+        classifier = self.mlr.mlr
+        # Градієнт softmax відповідає лише мультиноміальній моделі
+        if not is_multinomial(classifier):
+            raise ValueError("Online updates require a multinomial (softmax) LogisticRegression")
+
+        y = self.class_indices(labels)
+        coef = classifier.coef_
+        intercept = classifier.intercept_
+
+        for _ in range(self.epochs):
+            order = self.rng.permutation(X.shape[0])
+            for start in range(0, len(order), self.batch_size):
+                rows = order[start:start + self.batch_size]
+                X_batch = X[rows]
+
+                # Ймовірності класів (softmax зі зсувом на максимум)
+                scores = np.asarray(X_batch @ coef.T) + intercept
+                scores -= scores.max(axis=1, keepdims=True)
+                probabilities = np.exp(scores)
+                probabilities /= probabilities.sum(axis=1, keepdims=True)
+
+                # Градієнт крос-ентропії: (P - Y) для кожного прикладу
+                probabilities[np.arange(len(rows)), y[rows]] -= 1
+                probabilities /= len(rows)
+
+                # Крок SGD з L2 регуляризацією, оновлення на місці
+                coef *= 1 - self.learning_rate * self.alpha
+                coef -= self.learning_rate * np.asarray(X_batch.T @ probabilities).T
+                intercept -= self.learning_rate * probabilities.sum(axis=0)
+                self.steps += 1
+
+        self.n_samples += X.shape[0]
+
+        # Повторне присвоєння скидає рушій NumPy, а збережені передбачення стають недійсними
+        self.mlr.mlr = classifier
+        self.mlr.prediction_cache.invalidate()
+        return self
+
+    # Функція для оновлення моделі на нових сирих текстах (очищення та виявлення заперечень як під час передбачення)
+    def partial_fit_texts(self, texts, labels):
+        return self.partial_fit(self.mlr.vectorizer.vectorize_texts(texts), labels)
+
+class CheckpointStore:
+    def __init__(self, path=CHECKPOINT_DIR):
+        self.path = path
+        self.manifest_path = os.path.join(path, 'manifest.json')
+
+    # Функція для читання списку версій
+    def versions(self):
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path, 'r', encoding='utf-8') as file:
+            return json.load(file)['versions']
+
+    # Функція для збереження нової версії моделі (векторизатор не змінюється і не зберігається,
+    # тому metadata містить відбитки файлів, з якими сумісна версія)
+    def save(self, classifier, metadata=None):
+        os.makedirs(self.path, exist_ok=True)
+        versions = self.versions()
+        version = versions[-1]['version'] + 1 if versions else 1
+        file_name = f"mlr_v{version:04d}.pkl"
+        joblib.dump(classifier, os.path.join(self.path, file_name))
+
+        # Маніфест записується після файлу моделі та замінюється атомарно
+        versions.append({'version': version,
+                         'file': file_name,
+                         'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                         **(metadata or {})})
+        temporary_path = self.manifest_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump({'versions': versions}, file, indent=4)
+        os.replace(temporary_path, self.manifest_path)
+        return version
+
+    # Функція для завантаження версії моделі (за замовчуванням - останньої)
+    def load(self, version=None):
+        versions = self.versions()
+        if not versions:
+            raise FileNotFoundError(f"No checkpoints in {self.path}")
+        entry = versions[-1] if version is None else next((entry for entry in versions if entry['version'] == version), None)
+        if entry is None:
+            raise FileNotFoundError(f"Checkpoint version {version} not found in {self.path}")
+        return joblib.load(os.path.join(self.path, entry['file']))
+
+# Функція для отримання відбитків робочих файлів векторизатора та моделі, від яких продовжується навчання
+def model_fingerprints(mlr):
+    return {'vectorizer_fingerprint': files_fingerprint([mlr.vectorizer.vectorizer_path()]),
+            'base_model_fingerprint': files_fingerprint([mlr.model_path()])}
+
+# Функція для оцінки якості моделі на тестових даних
+def evaluate(classifier, X, labels):
+    from sklearn.metrics import accuracy_score, f1_score
+
+    predictions = classifier.predict(X)
+    return {'accuracy': float(accuracy_score(labels, predictions)),
+            'macro_f1': float(f1_score(labels, predictions, average='macro'))}
+
+# Функція для читання нових розмічених текстів
+def read_labeled(file_path, text_column, label_column):
+    import pandas as pd
+
+    dataset = pd.read_csv(file_path, delimiter='\t', encoding='utf-8').dropna(subset=[text_column, label_column])
+    return dataset[text_column].tolist(), dataset[label_column].to_numpy()
+
+# Функція для інкрементального оновлення поточної моделі новими даними
+def update(args):
+    from log_model import MultinomialLR
+
+    mlr = MultinomialLR(cache_size=0, hashing=args.hashing)
+    store = CheckpointStore(args.checkpoint_dir)
+    fingerprints = model_fingerprints(mlr)
+
+    # Продовження з останньої контрольної точки лише якщо вона створена для тих самих робочих файлів
+    # векторизатора та моделі (після перенавчання, зменшення словника або --train-best вона застаріла)
+    versions = store.versions()
+    if versions and all(versions[-1].get(name) == value for name, value in fingerprints.items()):
+        mlr.mlr = store.load()
+    elif versions:
+        print(f"Checkpoint version {versions[-1]['version']} was made for a different vectorizer or working model, "
+              f"starting from {mlr.model_path()}")
+
+    texts, labels = read_labeled(args.data, args.text_column, args.label_column)
+    trainer = OnlineTrainer(mlr, args.learning_rate, args.alpha, args.batch_size, args.epochs)
+    start = time.perf_counter()
+    trainer.partial_fit_texts(texts, labels)
+    elapsed = time.perf_counter() - start
+
+    # Заміна робочої моделі: сервіси з reload_if_changed підхоплять її без перезапуску.
+    # Після заміни робочий файл і є новою контрольною точкою, тому в ній зберігається його відбиток
+    if args.promote:
+        mlr.save_model()
+        fingerprints = model_fingerprints(mlr)
+
+    version = store.save(mlr.mlr, {'data': args.data, 'n_samples': len(texts), 'seconds': elapsed, **fingerprints})
+    print(f"Updated on {len(texts)} texts in {elapsed:.2f} s, checkpoint version {version} saved to {args.checkpoint_dir}")
+    if args.promote:
+        print(f"Checkpoint promoted to {mlr.model_path()}")
+
+# Функція для порівняння щоденних інкрементальних оновлень з повним перенавчанням
+def compare(args):
+    import scipy.sparse as sp
+    from sklearn.model_selection import train_test_split
+    from log_model import MultinomialLR
+    from text_vectorizing import TextVectorizer
+
+    texts, labels = read_labeled(args.data, 'neg_cleaned_text', 'label')
+    texts_train, texts_test, y_train, y_test = train_test_split(texts, labels, stratify=labels,
+                                                                test_size=0.2, random_state=42)
+
+    # Початкова модель навчається на частині даних, решта надходить пакетами ("дні")
+    n_base = int(len(texts_train) * args.base_fraction)
+    increments = np.array_split(np.arange(n_base, len(texts_train)), args.increments)
+
+    # Простір ознак онлайн-моделі фіксується під час початкового навчання
+    textVectorizer = TextVectorizer(load=False, hashing=args.hashing)
+    textVectorizer.set_vectorizer()
+    X_base = textVectorizer.vectorizer.fit_transform(texts_train[:n_base])
+    X_test = textVectorizer.vectorizer.transform(texts_test)
+
+    mlr = MultinomialLR(cache_size=0, hashing=args.hashing)
+    mlr.vectorizer = textVectorizer
+    mlr.mlr = MultinomialLR.build_classifier().fit(X_base, y_train[:n_base])
+    trainer = OnlineTrainer(mlr, args.learning_rate, args.alpha, args.batch_size, args.epochs)
+
+    print(f"{'samples':>8}{'online acc':>12}{'online F1':>11}{'online s':>10}{'full acc':>10}{'full F1':>9}{'full s':>9}")
+    seen = n_base
+    for rows in increments:
+        # Інкрементальне оновлення на новому пакеті
+        start = time.perf_counter()
+        trainer.partial_fit(textVectorizer.vectorizer.transform([texts_train[i] for i in rows]), y_train[rows])
+        online_time = time.perf_counter() - start
+        online = evaluate(mlr.mlr, X_test, y_test)
+        seen += len(rows)
+
+        # Повне перенавчання векторизатора та моделі на всіх отриманих даних
+        start = time.perf_counter()
+        full_vectorizer = TextVectorizer(load=False, hashing=args.hashing)
+        full_vectorizer.set_vectorizer()
+        X_full = full_vectorizer.vectorizer.fit_transform(texts_train[:seen])
+        full_classifier = MultinomialLR.build_classifier().fit(X_full, y_train[:seen])
+        full_time = time.perf_counter() - start
+        full = evaluate(full_classifier, full_vectorizer.vectorizer.transform(texts_test), y_test)
+
+        print(f"{seen:>8}{online['accuracy']:>12.4f}{online['macro_f1']:>11.4f}{online_time:>10.2f}"
+              f"{full['accuracy']:>10.4f}{full['macro_f1']:>9.4f}{full_time:>9.2f}")
+
+    # Онлайн-модель не бачить слів, яких не було в початковому словнику
+    if not args.hashing:
+        unseen = sp.csr_matrix(X_test).getnnz(axis=1) == 0
+        print(f"Test texts without known features for the online model: {int(unseen.sum())} of {len(texts_test)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incremental (online) updates of the multinomial LR model")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    # Спільні параметри SGD
+    def add_sgd_arguments(subparser):
+        subparser.add_argument('--learning-rate', type=float, default=0.5)
+        subparser.add_argument('--alpha', type=float, default=1e-4, help="L2 regularization strength")
+        subparser.add_argument('--batch-size', type=int, default=256)
+        subparser.add_argument('--epochs', type=int, default=1)
+        subparser.add_argument('--hashing', action='store_true', help="use the hashing vectorizer model")
+
+    update_parser = subparsers.add_parser('update', help="update the model with newly labeled texts and save a checkpoint")
+    update_parser.add_argument('--data', required=True, help="tab-separated .csv with raw texts and labels")
+    update_parser.add_argument('--text-column', default='text')
+    update_parser.add_argument('--label-column', default='label')
+    update_parser.add_argument('--checkpoint-dir', default=CHECKPOINT_DIR)
+    update_parser.add_argument('--promote', action='store_true', help="also overwrite the working model file")
+    add_sgd_arguments(update_parser)
+
+    compare_parser = subparsers.add_parser('compare', help="online updates vs full retrain on daily increments")
+    compare_parser.add_argument('--data', default="dataset/pre_semeval_dataset.csv")
+    compare_parser.add_argument('--base-fraction', type=float, default=0.5)
+    compare_parser.add_argument('--increments', type=int, default=5)
+    add_sgd_arguments(compare_parser)
+
+    args = parser.parse_args()
+    if args.command == 'update':
+        update(args)
+    else:
+        compare(args)
@@ -0,0 +1,83 @@
+import os
+from multiprocessing import Pool
+
+# Імпорт класу TextPreprocessor з файлу text_preprocessing.py
+from text_preprocessing import TextPreprocessor
+
+# Екземпляр TextPreprocessor, що створюється один раз у кожному робочому процесі
+_text_preprocessor = None
+
+# Функція для створення TextPreprocessor з попередньо завантаженим WordNet
+def _create_preprocessor(preprocessor_kwargs):
+    textPreprocessor = TextPreprocessor(**preprocessor_kwargs)
+
+    # Примусове завантаження WordNet, щоб не робити цього під час обробки першої частини
+    from nltk.corpus import wordnet
+    wordnet.ensure_loaded()
+    return textPreprocessor
+
+# Функція ініціалізації робочого процесу
+def _init_worker(preprocessor_kwargs):
+    global _text_preprocessor
+    _text_preprocessor = _create_preprocessor(preprocessor_kwargs)
+
+# Функція для обробки однієї частини значень у робочому процесі
+def _process_chunk(task):
+    method_name, values, kwargs = task
+    method = getattr(_text_preprocessor, method_name)
+    return [method(value, **kwargs) for value in values]
+
+class ParallelPreprocessor:
+    def __init__(self, n_workers=None, chunk_size=500, **preprocessor_kwargs):
+        # Кількість робочих процесів (за замовчуванням - кількість ядер)
+        self.n_workers = n_workers or os.cpu_count() or 1
+        # Кількість рядків в одній частині, що передається процесу
+        self.chunk_size = chunk_size
+        # Параметри для створення TextPreprocessor у кожному процесі
+        self.preprocessor_kwargs = preprocessor_kwargs
+        self.pool = None
+        # TextPreprocessor для обробки в поточному процесі (один процес)
+        self.text_preprocessor = None
+
+    # Функція для запуску пулу процесів (або локального обробника для одного процесу)
+    def start(self):
+        if self.n_workers == 1:
+            # Створюється один раз, тому кеші зберігаються між викликами map()
+            if self.text_preprocessor is None:
+                self.text_preprocessor = _create_preprocessor(self.preprocessor_kwargs)
+        elif self.pool is None:
+            self.pool = Pool(self.n_workers,
+                             initializer=_init_worker,
+                             initargs=(self.preprocessor_kwargs,))
+
+    # Функція для зупинки пулу процесів
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # Функція для застосування методу TextPreprocessor до кожного значення зі збереженням порядку
+    def map(self, method_name, values, **kwargs):
+        values = list(values)
+        self.start()
+        if self.pool is None:
+            # Послідовна обробка в поточному процесі
+            method = getattr(self.text_preprocessor, method_name)
+            return [method(value, **kwargs) for value in values]
+
+        # Розбиття значень на частини
+        tasks = [(method_name, values[start:start + self.chunk_size], kwargs)
+                 for start in range(0, len(values), self.chunk_size)]
+        # Pool.map повертає результати в порядку вхідних частин
+        results = self.pool.map(_process_chunk, tasks)
+
+        # Об'єднання результатів усіх частин в один список
+        return [value for chunk in results for value in chunk]
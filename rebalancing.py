@@ -0,0 +1,94 @@
+import numpy as np
+
+# Доступні стратегії балансування класів
+STRATEGIES = ('smote', 'class_weight', 'random_oversample', 'sparse_smote', 'none')
+
+# Функція для отримання кількості прикладів, яких бракує кожному класу до найбільшого
+def missing_counts(y):
+    classes, counts = np.unique(y, return_counts=True)
+    return {label: int(counts.max() - count) for label, count in zip(classes, counts)}
+
+# Функція для оверсемплінгу повторенням випадкових рядків (лише вибір рядків CSR за індексами)
+def random_oversample(X, y, random_state=42):
+    import scipy.sparse as sp
+
+    rng = np.random.default_rng(random_state)
+    y = np.asarray(y)
+    indices = [np.arange(X.shape[0])]
+    for label, missing in missing_counts(y).items():
+        if missing:
+            indices.append(rng.choice(np.flatnonzero(y == label), missing))
+    indices = np.concatenate(indices)
+    return sp.csr_matrix(X)[indices], y[indices]
+
+# Функція для пошуку наближених найближчих сусідів усередині класу через випадкову проєкцію
+def approximate_neighbors(X, k_neighbors=1, n_components=64, chunk_size=2048, rng=None):
+    rng = rng if rng is not None else np.random.default_rng(42)
+
+    # Випадкова проєкція зберігає скалярні добутки (лема Джонсона-Лінденштрауса),
+    # тому сусіди шукаються в просторі з n_components вимірів замість десятків тисяч
+    projection = rng.standard_normal((X.shape[1], n_components)).astype(np.float32) / np.sqrt(n_components)
+    Z = np.asarray(X @ projection, dtype=np.float32)
+    squared_norms = (Z * Z).sum(axis=1)
+
+    k = min(k_neighbors, X.shape[0] - 1)
+    neighbors = np.empty((X.shape[0], k), dtype=np.int64)
+    for start in range(0, X.shape[0], chunk_size):
+        # Квадрати відстаней частини рядків до всіх рядків класу
+        distances = squared_norms[start:start + chunk_size, None] - 2 * Z[start:start + chunk_size] @ Z.T + squared_norms[None, :]
+        rows = np.arange(distances.shape[0])
+        distances[rows, start + rows] = np.inf  # Рядок не є власним сусідом
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        neighbors[start:start + chunk_size] = nearest
+    return neighbors
+
+# Функція для SMOTE безпосередньо на CSR матриці з наближеними сусідами
+def sparse_smote(X, y, k_neighbors=1, n_components=64, random_state=42):
+    import scipy.sparse as sp
+
+    rng = np.random.default_rng(random_state)
+    X = sp.csr_matrix(X)
+    y = np.asarray(y)
+    parts, labels = [X], [y]
+
+    for label, missing in missing_counts(y).items():
+        class_rows = np.flatnonzero(y == label)
+        if not missing:
+            continue
+        # Для класу з одним прикладом можливе лише повторення
+        if len(class_rows) < 2:
+            parts.append(X[np.repeat(class_rows, missing)])
+            labels.append(np.full(missing, label, dtype=y.dtype))
+            continue
+
+        X_class = X[class_rows]
+        neighbors = approximate_neighbors(X_class, k_neighbors, n_components, rng=rng)
+
+        # Синтетичний приклад: x + g * (сусід - x) = (1 - g) * x + g * сусід, g ~ U(0, 1)
+        base = rng.integers(0, len(class_rows), missing)
+        neighbor = neighbors[base, rng.integers(0, neighbors.shape[1], missing)]
+        gap = rng.random(missing)
+        synthetic = sp.diags(1 - gap) @ X_class[base] + sp.diags(gap) @ X_class[neighbor]
+
+        parts.append(synthetic.tocsr())
+        labels.append(np.full(missing, label, dtype=y.dtype))
+
+    return sp.vstack(parts, format='csr'), np.concatenate(labels)
+
+# Функція для балансування класів обраною стратегією
+def rebalance(X, y, strategy='smote', random_state=42, k_neighbors=1):
+    if strategy == 'smote':
+        from imblearn.over_sampling import SMOTE
+        return SMOTE(random_state=random_state, k_neighbors=k_neighbors).fit_resample(X, y)
+    if strategy in ('class_weight', 'none'):
+        # Дані не змінюються: баланс забезпечують ваги класів у функції втрат (або не забезпечується)
+        return X, y
+    if strategy == 'random_oversample':
+        return random_oversample(X, y, random_state)
+    if strategy == 'sparse_smote':
+        return sparse_smote(X, y, k_neighbors, random_state=random_state)
+    raise ValueError(f"Unknown rebalancing strategy: {strategy}")
+
+# Функція для отримання параметрів LogisticRegression для стратегії балансування
+def class_weight_params(strategy):
+    return {'class_weight': 'balanced'} if strategy == 'class_weight' else {}
@@ -0,0 +1,177 @@
+import csv
+import json
+import tkinter as tk
+from array import array
+
+# Мітки класів тональності та їхні коди в індексі
+TONALITY = ['negative', 'neutral', 'positive']
+TONALITY_CODES = {name.encode('ascii'): code for code, name in enumerate(TONALITY)}
+# Код для невідомої мітки
+UNKNOWN_CODE = 255
+
+class ResultsStore:
+    def __init__(self, file_path='text_tonality.jsonl', output_format='jsonl'):
+        # Файл результатів, записаний ResultSink
+        self.file_path = file_path
+        self.output_format = output_format
+        self.file = None
+        self.reload()
+
+    # Функція для побудови індексу: зміщення кожного запису у файлі та код його тональності.
+    # Індекс займає 9 байт на запис, самі записи читаються з диска лише під час показу
+    def reload(self):
+        self.close()
+        self.offsets = array('q')
+        self.codes = bytearray()
+
+        with open(self.file_path, 'rb') as file:
+            position = 0
+            for line in file:
+                # Пропуск заголовка CSV
+                if self.output_format == 'csv' and position == 0:
+                    position += len(line)
+                    continue
+                self.offsets.append(position)
+                self.codes.append(self.tonality_code(line))
+                position += len(line)
+
+        self.file = open(self.file_path, 'rb')
+
+    # Функція для швидкого визначення коду тональності без повного розбору запису
+    def tonality_code(self, line):
+        line = line.rstrip(b'\r\n')
+        if self.output_format == 'csv':
+            label = line[line.rfind(b',') + 1:]
+        else:
+            # ResultSink записує тональність останнім полем: ..., "tonality": "positive"}
+            start = line.rfind(b'"tonality": "')
+            label = line[start + 13:-2] if start >= 0 else json.loads(line)['tonality'].encode('utf-8')
+        return TONALITY_CODES.get(label, UNKNOWN_CODE)
+
+    # Функція для розбору одного рядка файлу у пару (текст, тональність)
+    def parse(self, line):
+        line = line.decode('utf-8').rstrip('\r\n')
+        if self.output_format == 'csv':
+            text, tonality = next(csv.reader([line]))
+            return text, tonality
+        record = json.loads(line)
+        return record['text'], record['tonality']
+
+    # Функція для читання запису за його номером
+    def record(self, index):
+        self.file.seek(self.offsets[index])
+        return self.parse(self.file.readline())
+
+    def __len__(self):
+        return len(self.offsets)
+
+    # Функція для отримання номерів записів, що відповідають фільтру тональності та пошуку тексту
+    def filter(self, tonality=None, search=''):
+        code = TONALITY.index(tonality) if tonality in TONALITY else None
+        if code is None and not search:
+            return range(len(self.offsets))
+
+        if not search:
+            return array('q', (index for index, value in enumerate(self.codes) if value == code))
+
+        # Пошук без урахування регістру з потоковим читанням файлу
+        search = search.lower()
+        # Для ASCII запиту без спецсимволів рядок файлу перевіряється до розбору JSON
+        raw_search = search.encode('ascii') if search.isascii() and '"' not in search and '\\' not in search else None
+
+        indices = array('q')
+        self.file.seek(self.offsets[0] if self.offsets else 0)
+        for index, value in enumerate(self.codes):
+            line = self.file.readline()
+            if code is not None and value != code:
+                continue
+            if raw_search is not None and raw_search not in line.lower():
+                continue
+            if search in self.parse(line)[0].lower():
+                indices.append(index)
+        return indices
+
+    # Функція для читання однієї сторінки записів з відфільтрованих номерів
+    def page(self, indices, page_number, page_size=100):
+        return [(index, *self.record(index)) for index in indices[page_number * page_size:(page_number + 1) * page_size]]
+
+    # Функція для закриття файлу результатів
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+class ResultsViewer(tk.Toplevel):
+    def __init__(self, master, file_path='text_tonality.jsonl', output_format='jsonl', page_size=100):
+        super().__init__(master)
+        self.title("Text Tonality")
+
+        # Сховище результатів та поточний стан перегляду
+        self.store = ResultsStore(file_path, output_format)
+        self.page_size = page_size
+        self.page_number = 0
+        self.indices = self.store.filter()
+
+        self.create_widgets()
+        self.show_page()
+
+    # Функція для створення віджетів переглядача
+    def create_widgets(self):
+        # Панель фільтрів: тональність та пошук тексту
+        filter_frame = tk.Frame(self)
+        filter_frame.pack(fill='x', padx=5, pady=5)
+
+        self.tonality_var = tk.StringVar(value='all')
+        tk.OptionMenu(filter_frame, self.tonality_var, 'all', *TONALITY, command=lambda _: self.apply_filter()).pack(side='left')
+
+        self.search_var = tk.StringVar()
+        search_entry = tk.Entry(filter_frame, textvariable=self.search_var, width=40)
+        search_entry.pack(side='left', padx=5)
+        search_entry.bind('<Return>', lambda _: self.apply_filter())
+        tk.Button(filter_frame, text="Search", command=self.apply_filter).pack(side='left')
+
+        # Область з записами лише поточної сторінки
+        self.text_area = tk.Text(self, wrap='word', font=("Courier New", 14))
+        self.text_area.pack(expand=True, fill='both')
+
+        # Панель навігації сторінками
+        navigation_frame = tk.Frame(self)
+        navigation_frame.pack(fill='x', padx=5, pady=5)
+        tk.Button(navigation_frame, text="<", command=lambda: self.go_to_page(self.page_number - 1)).pack(side='left')
+        self.page_label = tk.Label(navigation_frame)
+        self.page_label.pack(side='left', padx=10)
+        tk.Button(navigation_frame, text=">", command=lambda: self.go_to_page(self.page_number + 1)).pack(side='left')
+
+    # Функція для отримання кількості сторінок для поточного фільтру
+    def page_count(self):
+        return max(1, (len(self.indices) + self.page_size - 1) // self.page_size)
+
+    # Функція для застосування фільтру тональності та пошуку
+    def apply_filter(self):
+        self.indices = self.store.filter(self.tonality_var.get(), self.search_var.get().strip())
+        self.go_to_page(0)
+
+    # Функція для переходу на сторінку з заданим номером
+    def go_to_page(self, page_number):
+        self.page_number = min(max(page_number, 0), self.page_count() - 1)
+        self.show_page()
+
+    # Функція для відображення записів поточної сторінки
+    def show_page(self):
+        lines = [f"{index + 1}. [{tonality}] {text}" for index, text, tonality in
+                 self.store.page(self.indices, self.page_number, self.page_size)]
+
+        self.text_area.config(state='normal')
+        self.text_area.delete('1.0', tk.END)
+        self.text_area.insert('1.0', '\n'.join(lines))
+        self.text_area.config(state='disabled')
+        self.page_label.config(text=f"Page {self.page_number + 1} / {self.page_count()}   ({len(self.indices)} of {len(self.store)} records)")
+
+    # Функція для перечитування файлу результатів після нового аналізу
+    def reload(self):
+        self.store.reload()
+        self.apply_filter()
+
+    def destroy(self):
+        self.store.close()
+        super().destroy()
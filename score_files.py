@@ -0,0 +1,171 @@
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+
+# Імпорт функцій потокового аналізу з файлу text_scoring.py
+from text_scoring import ResultSink, iter_chunks
+
+# Модель, що завантажується один раз у кожному робочому процесі (або успадковується після fork)
+_mlr = None
+
+# Функція ініціалізації робочого процесу
+def _init_worker(model_kwargs):
+    global _mlr
+    if _mlr is None:
+        from log_model import MultinomialLR
+
+        _mlr = MultinomialLR(**model_kwargs)
+        # Примусове завантаження моделі та ресурсів NLTK до обробки першої частини
+        _mlr.predict_batch(["warm up"])
+
+# Функція для передбачення тональності однієї частини рядків у робочому процесі
+def _score_chunk(task):
+    lines, batch_size = task
+    return _mlr.predict_batch(lines, batch_size=batch_size).tolist()
+
+# Функція для пошуку .txt файлів серед заданих файлів та каталогів
+def collect_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in sorted(names) if name.endswith('.txt'))
+        else:
+            files.append(path)
+    return sorted(set(os.path.abspath(file) for file in files))
+
+# Функція для отримання шляху до файлу результатів зі збереженням структури каталогів
+def output_path(file_path, root, output_dir, output_format):
+    name = os.path.splitext(os.path.relpath(file_path, root))[0]
+    path = os.path.join(output_dir, f"{name}.{output_format}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+class BatchScorer:
+    def __init__(self, n_workers=None, chunk_size=2000, batch_size=1000, output_format='jsonl', **model_kwargs):
+        # Кількість робочих процесів (за замовчуванням - кількість ядер)
+        self.n_workers = n_workers or os.cpu_count() or 1
+        # Кількість рядків в одній частині, що передається процесу
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        # Формат файлів результатів: 'jsonl' або 'csv'
+        self.output_format = output_format
+        # Параметри для створення MultinomialLR у кожному процесі
+        self.model_kwargs = model_kwargs
+        self.pool = None
+
+    # Функція для запуску пулу процесів (або локальної моделі для одного процесу)
+    def start(self):
+        if self.n_workers == 1 or multiprocessing.get_start_method() == 'fork':
+            # Модель завантажується в батьківському процесі; після fork процеси
+            # спільно використовують її сторінки пам'яті (copy-on-write)
+            _init_worker(self.model_kwargs)
+            # Об'єкти моделі не відстежуються збирачем сміття, щоб він не копіював їхні сторінки
+            gc.freeze()
+        if self.n_workers > 1 and self.pool is None:
+            self.pool = multiprocessing.Pool(self.n_workers,
+                                             initializer=_init_worker,
+                                             initargs=(self.model_kwargs,))
+
+    # Функція для зупинки пулу процесів
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # Функція для обробки частин рядків з обмеженою кількістю частин у роботі одночасно
+    def iter_scored(self, chunks):
+        if self.pool is None:
+            for lines in chunks:
+                yield lines, _score_chunk((lines, self.batch_size))
+            return
+
+        # Не більше двох частин на процес очікують обробки, тому пам'ять не залежить від розміру файлу
+        pending = deque()
+        for lines in chunks:
+            pending.append((lines, self.pool.apply_async(_score_chunk, ((lines, self.batch_size),))))
+            if len(pending) >= 2 * self.n_workers:
+                lines, result = pending.popleft()
+                yield lines, result.get()
+        while pending:
+            lines, result = pending.popleft()
+            yield lines, result.get()
+
+    # Функція для аналізу файлів із записом результатів кожного файлу окремо
+    def score_files(self, files, output_dir):
+        self.start()
+        root = os.path.commonpath([os.path.dirname(file) for file in files])
+        summary = {'files': {}, 'total': {'lines': 0, 'tonality': {'negative': 0, 'neutral': 0, 'positive': 0}}}
+
+        # Файли, що відрізняються лише розширенням (a.txt та a.log), мали б спільний файл результатів
+        result_paths = {}
+        for file_path in files:
+            result_path = output_path(file_path, root, output_dir, self.output_format)
+            if result_path in result_paths:
+                raise ValueError(f"{result_paths[result_path]} and {file_path} would both be saved to {result_path}")
+            result_paths[result_path] = file_path
+
+        for result_path, file_path in result_paths.items():
+            tonality = {'negative': 0, 'neutral': 0, 'positive': 0}
+            n_lines = 0
+
+            with ResultSink(result_path, self.output_format) as sink:
+                for lines, predictions in self.iter_scored(iter_chunks(file_path, self.chunk_size)):
+                    sink.write(lines, predictions)
+                    n_lines += len(lines)
+                    for prediction in predictions:
+                        tonality[prediction] += 1
+
+            # Оновлення підсумкових лічильників
+            summary['files'][file_path] = {'output': result_path, 'lines': n_lines, 'tonality': tonality}
+            summary['total']['lines'] += n_lines
+            for name, count in tonality.items():
+                summary['total']['tonality'][name] += count
+
+        return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score .txt files or directories of .txt files on all CPU cores")
+    parser.add_argument('paths', nargs='+', help=".txt files or directories (searched recursively)")
+    parser.add_argument('--output-dir', default='results')
+    parser.add_argument('--format', default='jsonl', choices=['jsonl', 'csv'])
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes (default: number of CPU cores)")
+    parser.add_argument('--chunk-size', type=int, default=2000, help="number of lines sent to a worker at once")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--artifact', default=None, help="load the model from a model artifact directory")
+    parser.add_argument('--backend', default='sklearn', choices=['sklearn', 'numpy'])
+    args = parser.parse_args()
+
+    files = collect_files(args.paths)
+    if not files:
+        print("No .txt files found.")
+    else:
+        start = time.perf_counter()
+        with BatchScorer(args.workers, args.chunk_size, args.batch_size, args.format,
+                         artifact_path=args.artifact, backend=args.backend) as scorer:
+            summary = scorer.score_files(files, args.output_dir)
+        elapsed = time.perf_counter() - start
+
+        # Збереження підсумкових лічильників тональності
+        summary['seconds'] = elapsed
+        summary['lines_per_second'] = summary['total']['lines'] / elapsed
+        os.makedirs(args.output_dir, exist_ok=True)
+        with open(os.path.join(args.output_dir, 'summary.json'), 'w', encoding='utf-8') as file:
+            json.dump(summary, file, indent=4)
+
+        print(f"Scored {summary['total']['lines']} lines in {len(files)} file(s) with {scorer.n_workers} worker(s)")
+        print(f"{elapsed:.2f} s, {summary['lines_per_second']:.1f} lines/s")
+        print(f"Tonality: {summary['total']['tonality']}")
+        print(f"Results and summary.json saved to {args.output_dir}")
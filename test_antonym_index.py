@@ -0,0 +1,63 @@
+import pickle
+import pytest
+
+from antonym_index import AntonymIndex, write_antonym_index
+from text_preprocessing import TextPreprocessor
+
+# Записи з антонімами, негативними формами, словом без змін та словами не з ASCII
+ENTRIES = {'good': 'bad', 'happy': 'unhappy', 'table': 'table', 'café': 'noncafé', 'über': 'unter', 'a': 'an'}
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = str(tmp_path / 'antonyms.idx')
+    write_antonym_index(ENTRIES, path, {'n_prefixes': ['un', 'non']})
+    return path
+
+# Перевірка, що кожне записане слово знаходиться бінарним пошуком з тим самим значенням
+def test_round_trip(index_path):
+    index = AntonymIndex(index_path)
+    try:
+        assert len(index) == len(ENTRIES)
+        assert index.metadata == {'n_prefixes': ['un', 'non']}
+        for word, value in ENTRIES.items():
+            assert index.lookup(word) == value
+    finally:
+        index.close()
+
+# Перевірка, що слів, яких немає в індексі, не знайдено (запит до WordNet виконується окремо)
+def test_missing_words(index_path):
+    index = AntonymIndex(index_path)
+    try:
+        for word in ('', 'aa', 'bad', 'zzz', 'goo', 'goods', 'caf'):
+            assert index.lookup(word) is None
+    finally:
+        index.close()
+
+# Перевірка, що після серіалізації (передача у процеси) індекс відкривається заново з того самого файлу
+def test_pickle(index_path):
+    index = pickle.loads(pickle.dumps(AntonymIndex(index_path)))
+    try:
+        assert index.lookup('good') == 'bad'
+    finally:
+        index.close()
+
+# Перевірка, що файл іншого формату не читається як індекс
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.idx'
+    path.write_bytes(b'not an antonym index')
+    with pytest.raises(ValueError):
+        AntonymIndex(str(path))
+
+# Перевірка, що TextPreprocessor використовує індекс лише з тими самими префіксами
+def test_preprocessor_checks_prefixes(tmp_path):
+    n_prefixes = TextPreprocessor(antonym_index_path=None).n_prefixes
+    matching = str(tmp_path / 'matching.idx')
+    other = str(tmp_path / 'other.idx')
+    write_antonym_index(ENTRIES, matching, {'n_prefixes': n_prefixes})
+    write_antonym_index(ENTRIES, other, {'n_prefixes': ['un']})
+
+    textPreprocessor = TextPreprocessor(antonym_index_path=matching)
+    assert textPreprocessor.antonym_index is not None
+    assert textPreprocessor.get_antonym('good') == 'bad'
+    textPreprocessor.antonym_index.close()
+    assert TextPreprocessor(antonym_index_path=other).antonym_index is None
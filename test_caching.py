@@ -0,0 +1,95 @@
+import pytest
+
+from caching import LRUCache, PredictionCache, files_fingerprint
+
+# Перевірка витіснення найдавніше використаного запису
+def test_lru_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'a' стає нещодавно використаним
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+# Перевірка статистики влучань та промахів
+def test_lru_stats():
+    cache = LRUCache(maxsize=10)
+    cache.put('a', 1)
+    cache.get('a')
+    cache.get('b')
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size'], stats['hit_rate']) == (1, 1, 1, 0.5)
+
+# Перевірка, що кеш розміру 0 нічого не зберігає
+def test_lru_disabled():
+    cache = LRUCache(maxsize=0)
+    cache.put('a', 1)
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+# Перевірка очищення кешу разом зі статистикою
+def test_lru_clear():
+    cache = LRUCache(maxsize=10)
+    cache.put('a', 1)
+    cache.get('a')
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()['hits'] == 0
+
+# Перевірка, що записані ймовірності повертаються, а ключ None (порожній текст) ігнорується
+def test_prediction_cache_memory():
+    cache = PredictionCache(maxsize=10)
+    key = PredictionCache.key('good movie')
+    cache.put_many({key: [0.1, 0.2, 0.7]})
+    assert cache.get_many([key, key, None, PredictionCache.key('bad movie')]) == {key: (0.1, 0.2, 0.7)}
+
+# Перевірка, що сховище на диску зберігається між запусками для того самого відбитка моделі
+def test_prediction_cache_store(tmp_path):
+    path = str(tmp_path / 'predictions.sqlite')
+    key = PredictionCache.key('good movie')
+    cache = PredictionCache(maxsize=10, path=path, fingerprint='model-1')
+    cache.put_many({key: [0.1, 0.2, 0.7]})
+    cache.close()
+
+    cache = PredictionCache(maxsize=10, path=path, fingerprint='model-1')
+    assert cache.get_many([key]) == {key: (0.1, 0.2, 0.7)}
+    assert cache.stats()['store_hits'] == 1
+    cache.close()
+
+    # Передбачення іншої моделі (або інших налаштувань попередньої обробки) недійсні
+    cache = PredictionCache(maxsize=10, path=path, fingerprint='model-2')
+    assert cache.get_many([key]) == {}
+    cache.close()
+
+# Перевірка, що зміна відбитка очищає кеш у пам'яті та на диску, а той самий відбиток - ні
+def test_prediction_cache_set_fingerprint(tmp_path):
+    key = PredictionCache.key('good movie')
+    cache = PredictionCache(maxsize=10, path=str(tmp_path / 'predictions.sqlite'), fingerprint='model-1')
+    cache.put_many({key: [0.1, 0.2, 0.7]})
+    cache.set_fingerprint('model-1')
+    assert key in cache.get_many([key])
+    cache.set_fingerprint('model-2')
+    assert cache.get_many([key]) == {}
+    assert cache.stats()['store_size'] == 0
+    cache.close()
+
+# Перевірка, що відбиток залежить від вмісту файлів, а не лише від шляхів
+def test_files_fingerprint(tmp_path):
+    path = tmp_path / 'model.pkl'
+    path.write_bytes(b'first')
+    first = files_fingerprint([str(path)])
+    assert files_fingerprint([str(path)]) == first
+    path.write_bytes(b'second')
+    assert files_fingerprint([str(path)]) != first
+    assert files_fingerprint([str(tmp_path / 'missing.pkl')]) != first
+
+# Перевірка, що без сховища на диску модель не хешується під час створення MultinomialLR
+def test_memory_cache_skips_fingerprint():
+    pytest.importorskip('numpy')
+    pytest.importorskip('joblib')
+    from log_model import MultinomialLR
+
+    assert MultinomialLR(cache_size=100).model_fingerprint is None
@@ -0,0 +1,87 @@
+import pytest
+
+from incremental_preprocessing import PreprocessingStore, preprocess_incremental
+
+DATASET = [(1, "Good movie"), (0, "The movie"), (-1, "Bad movie"), (1, "Good movie"), (0, "A plot"),
+           (-1, "Awful plot"), (1, "Great fun"), (2, "Unknown label"), (0, "Fine acting")]
+
+class FakeEngine:
+    # Рушій з тим самим інтерфейсом, що й ParallelPreprocessor: обробка лише підраховується
+    def __init__(self, fail_on_call=None, **preprocessor_kwargs):
+        self.preprocessor_kwargs = {'antonym_index_path': None, **preprocessor_kwargs}
+        self.processed = []
+        self.calls = 0
+        self.fail_on_call = fail_on_call
+
+    def map(self, method_name, values, **kwargs):
+        values = list(values)
+        if method_name == 'cleaning_text':
+            self.calls += 1
+            if self.calls == self.fail_on_call:
+                raise RuntimeError("interrupted")
+            self.processed.extend(values)
+            return [value.lower() for value in values]
+        suffix = ' neg' if kwargs['negations'] else ''
+        return [{'neg_cleaned_text': value + suffix, 'lemmatized': value, 'stemmed': value} for value in values]
+
+@pytest.fixture
+def dataset_path(tmp_path):
+    path = tmp_path / 'dataset.csv'
+    path.write_text('label\ttext\n' + ''.join(f"{label}\t{text}\n" for label, text in DATASET), encoding='utf-8')
+    return str(path)
+
+# Перевірка збереження та читання рядків сховища
+def test_store_round_trip(tmp_path):
+    store = PreprocessingStore(str(tmp_path / 'store.sqlite'))
+    row = {'cleaned_text': 'a', 'neg_cleaned_text': 'b', 'lemmatized': 'c', 'stemmed': 'd'}
+    store.put_many({'key': row})
+    assert store.get_many(['key', 'key', 'missing']) == {'key': row}
+    assert len(store) == 1
+    store.close()
+
+# Перевірка, що повторний запуск бере всі рядки зі сховища, а результат не змінюється
+def test_second_run_uses_store(tmp_path, dataset_path):
+    pd = pytest.importorskip('pandas')
+    store_path = str(tmp_path / 'store.sqlite')
+    output_path = str(tmp_path / 'output.csv')
+
+    engine = FakeEngine()
+    counts = preprocess_incremental(engine, dataset_path, output_path, store_path, read_chunk_size=3)
+    first = pd.read_csv(output_path, delimiter='\t')
+    # Рядок з невідомою міткою пропускається, однаковий рядок обробляється один раз
+    assert counts.to_dict() == {-1: 2, 0: 3, 1: 3}
+    assert sorted(engine.processed) == sorted(set(text for label, text in DATASET if label != 2))
+    # Виявлення заперечень не виконується для нейтрального класу
+    assert first.set_index('text')['neg_cleaned_text'].to_dict()['The movie'] == 'the movie'
+    assert first.set_index('text')['neg_cleaned_text'].to_dict()['Bad movie'] == 'bad movie neg'
+
+    engine = FakeEngine()
+    preprocess_incremental(engine, dataset_path, output_path, store_path, read_chunk_size=3)
+    assert engine.processed == []
+    assert pd.read_csv(output_path, delimiter='\t').equals(first)
+
+# Перевірка, що перерваний запуск продовжується з першої необробленої частини
+def test_resume_after_interruption(tmp_path, dataset_path):
+    pytest.importorskip('pandas')
+    store_path = str(tmp_path / 'store.sqlite')
+    output_path = str(tmp_path / 'output.csv')
+
+    with pytest.raises(RuntimeError):
+        preprocess_incremental(FakeEngine(fail_on_call=2), dataset_path, output_path, store_path, read_chunk_size=3)
+    # Попередній результат не замінюється незавершеним
+    assert not (tmp_path / 'output.csv').exists()
+
+    engine = FakeEngine()
+    preprocess_incremental(engine, dataset_path, output_path, store_path, read_chunk_size=3)
+    assert sorted(engine.processed) == ["A plot", "Awful plot", "Fine acting", "Great fun"]
+
+# Перевірка, що зміна налаштувань TextPreprocessor робить збережені рядки недійсними
+def test_settings_change_invalidates(tmp_path, dataset_path):
+    pytest.importorskip('pandas')
+    store_path = str(tmp_path / 'store.sqlite')
+    output_path = str(tmp_path / 'output.csv')
+
+    preprocess_incremental(FakeEngine(), dataset_path, output_path, store_path)
+    engine = FakeEngine(tokenizer='regex')
+    preprocess_incremental(engine, dataset_path, output_path, store_path)
+    assert len(engine.processed) == 7
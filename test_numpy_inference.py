@@ -0,0 +1,58 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('sklearn')
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from model_artifact import ModelArtifact, export_artifact
+from numpy_inference import FLOAT32_TOLERANCE, FLOAT64_TOLERANCE, NumpyInferenceEngine
+
+TRAIN_TEXTS = ["good movie great acting", "bad movie terrible plot", "the movie was fine",
+               "great great fun", "awful boring terrible", "an ordinary plot and fine acting",
+               "not bad at all", "good fun for everyone", "boring and bad"]
+TRAIN_LABELS = [1, -1, 0, 1, -1, 0, 1, 1, -1]
+# Тексти з невідомими словами, повторами та без жодної ознаки
+TEST_TEXTS = ["good plot", "terrible terrible acting", "unknown words only", "", "fine fine fine movie great"]
+
+# Функція для навчання векторизатора та моделі sklearn з заданими параметрами
+def fit_model(labels=TRAIN_LABELS, **vectorizer_params):
+    vectorizer = TfidfVectorizer(**vectorizer_params)
+    mlr = LogisticRegression(C=10, max_iter=1000).fit(vectorizer.fit_transform(TRAIN_TEXTS), labels)
+    return vectorizer, mlr
+
+# Перевірка збігу ймовірностей та міток з TfidfVectorizer + LogisticRegression для різних параметрів TF-IDF
+@pytest.mark.parametrize('vectorizer_params', [{}, {'ngram_range': (1, 2)}, {'sublinear_tf': True, 'norm': 'l1'},
+                                               {'binary': True, 'use_idf': False}, {'stop_words': 'english'}])
+def test_matches_sklearn(vectorizer_params):
+    vectorizer, mlr = fit_model(**vectorizer_params)
+    engine = NumpyInferenceEngine.from_sklearn(vectorizer, mlr)
+    expected = mlr.predict_proba(vectorizer.transform(TEST_TEXTS))
+
+    assert np.abs(engine.predict_proba(TEST_TEXTS) - expected).max() <= FLOAT64_TOLERANCE
+    assert engine.predict(TEST_TEXTS).tolist() == mlr.predict(vectorizer.transform(TEST_TEXTS)).tolist()
+
+# Перевірка точності у режимі float32
+def test_float32():
+    vectorizer, mlr = fit_model()
+    engine = NumpyInferenceEngine.from_sklearn(vectorizer, mlr, np.float32)
+    expected = mlr.predict_proba(vectorizer.transform(TEST_TEXTS))
+    assert np.abs(engine.predict_proba(TEST_TEXTS) - expected).max() <= FLOAT32_TOLERANCE
+
+# Перевірка бінарної моделі (один рядок коефіцієнтів)
+def test_binary():
+    labels = [1 if label == 1 else 0 for label in TRAIN_LABELS]
+    vectorizer, mlr = fit_model(labels)
+    engine = NumpyInferenceEngine.from_sklearn(vectorizer, mlr)
+    expected = mlr.predict_proba(vectorizer.transform(TEST_TEXTS))
+    assert np.abs(engine.predict_proba(TEST_TEXTS) - expected).max() <= FLOAT64_TOLERANCE
+    assert engine.predict(TEST_TEXTS).tolist() == mlr.predict(vectorizer.transform(TEST_TEXTS)).tolist()
+
+# Перевірка рушія, створеного з артефакту (відсортована таблиця рядків, відображена в пам'ять)
+def test_from_artifact(tmp_path):
+    vectorizer, mlr = fit_model(ngram_range=(1, 2))
+    export_artifact(vectorizer, mlr, str(tmp_path / 'artifact'))
+    engine = NumpyInferenceEngine.from_artifact(ModelArtifact(str(tmp_path / 'artifact')))
+    expected = mlr.predict_proba(vectorizer.transform(TEST_TEXTS))
+    assert np.abs(engine.predict_proba(TEST_TEXTS) - expected).max() <= FLOAT64_TOLERANCE
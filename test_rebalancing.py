@@ -0,0 +1,78 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+sp = pytest.importorskip('scipy.sparse')
+
+from rebalancing import STRATEGIES, class_weight_params, missing_counts, rebalance, sparse_smote
+
+# Функція для створення незбалансованого розрідженого набору: 12 / 5 / 2 приклади
+def imbalanced_data(seed=0):
+    rng = np.random.default_rng(seed)
+    X = sp.random(19, 40, density=0.2, format='csr', random_state=seed, data_rvs=rng.random)
+    y = np.array([1] * 12 + [0] * 5 + [-1] * 2)
+    return X, y
+
+# Перевірка підрахунку прикладів, яких бракує до найбільшого класу
+def test_missing_counts():
+    assert missing_counts(np.array([1, 1, 1, 0, -1, -1])) == {-1: 1, 0: 2, 1: 0}
+
+# Перевірка, що стратегії оверсемплінгу вирівнюють класи та зберігають вихідні рядки першими
+@pytest.mark.parametrize('strategy', ['random_oversample', 'sparse_smote'])
+def test_oversampling_balances(strategy):
+    X, y = imbalanced_data()
+    X_resampled, y_resampled = rebalance(X, y, strategy)
+
+    assert sp.issparse(X_resampled)
+    assert X_resampled.shape == (36, X.shape[1])
+    assert sorted(missing_counts(y_resampled).values()) == [0, 0, 0]
+    assert abs(X_resampled[:X.shape[0]] - X).max() == 0
+    assert np.array_equal(y_resampled[:len(y)], y)
+
+# Перевірка, що синтетичні приклади SMOTE лежать на відрізку між двома прикладами свого класу
+def test_sparse_smote_interpolates():
+    X, y = imbalanced_data()
+    X_resampled, y_resampled = sparse_smote(X, y)
+    X_dense = X.toarray()
+
+    for row, label in zip(X_resampled[X.shape[0]:].toarray(), y_resampled[len(y):]):
+        class_rows = X_dense[y == label]
+        # Синтетичний рядок не виходить за межі значень класу в кожній ознаці
+        assert np.all(row >= class_rows.min(axis=0) - 1e-12)
+        assert np.all(row <= class_rows.max(axis=0) + 1e-12)
+
+# Перевірка, що результат відтворюється з тим самим random_state
+def test_sparse_smote_reproducible():
+    X, y = imbalanced_data()
+    first, _ = rebalance(X, y, 'sparse_smote', random_state=7)
+    second, _ = rebalance(X, y, 'sparse_smote', random_state=7)
+    assert abs(first - second).max() == 0
+
+# Перевірка, що клас з одним прикладом доповнюється його повторенням
+def test_sparse_smote_single_sample_class():
+    X, y = imbalanced_data()
+    y = y.copy()
+    y[-2] = 0  # Клас -1 тепер має один приклад
+    X_resampled, y_resampled = sparse_smote(X, y)
+    synthetic = X_resampled[X.shape[0]:][y_resampled[len(y):] == -1]
+    assert synthetic.shape[0] == 11
+    assert abs(synthetic - X[[-1] * 11]).max() == 0
+
+# Перевірка, що стратегії з вагами класів не змінюють дані
+@pytest.mark.parametrize('strategy', ['class_weight', 'none'])
+def test_strategies_without_resampling(strategy):
+    X, y = imbalanced_data()
+    X_resampled, y_resampled = rebalance(X, y, strategy)
+    assert X_resampled is X and y_resampled is y
+
+# Перевірка параметрів LogisticRegression для кожної стратегії
+def test_class_weight_params():
+    assert class_weight_params('class_weight') == {'class_weight': 'balanced'}
+    for strategy in STRATEGIES:
+        if strategy != 'class_weight':
+            assert class_weight_params(strategy) == {}
+
+# Перевірка, що невідома стратегія відхиляється
+def test_unknown_strategy():
+    X, y = imbalanced_data()
+    with pytest.raises(ValueError):
+        rebalance(X, y, 'undersample')
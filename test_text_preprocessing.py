@@ -0,0 +1,71 @@
+import random
+import pytest
+
+from antonym_index import write_antonym_index
+from text_preprocessing import TREEBANK_SPLITS, TextPreprocessor, regex_tokenize
+
+# Слова, які word_tokenize розділяє, та звичайні слова очищеного тексту
+WORDS = list(TREEBANK_SPLITS) + ['Cannot', 'GONNA', 'WannA', 'can', 'not', 'gon', 'na', 'wannabe', 'cannots',
+                                 'good', 'movie', 'i', 'dont', 'wont', 'x2', '2023', 'snake_case', 'café', 'naïve']
+
+# Функція для отримання випадкових текстів у формі результату cleaning_text (лише \w та пробіли)
+def cleaned_texts(n=500, seed=42):
+    rng = random.Random(seed)
+    texts = ['', 'cannot', 'i wanna go', 'gimme gimme', 'wanna', 'Lemme   see  gotta']
+    for _ in range(n):
+        texts.append(' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 12))))
+    return texts
+
+# Перевірка розділень слів Treebank
+def test_regex_splits():
+    assert regex_tokenize('i cannot wait gonna see') == ['i', 'can', 'not', 'wait', 'gon', 'na', 'see']
+    assert regex_tokenize('Gimme  WANNA') == ['Gim', 'me', 'WAN', 'NA']
+    assert regex_tokenize('cannots wannabe') == ['cannots', 'wannabe']
+    assert regex_tokenize('') == []
+
+# Перевірка, що на очищеному тексті швидкий токенізатор збігається з word_tokenize
+def test_regex_matches_word_tokenize():
+    pytest.importorskip('nltk')
+    from nltk.tokenize import word_tokenize
+
+    for text in cleaned_texts():
+        try:
+            expected = word_tokenize(text)
+        except LookupError:
+            # Без даних punkt: очищений текст не містить знаків кінця речення, тому розбиття на речення не потрібне
+            expected = word_tokenize(text, preserve_line=True)
+        assert regex_tokenize(text) == expected, text
+
+# Перевірка, що невідомий токенізатор відхиляється під час створення та застосування налаштувань
+def test_unknown_tokenizer():
+    with pytest.raises(ValueError):
+        TextPreprocessor(antonym_index_path=None, tokenizer='spacy')
+    textPreprocessor = TextPreprocessor(antonym_index_path=None)
+    with pytest.raises(ValueError):
+        textPreprocessor.apply_settings({'tokenizer': 'spacy'})
+    assert textPreprocessor.tokenizer == 'nltk'
+
+# Перевірка, що налаштування з артефакту відтворюються, а результати іншого токенізатора скидаються
+def test_apply_settings():
+    source = TextPreprocessor(antonym_index_path=None, tokenizer='regex', fast_cleaning=True)
+    textPreprocessor = TextPreprocessor(antonym_index_path=None)
+    textPreprocessor.stable_words['word'] = True
+    textPreprocessor.apply_settings(source.settings())
+    assert textPreprocessor.settings() == source.settings()
+    assert textPreprocessor.stable_words == {}
+
+# Перевірка, що зміна префіксів скидає кеш антонімів і вимикає несумісний індекс
+def test_apply_settings_prefixes(tmp_path):
+    path = str(tmp_path / 'antonyms.idx')
+    n_prefixes = TextPreprocessor(antonym_index_path=None).n_prefixes
+    write_antonym_index({'good': 'bad'}, path, {'n_prefixes': n_prefixes})
+    textPreprocessor = TextPreprocessor(antonym_index_path=path)
+    assert textPreprocessor.get_antonym('good') == 'bad'
+
+    textPreprocessor.apply_settings({'n_prefixes': ['un']})
+    assert textPreprocessor.antonym_index is None
+    assert len(textPreprocessor.antonym_cache) == 0
+
+    textPreprocessor.apply_settings({'n_prefixes': n_prefixes})
+    assert textPreprocessor.get_antonym('good') == 'bad'
+    textPreprocessor.antonym_index.close()
@@ -0,0 +1,60 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('sklearn')
+
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+
+from text_vectorizing import HashingTfidfVectorizer
+
+TEXTS = ["good movie great acting", "bad movie terrible plot", "the movie was fine", "great great fun",
+         "awful boring terrible", "an ordinary plot and fine acting", "not bad at all", "good fun"]
+
+# Функція для порівняння двох розріджених матриць
+def assert_same_matrix(first, second):
+    assert first.shape == second.shape
+    assert abs(first - second).max() <= 1e-12
+
+# Перевірка, що об'єднання частот документів частин дає ті самі ваги, що й навчання на всіх текстах
+def test_merge_matches_fit():
+    full = HashingTfidfVectorizer(n_features=2 ** 10).fit(TEXTS)
+    merged = HashingTfidfVectorizer(n_features=2 ** 10).fit(TEXTS[:3])
+    merged.merge(HashingTfidfVectorizer(n_features=2 ** 10).fit(TEXTS[3:]))
+
+    assert merged.n_documents == full.n_documents
+    assert np.array_equal(merged.document_frequency, full.document_frequency)
+    assert np.allclose(merged.idf_, full.idf_)
+    assert_same_matrix(merged.transform(TEXTS), full.transform(TEXTS))
+
+# Перевірка, що паралельне навчання збігається з послідовним
+def test_fit_parallel_matches_fit():
+    full = HashingTfidfVectorizer(n_features=2 ** 10).fit(TEXTS)
+    parallel = HashingTfidfVectorizer(n_features=2 ** 10).fit_parallel(TEXTS, n_workers=2, chunk_size=3)
+    assert np.array_equal(parallel.document_frequency, full.document_frequency)
+    assert_same_matrix(parallel.transform(TEXTS), full.transform(TEXTS))
+
+# Перевірка, що векторизатори з різними параметрами не об'єднуються
+def test_merge_rejects_different_params():
+    with pytest.raises(ValueError):
+        HashingTfidfVectorizer(n_features=2 ** 10).merge(HashingTfidfVectorizer(n_features=2 ** 11))
+
+# Перевірка збігу з HashingVectorizer + TfidfTransformer з sklearn
+@pytest.mark.parametrize('params', [{}, {'sublinear_tf': True}, {'smooth_idf': False, 'norm': 'l1'},
+                                    {'ngram_range': (1, 2), 'norm': None}])
+def test_matches_sklearn(params):
+    vectorizer_params = {key: value for key, value in params.items() if key == 'ngram_range'}
+    transformer_params = {key: value for key, value in params.items() if key != 'ngram_range'}
+    hasher = HashingVectorizer(n_features=2 ** 10, alternate_sign=False, norm=None, **vectorizer_params)
+    expected = TfidfTransformer(**transformer_params).fit_transform(hasher.transform(TEXTS))
+
+    vectorizer = HashingTfidfVectorizer(n_features=2 ** 10, **params)
+    assert_same_matrix(vectorizer.fit_transform(TEXTS), expected)
+
+# Перевірка збереження та завантаження частот документів
+def test_save_load(tmp_path):
+    path = str(tmp_path / 'hashing_vectorizer.npz')
+    vectorizer = HashingTfidfVectorizer(n_features=2 ** 10, ngram_range=(1, 2)).fit(TEXTS)
+    vectorizer.save(path)
+    loaded = HashingTfidfVectorizer.load(path)
+    assert loaded.get_params() == vectorizer.get_params()
+    assert_same_matrix(loaded.transform(TEXTS), vectorizer.transform(TEXTS))
@@ -1,11 +1,9 @@
+import os
 import re	
-import nltk
-import contractions
-from nltk.tag import pos_tag
-from nltk.stem import PorterStemmer
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import wordnet, stopwords
+from antonym_index import AntonymIndex
+from caching import LRUCache
+
+# Модулі NLTK та contractions імпортуються під час першого використання, щоб імпорт цього файлу був швидким
 
 # Завантаження необхідних ресурсів NLTK
 # nltk.download('averaged_perceptron_tagger')
@@ -13,19 +11,138 @@ from nltk.corpus import wordnet, stopwords
 # nltk.download('wordnet')
 # nltk.download('punkt')
 
+# Попередньо скомпільовані шаблони для швидкого режиму очищення тексту
+URL_PATTERN = re.compile(r'\b(?:https?|ftp)://\S+|www\.\S+')
+DOMAIN_PATTERN = re.compile(r'(?:\S+\.)+(?:com|es|org|net)\b')
+# Згадки, слеші, хештеги, апострофи та інша пунктуація за один прохід
+PUNCTUATION_PATTERN = re.compile(r'[@/#]\w+|[^\w\s]')
+# Однолітерні слова та цифри за один прохід
+SHORT_WORDS_AND_DIGITS_PATTERN = re.compile(r'\b\w\b|\d+')
+SPACES_PATTERN = re.compile(r' +')
+# Токен, що складається лише з літер, цифр та підкреслень
+WORD_PATTERN = re.compile(r'\w+')
+# Токен очищеного тексту для швидкого токенізатора (очищений текст містить лише \w та пробіли)
+TOKEN_PATTERN = re.compile(r'\S+')
+# Слова, які word_tokenize (Treebank) розділяє на дві частини: слово -> довжина першої частини
+TREEBANK_SPLITS = {'cannot': 3, 'gimme': 3, 'gonna': 3, 'gotta': 3, 'lemme': 3, 'wanna': 3}
+# Доступні токенізатори
+TOKENIZERS = ('nltk', 'regex')
+
+# Шаблон для пошуку скорочень, які можуть зустрітися в очищеному тексті (створюється при першому використанні)
+_contractions_pattern = None
+
+# Функція для побудови шаблону скорочень з ключів словників бібліотеки contractions
+def get_contractions_pattern():
+	global _contractions_pattern
+	if _contractions_pattern is None:
+		import contractions
+		keys = set()
+		for name in dir(contractions):
+			value = getattr(contractions, name)
+			if name.endswith('_dict') and isinstance(value, dict):
+				keys.update(value.keys())
+
+		# Очищений текст містить лише літери, цифри та пробіли, тому ключі з іншими символами не можуть зустрітися
+		keys = [key for key in keys if re.fullmatch(r'[\w\s]+', key)]
+		if keys:
+			keys.sort(key=len, reverse=True)
+			_contractions_pattern = re.compile('|'.join(map(re.escape, keys)), re.IGNORECASE)
+		else:
+			# Якщо словники недоступні, contractions.fix викликається для кожного тексту
+			_contractions_pattern = re.compile('')
+	return _contractions_pattern
+
+# Функція для швидкої токенізації очищеного тексту з тими самими розділеннями слів, що й у word_tokenize
+def regex_tokenize(text):
+	tokens = []
+	for token in TOKEN_PATTERN.findall(text):
+		split = TREEBANK_SPLITS.get(token.lower())
+		if split is None:
+			tokens.append(token)
+		else:
+			tokens.append(token[:split])
+			tokens.append(token[split:])
+	return tokens
+
 class TextPreprocessor:
-	def __init__(self):	
-		# Ініціалізація лематизатора та стемера
-		self.lemmatizer = WordNetLemmatizer()
-		self.stemmer = PorterStemmer()
-		# Отримання списку стоп-слів
-		self.s_words = stopwords.words('english')
+	def __init__(self, fast_cleaning=False, antonym_index_path="models/antonyms.idx", cache_size=50000, tokenizer='nltk'):	
+		# Використання швидкого режиму очищення тексту з попередньо скомпільованими шаблонами
+		self.fast_cleaning = fast_cleaning
+		# Токенізатор: 'nltk' (word_tokenize) або 'regex' (швидкий, лише для очищеного тексту)
+		if tokenizer not in TOKENIZERS:
+			raise ValueError(f"Unknown tokenizer: {tokenizer}")
+		self.tokenizer = tokenizer
+		# Лематизатор, стемер та стоп-слова створюються під час першого використання
+		self._lemmatizer = None
+		self._stemmer = None
+		self._s_words = None
+		# Результати перевірки нових слів (антонімів) на стабільність при токенізації
+		self.stable_words = {}
 		self.n_words = 3  # Кількість слів після заперечення, які будуть перевірені на антоніми
 		self.negation_words = ["not", "no", "n't"]  # Список слів, що вказують на заперечення
 		self.n_prefixes = ["a", "un", "in", "im",  
 				   "il", "ir", "non", "dis",
 				   "less", "ab", "an",
 				   "mis", "anti", "ig"] # Префікси для створення негативних форм слів
+		# Завантаження попередньо обчисленого індексу антонімів замість запитів до WordNet
+		self.load_antonym_index(antonym_index_path)
+		# Обмежені за розміром кеші для операцій над окремими токенами
+		self.lemma_cache = LRUCache(cache_size)  # (токен, тег) -> лема
+		self.stem_cache = LRUCache(cache_size)  # токен -> основа
+		self.antonym_cache = LRUCache(cache_size)  # слово -> антонім або негативна форма
+
+	# Функція для отримання налаштувань, від яких залежить результат обробки (зберігаються в артефакті моделі)
+	def settings(self):
+		return {'fast_cleaning': self.fast_cleaning,
+				'tokenizer': self.tokenizer,
+				'n_words': self.n_words,
+				'negation_words': self.negation_words,
+				'n_prefixes': self.n_prefixes}
+
+	# Функція для застосування збережених налаштувань (наприклад, з артефакту моделі)
+	def apply_settings(self, settings):
+		tokenizer = settings.get('tokenizer', self.tokenizer)
+		if tokenizer not in TOKENIZERS:
+			raise ValueError(f"Unknown tokenizer: {tokenizer}")
+		# Стабільність слів при токенізації перевірялася попереднім токенізатором
+		if tokenizer != self.tokenizer:
+			self.stable_words.clear()
+		prefixes_changed = settings.get('n_prefixes', self.n_prefixes) != self.n_prefixes
+		antonyms_changed = prefixes_changed or settings.get('n_words', self.n_words) != self.n_words
+		for name, value in settings.items():
+			setattr(self, name, value)
+		# Індекс антонімів перевіряється на сумісність з новими префіксами (інакше використовується WordNet)
+		if prefixes_changed:
+			if self.antonym_index is not None:
+				self.antonym_index.close()
+			self.load_antonym_index(self.antonym_index_path)
+		# Збережені антоніми та негативні форми обчислені з попередніми налаштуваннями
+		if antonyms_changed:
+			self.antonym_cache.clear()
+
+	# Лематизатор WordNet (створюється під час першого використання)
+	@property
+	def lemmatizer(self):
+		if self._lemmatizer is None:
+			from nltk.stem import WordNetLemmatizer
+			self._lemmatizer = WordNetLemmatizer()
+		return self._lemmatizer
+
+	# Стемер Портера (створюється під час першого використання)
+	@property
+	def stemmer(self):
+		if self._stemmer is None:
+			from nltk.stem import PorterStemmer
+			self._stemmer = PorterStemmer()
+		return self._stemmer
+
+	# Множина стоп-слів для перевірки за сталий час (завантажується під час першого використання)
+	@property
+	def s_words(self):
+		if self._s_words is None:
+			from nltk.corpus import stopwords
+			self._s_words = set(stopwords.words('english'))
+		return self._s_words
 
 	# Функція для переведення тексту в нижній регістр
 	def lower_text(self, text):
@@ -88,27 +205,14 @@ class TextPreprocessor:
 
 	# Функція для видалення стоп-слів з тексту
 	def remove_stop_words(self, text):
-		new_tokens = []  # Ініціалізація списку для зберігання нових токенів без стоп-слів
-
 		# Перевірка чи текст є рядком
 		if type(text) is not str:
 			# Виведення повідомлення про помилку, якщо тип тексту не рядок
 			print("Function (remove_stop_words): Type of text is not str")
 			return None  # Повернення None у разі неправильного типу
 		else:
-			# Токенізація тексту
-			tokens = word_tokenize(text)
-			# Перебір токенів
-			for token in tokens:
-				# Додавання токену до списку, якщо він не є стоп-словом
-				if token not in self.s_words:
-					new_tokens.append(token)
-
-		# Об'єднання нових токенів у рядок
-		text = ' '.join(new_tokens)
-
-		# Повернення тексту без стоп-слів
-		return text
+			# Токенізація тексту, видалення стоп-слів та об'єднання токенів у рядок
+			return ' '.join(self.remove_stop_word_tokens(self.tokenize(text)))
 
 	# Функція для повного очищення тексту (переведення в нижній регістр, видалення URL та доменів, пунктуації та цифр)
 	def cleaning_text(self, text):
@@ -117,6 +221,9 @@ class TextPreprocessor:
 			# Виведення повідомлення про помилку, якщо тип тексту не рядок
 			print("Function (cleaning_text): Type of text is not str")
 			return None  # Повернення None у разі неправильного типу
+		elif self.fast_cleaning:
+			# Швидкий режим очищення з тим самим результатом
+			return self.fast_cleaning_text(text)
 		else:
 			# Переведення тексту в нижній регістр
 			text = self.lower_text(text)
@@ -125,11 +232,38 @@ class TextPreprocessor:
 			# Видалення пунктуації та цифр
 			text = self.remove_punctuation_and_digits(text)
 			# Виправлення помилок у тексті (наприклад, скорочень)
+			import contractions
 			text = contractions.fix(text)
 
 			# Повернення очищеного тексту
 			return text
 
+	# Функція для швидкого очищення тексту за мінімальну кількість проходів по рядку
+	def fast_cleaning_text(self, text):
+		# Переведення тексту в нижній регістр
+		text = text.lower()
+		# Видалення URL-адрес та доменів (окремі проходи, бо видалення URL змінює межі доменів)
+		text = URL_PATTERN.sub('', text)
+		text = DOMAIN_PATTERN.sub('', text)
+		# Заміна табуляції пробілом
+		text = text.replace('\t', ' ')
+		# Видалення згадок, слешів, хештегів та всієї іншої пунктуації
+		text = PUNCTUATION_PATTERN.sub('', text)
+		# Видалення "rt " (заміна рядка замість регулярного виразу)
+		text = text.replace('rt ', '')
+		# Видалення однолітерних слів та цифр
+		text = SHORT_WORDS_AND_DIGITS_PATTERN.sub('', text)
+		# Заміна декількох пробілів на один та видалення пробілів з початку та кінця тексту
+		text = SPACES_PATTERN.sub(' ', text).strip()
+
+		# Виправлення скорочень лише тоді, коли в тексті є хоча б один можливий ключ
+		if get_contractions_pattern().search(text):
+			import contractions
+			text = contractions.fix(text)
+
+		# Повернення очищеного тексту
+		return text
+
 	# Функція для отримання негативної форми слова
 	def get_negative_form(self, word):
 		# Перевірка чи слово є рядком
@@ -138,6 +272,7 @@ class TextPreprocessor:
 			print("Function (get_negative_form): Type of word is not str")
 			return None  # Повернення None у разі неправильного типу
 		else:
+			from nltk.corpus import wordnet
 			# Проходження по всім можливим префіксам, які зберігаються в self.n_prefixes
 			for prefix in self.n_prefixes:
 				negative_word = prefix + word  # Додавання префіксу до слова
@@ -155,19 +290,194 @@ class TextPreprocessor:
 			print("Function (get_antonym): Type of word is not str")
 			return None  # Повернення None у разі неправильного типу
 		else:
-			antonyms = []  # Створення списку для зберігання антонімів
-			# Проходження по всіх синсетах (групах синонімів) слова
-			for syn in wordnet.synsets(word.lower()):
-				for lemma in syn.lemmas():
-					for antonym in lemma.antonyms():
-						antonyms.append(antonym.name())  # Додавання антонімів до списку
-
-			if antonyms == []:
-				# Якщо антонімів немає, отримуємо негативну форму слова
-				return self.get_negative_form(word)
+			# Пошук у кеші антонімів
+			antonym = self.antonym_cache.get(word)
+			if antonym is not None:
+				return antonym
+
+			# Пошук у попередньо обчисленому індексі антонімів
+			if self.antonym_index is not None:
+				antonym = self.antonym_index.lookup(word)
+
+			# Запит до WordNet для слів, яких немає в індексі
+			if antonym is None:
+				antonym = self.wordnet_antonym(word)
+
+			self.antonym_cache.put(word, antonym)
+			return antonym
+
+	# Функція для отримання антоніма слова за допомогою запитів до WordNet
+	def wordnet_antonym(self, word):
+		from nltk.corpus import wordnet
+		antonyms = []  # Створення списку для зберігання антонімів
+		# Проходження по всіх синсетах (групах синонімів) слова
+		for syn in wordnet.synsets(word.lower()):
+			for lemma in syn.lemmas():
+				for antonym in lemma.antonyms():
+					antonyms.append(antonym.name())  # Додавання антонімів до списку
+
+		if antonyms == []:
+			# Якщо антонімів немає, отримуємо негативну форму слова
+			return self.get_negative_form(word)
+		else:
+			# Повернення першого знайденого антоніма
+			return antonyms[0]
+
+	# Функція для завантаження індексу антонімів та негативних форм слів
+	def load_antonym_index(self, path):
+		self.antonym_index_path = path
+		self.antonym_index = None
+		# Перевірка наявності файлу з індексом
+		if path is not None and os.path.exists(path):
+			antonym_index = AntonymIndex(path)
+			# Індекс використовується лише якщо він побудований з тими самими префіксами
+			if antonym_index.metadata.get('n_prefixes') == self.n_prefixes:
+				self.antonym_index = antonym_index
+			else:
+				print("Antonym index was built with different prefixes and will not be used.")
+				antonym_index.close()
+
+	# Функція для токенізації тексту
+	def tokenize(self, text):
+		if self.tokenizer == 'regex':
+			return regex_tokenize(text)
+		from nltk.tokenize import word_tokenize
+		return word_tokenize(text)
+
+	# Функція для заміни слів після заперечення на антоніми у списку токенів
+	def negate_tokens(self, tokens):
+		tokens = list(tokens)
+		len_tokens = len(tokens)
+		for token_index in range(len_tokens):
+			if tokens[token_index] in self.negation_words:  # Перевірка чи токен є словом заперечення
+				start_index = token_index + 1
+				end_index = start_index + self.n_words
+				for index in range(start_index, end_index):
+					if index < len_tokens:
+						tokens[index] = tokens[index] + "_neg"  # Додавання суфіксу "_neg" до наступних токенів
+
+		new_tokens = []
+
+		# Перебір токенів
+		for token in tokens:
+			if token.endswith("_neg"):  # Перевірка чи токен має суфікс "_neg"
+				new_token = token.replace("_neg", "")  # Видалення суфіксу "_neg" з токену
+				new_tokens.append(self.get_antonym(new_token))  # Заміна слова на антонім
 			else:
-				# Повернення першого знайденого антоніма
-				return antonyms[0]
+				new_tokens.append(token)
+
+		return new_tokens
+
+	# Функція для видалення стоп-слів зі списку токенів
+	def remove_stop_word_tokens(self, tokens):
+		# Перевірка за множиною стоп-слів виконується за сталий час
+		return [token for token in tokens if token not in self.s_words]
+
+	# Функція для визначення тегів частини мови для токенів
+	def pos_tag(self, tokens):
+		from nltk.tag import pos_tag
+		return pos_tag(tokens)
+
+	# Функція для лематизації списку токенів
+	def lemmatize_tokens(self, tokens):
+		from nltk.corpus import wordnet
+		tagged_tokens = self.pos_tag(tokens)  # Отримання тегів частини мови для токенів
+
+		lemmatized_tokens = []
+
+		# Проходження по кожному токену та його тегу
+		for token, tag in tagged_tokens:
+			wn_tag = None
+
+			# Визначення відповідного тегу WordNet для лематизації
+			if tag.startswith('J'):
+				wn_tag = wordnet.ADJ  # Тег для прикметників
+			elif tag.startswith('V'):
+				wn_tag = wordnet.VERB  # Тег для дієслів
+			elif tag.startswith('N'):
+				wn_tag = wordnet.NOUN  # Тег для іменників
+			elif tag.startswith('R'):
+				wn_tag = wordnet.ADV  # Тег для прислівників
+
+			# Лематизація токену з використанням відповідного тегу
+			lemmatized_tokens.append(self.lemmatize_token(token, wn_tag))  # Додавання лематизованого токену до списку
+
+		return lemmatized_tokens
+
+	# Функція для лематизації одного токену з кешуванням результату
+	def lemmatize_token(self, token, wn_tag=None):
+		lemma = self.lemma_cache.get((token, wn_tag))
+		if lemma is None:
+			if wn_tag is not None:
+				lemma = self.lemmatizer.lemmatize(token, pos=wn_tag)
+			else:
+				lemma = self.lemmatizer.lemmatize(token)  # Лематизація без спеціального тегу
+			self.lemma_cache.put((token, wn_tag), lemma)
+		return lemma
+
+	# Функція для стемінгу списку токенів
+	def stem_tokens(self, tokens):
+		# Стемінг кожного токену та переведення його в нижній регістр
+		return [self.stem_token(token) for token in tokens]
+
+	# Функція для стемінгу одного токену з кешуванням результату
+	def stem_token(self, token):
+		stem = self.stem_cache.get(token)
+		if stem is None:
+			stem = self.stemmer.stem(token).lower()
+			self.stem_cache.put(token, stem)
+		return stem
+
+	# Функція для отримання статистики кешів (влучання, промахи, витіснення)
+	def cache_stats(self):
+		return {'lemma': self.lemma_cache.stats(),
+				'stem': self.stem_cache.stats(),
+				'antonym': self.antonym_cache.stats()}
+
+	# Функція для очищення кешів
+	def clear_caches(self):
+		self.lemma_cache.clear()
+		self.stem_cache.clear()
+		self.antonym_cache.clear()
+
+	# Функція для перевірки, що повторна токенізація об'єднаних токенів дасть ті самі токени
+	def is_stable_tokens(self, tokens, original_tokens):
+		for token, original_token in zip(tokens, original_tokens):
+			# Токени, що складаються лише з літер та цифр, не розбиваються токенізатором
+			if not WORD_PATTERN.fullmatch(token):
+				return False
+			# Нові слова (антоніми) перевіряються окремо, бо токенізатор розбиває слова на кшталт "cannot"
+			if token != original_token:
+				stable = self.stable_words.get(token)
+				if stable is None:
+					stable = self.stable_words[token] = self.tokenize(token) == [token]
+				if not stable:
+					return False
+		return True
+
+	# Функція для обробки документа з однією токенізацією (заперечення, стоп-слова, лематизація, стемінг)
+	def process_document(self, text, negations=True):
+		# Перевірка чи текст є рядком
+		if type(text) is not str:
+			# Виведення повідомлення про помилку, якщо тип тексту не рядок
+			print("Function (process_document): Type of text is not str")
+			return {'neg_cleaned_text': None, 'lemmatized': None, 'stemmed': None}
+
+		original_tokens = self.tokenize(text)  # Єдина токенізація тексту
+		tokens = self.negate_tokens(original_tokens) if negations else original_tokens
+		neg_tokens = self.remove_stop_word_tokens(tokens)
+
+		# Якщо повторна токенізація могла б дати інші токени, використовується рядкова обробка,
+		# щоб результат збігався з послідовним викликом detect_negations, lemmatize та stem
+		if not self.is_stable_tokens(tokens, original_tokens):
+			neg_text = self.detect_negations(text) if negations else ' '.join(neg_tokens)
+			neg_tokens = self.tokenize(neg_text)
+		else:
+			neg_text = ' '.join(neg_tokens)
+
+		return {'neg_cleaned_text': neg_text,
+				'lemmatized': ' '.join(self.lemmatize_tokens(neg_tokens)),
+				'stemmed': ' '.join(self.stem_tokens(neg_tokens))}
 
 	# Функція для виявлення заперечень у тексті
 	def detect_negations(self, text):
@@ -177,28 +487,15 @@ class TextPreprocessor:
 			print("Function (detect_negations): Type of text is not str")
 			return None  # Повернення None у разі неправильного типу
 		else:
-			tokens = word_tokenize(text)  # Токенізація тексту
-			len_tokens = len(tokens)
-			for token_index in range(len_tokens):
-				if tokens[token_index] in self.negation_words:  # Перевірка чи токен є словом заперечення
-					start_index = token_index + 1
-					end_index = start_index + self.n_words
-					for index in range(start_index, end_index):
-						if index < len_tokens:
-							tokens[index] = tokens[index] + "_neg"  # Додавання суфіксу "_neg" до наступних токенів
-
-			new_tokens = []
-
-			# Перебір токенів
-			for token in tokens:
-				if token.endswith("_neg"):  # Перевірка чи токен має суфікс "_neg"
-					new_token = token.replace("_neg", "")  # Видалення суфіксу "_neg" з токену
-					new_tokens.append(self.get_antonym(new_token))  # Заміна слова на антонім
-				else:
-					new_tokens.append(token)
+			original_tokens = self.tokenize(text)  # Токенізація тексту
+			tokens = self.negate_tokens(original_tokens)  # Заміна слів після заперечення на антоніми
+
+			# Видалення стоп-слів без повторної токенізації, якщо токени стабільні
+			if self.is_stable_tokens(tokens, original_tokens):
+				return ' '.join(self.remove_stop_word_tokens(tokens))
 
 			# Об'єднання нових токенів у рядок
-			text = ' '.join(new_tokens)
+			text = ' '.join(tokens)
 			text = re.sub(r' +', ' ', text)  # Заміна декількох пробілів на один
 			text = self.remove_stop_words(text)  # Видалення стоп-слів
 
@@ -213,38 +510,8 @@ class TextPreprocessor:
 			print("Function (lemmatize): Type of text is not str")
 			return None  # Повернення None у разі неправильного типу
 		else:
-			tokens = word_tokenize(text)  # Токенізація тексту
-			tagged_tokens = pos_tag(tokens)  # Отримання тегів частини мови для токенів
-
-			lemmatized_tokens = []
-
-			# Проходження по кожному токену та його тегу
-			for token, tag in tagged_tokens:
-				wn_tag = None
-
-				# Визначення відповідного тегу WordNet для лематизації
-				if tag.startswith('J'):
-					wn_tag = wordnet.ADJ  # Тег для прикметників
-				elif tag.startswith('V'):
-					wn_tag = wordnet.VERB  # Тег для дієслів
-				elif tag.startswith('N'):
-					wn_tag = wordnet.NOUN  # Тег для іменників
-				elif tag.startswith('R'):
-					wn_tag = wordnet.ADV  # Тег для прислівників
-
-				# Лематизація токену з використанням відповідного тегу
-				if wn_tag is not None:
-					lemma = self.lemmatizer.lemmatize(token, pos=wn_tag)
-				else:
-					lemma = self.lemmatizer.lemmatize(token)  # Лематизація без спеціального тегу
-
-				lemmatized_tokens.append(lemma)  # Додавання лематизованого токену до списку
-
-			# Об'єднання лематизованих токенів у текст
-			lemmatized_text = ' '.join(lemmatized_tokens)
-
-			# Повернення лематизованого тексту
-			return lemmatized_text
+			# Токенізація, лематизація та об'єднання лематизованих токенів у текст
+			return ' '.join(self.lemmatize_tokens(self.tokenize(text)))
 
 	# Функція для стемінгу тексту
 	def stem(self, text):
@@ -254,17 +521,5 @@ class TextPreprocessor:
 			print("Function (stem): Type of text is not str")
 			return None  # Повернення None у разі неправильного типу
 		else:
-			# Токенізація тексту
-			tokens = word_tokenize(text)
-			stemmed_tokens = []
-
-			# Проходження по кожному токену
-			for token in tokens:
-				# Стемінг токену та переведення його в нижній регістр
-				stemmed_tokens.append(self.stemmer.stem(token).lower())
-
-			# Об'єднання стемінгованих токенів у текст
-			stemmed_text = ' '.join(stemmed_tokens)
-
-			# Повернення стемінгованого тексту
-			return stemmed_text
\ No newline at end of file
+			# Токенізація, стемінг та об'єднання стемінгованих токенів у текст
+			return ' '.join(self.stem_tokens(self.tokenize(text)))
\ No newline at end of file
@@ -0,0 +1,138 @@
+import csv
+import json
+
+# Функція для читання текстового файлу частинами по chunk_size рядків
+def iter_chunks(file_path, chunk_size=1000):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        chunk = []
+        for line in file:
+            chunk.append(line.replace('\n', ''))
+            # Повернення частини, щойно вона заповнена
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        # Повернення останньої неповної частини
+        if chunk:
+            yield chunk
+
+# Функція для швидкого підрахунку кількості рядків у файлі (для оцінки часу, що залишився)
+def count_lines(file_path):
+    n_lines = 0
+    last = b'\n'
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            n_lines += block.count(b'\n')
+            last = block[-1:]
+    # Останній рядок без символу нового рядка
+    return n_lines + (last != b'\n')
+
+# Функція для передбачення тональності кожної частини рядків
+def iter_predictions(mlr, chunks, batch_size=1000):
+    for chunk in chunks:
+        yield chunk, mlr.predict_batch(chunk, batch_size=batch_size)
+
+# Функція для читання збережених результатів у вигляді пар (текст, тональність)
+def iter_results(results_path, output_format='jsonl'):
+    with open(results_path, 'r', encoding='utf-8', newline='') as file:
+        if output_format == 'csv':
+            reader = csv.reader(file)
+            next(reader, None)  # Пропуск заголовка
+            for text, tonality in reader:
+                yield text, tonality
+        else:
+            for line in file:
+                record = json.loads(line)
+                yield record['text'], record['tonality']
+
+# Функція для експорту результатів у словниковий формат text_tonality.json
+def export_json(results_path, json_path, output_format='jsonl'):
+    # Словник записується потоково у тому ж форматі, що і json.dump(..., indent=4),
+    # тому пам'ять не залежить від розміру результатів. Повторювані рядки дають
+    # повторювані ключі, а json.load залишає останнє значення, як і словник.
+    with open(json_path, 'w') as file:
+        empty = True
+        for text, tonality in iter_results(results_path, output_format):
+            file.write('{\n    ' if empty else ',\n    ')
+            file.write(f"{json.dumps(text)}: {json.dumps(tonality)}")
+            empty = False
+        file.write('{}' if empty else '\n}')
+
+class ResultSink:
+    def __init__(self, file_path, output_format='jsonl'):
+        # Перевірка формату вихідного файлу
+        if output_format not in ('jsonl', 'csv'):
+            raise ValueError(f"Unknown output format: {output_format}")
+
+        self.output_format = output_format
+        self.file = open(file_path, 'w', encoding='utf-8', newline='')
+
+        # Запис заголовка для CSV файлу
+        if output_format == 'csv':
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(['text', 'tonality'])
+
+    # Функція для дописування результатів частини у файл
+    def write(self, lines, predictions):
+        if self.output_format == 'csv':
+            self.writer.writerows(zip(lines, predictions))
+        else:
+            for line, prediction in zip(lines, predictions):
+                self.file.write(json.dumps({'text': line, 'tonality': str(prediction)}) + '\n')
+
+        # Скидання буфера, щоб результати зберігалися навіть при перериванні
+        self.file.flush()
+
+    # Функція для закриття файлу результатів
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class StreamingScorer:
+    def __init__(self, mlr, chunk_size=1000, output_format='jsonl'):
+        # Модель для передбачення тональності
+        self.mlr = mlr
+        # Кількість рядків, що одночасно зберігаються в пам'яті
+        self.chunk_size = chunk_size
+        # Формат вихідного файлу: 'jsonl' або 'csv'
+        self.output_format = output_format
+        # Лічильники класів тональності, що оновлюються після кожної частини
+        self.tonality = {'negative': 0, 'neutral': 0, 'positive': 0}
+        # Ознака того, що останній аналіз було скасовано
+        self.cancelled = False
+
+    # Функція для потокового аналізу файлу із записом результатів по частинах.
+    # progress(lines_done, total_lines, tonality) викликається після кожної частини,
+    # а встановлений cancel_event зупиняє аналіз після поточної частини.
+    def score_file(self, file_path, output_path, json_path=None, progress=None, cancel_event=None):
+        self.tonality = {'negative': 0, 'neutral': 0, 'positive': 0}
+        self.cancelled = False
+        total_lines = count_lines(file_path) if progress is not None else None
+        lines_done = 0
+
+        with ResultSink(output_path, self.output_format) as sink:
+            chunks = iter_chunks(file_path, self.chunk_size)
+            for lines, predictions in iter_predictions(self.mlr, chunks, self.chunk_size):
+                sink.write(lines, predictions)
+                # Інкрементальне оновлення лічильників тональності
+                for prediction in predictions:
+                    self.tonality[prediction] += 1
+
+                lines_done += len(lines)
+                if progress is not None:
+                    progress(lines_done, total_lines, dict(self.tonality))
+
+                # Скасування: у файлі залишаються результати вже оброблених частин
+                if cancel_event is not None and cancel_event.is_set():
+                    self.cancelled = True
+                    break
+
+        # Необов'язковий експорт у словниковий формат text_tonality.json
+        if json_path is not None:
+            export_json(output_path, json_path, self.output_format)
+
+        return self.tonality
@@ -1,44 +1,217 @@
 import joblib
+import json
 import os
-import pandas as pd
-from imblearn.over_sampling import SMOTE
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
+
+# pandas, imblearn та модулі навчання sklearn потрібні лише для навчання і імпортуються під час навчання
 
 # Імпорт класу TextPreprocessor з файлу text_preprocessing.py
 from text_preprocessing import TextPreprocessor 
+# Імпорт функції балансування класів з файлу rebalancing.py
+from rebalancing import rebalance
+
+# Шлях до файлу з моделлю для векторизації тексту
+VECTORIZER_PATH = "models/vectorizer.pkl"
+# Шлях до файлу з вагами IDF для режиму хешування ознак
+HASHING_VECTORIZER_PATH = "models/hashing_vectorizer.npz"
+# Шлях до попередньо обробленого датасету для навчання
+DATASET_PATH = "dataset/pre_semeval_dataset.csv"
+
+# Функція для підрахунку частот документів однієї частини текстів у робочому процесі
+def _fit_shard(task):
+    params, texts = task
+    vectorizer = HashingTfidfVectorizer(**params)
+    vectorizer.partial_fit(texts)
+    return vectorizer
+
+class HashingTfidfVectorizer:
+    def __init__(self, n_features=2 ** 18, ngram_range=(1, 1), norm='l2', smooth_idf=True, sublinear_tf=False):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        # Фіксована кількість ознак (пам'ять не залежить від розміру словника)
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.norm = norm
+        self.smooth_idf = smooth_idf
+        self.sublinear_tf = sublinear_tf
+
+        # Безстанова хешувальна векторизація: сирі частоти термінів без нормалізації
+        self.hasher = HashingVectorizer(n_features=n_features,
+                                        ngram_range=self.ngram_range,
+                                        alternate_sign=False,
+                                        norm=None)
+
+        # Кількість документів з кожною ознакою та загальна кількість документів
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+        self.n_documents = 0
+        self.idf_ = None
+
+    # Функція для отримання параметрів векторизатора
+    def get_params(self):
+        return {'n_features': self.n_features,
+                'ngram_range': self.ngram_range,
+                'norm': self.norm,
+                'smooth_idf': self.smooth_idf,
+                'sublinear_tf': self.sublinear_tf}
+
+    # Функція для обчислення ваг IDF з частот документів (як у TfidfVectorizer)
+    def update_idf(self):
+        smooth = int(self.smooth_idf)
+        self.idf_ = np.log((self.n_documents + smooth) / (self.document_frequency + smooth)) + 1
+
+    # Функція для врахування нової частини текстів у частотах документів
+    def partial_fit(self, texts):
+        X = self.hasher.transform(texts)
+        # Після transform кожна ознака зустрічається в рядку не більше одного разу
+        self.document_frequency += np.bincount(X.indices, minlength=self.n_features)
+        self.n_documents += X.shape[0]
+        self.update_idf()
+        return self
+
+    # Функція для об'єднання частот документів, підрахованих на іншій частині даних
+    def merge(self, other):
+        if other.get_params() != self.get_params():
+            raise ValueError("Cannot merge hashing vectorizers with different parameters")
+        self.document_frequency += other.document_frequency
+        self.n_documents += other.n_documents
+        self.update_idf()
+        return self
+
+    # Функція для навчання ваг IDF на всіх текстах
+    def fit(self, texts):
+        self.document_frequency[:] = 0
+        self.n_documents = 0
+        return self.partial_fit(texts)
+
+    # Функція для паралельного навчання ваг IDF: кожна частина обробляється окремим процесом
+    def fit_parallel(self, texts, n_workers=None, chunk_size=10000):
+        from multiprocessing import Pool
+
+        texts = list(texts)
+        tasks = [(self.get_params(), texts[start:start + chunk_size]) for start in range(0, len(texts), chunk_size)]
+        self.document_frequency[:] = 0
+        self.n_documents = 0
+
+        # Спільний словник не потрібен: результати частин лише підсумовуються
+        with Pool(n_workers or os.cpu_count() or 1) as pool:
+            for shard in pool.imap_unordered(_fit_shard, tasks):
+                self.merge(shard)
+        return self
+
+    # Функція для векторизації текстів у матрицю TF-IDF
+    def transform(self, texts):
+        from sklearn.preprocessing import normalize
+
+        if self.idf_ is None:
+            raise ValueError("HashingTfidfVectorizer is not fitted")
+
+        X = self.hasher.transform(texts)
+        if self.sublinear_tf:
+            np.log(X.data, out=X.data)
+            X.data += 1
+        # Зважування кожного ненульового значення вагою IDF його ознаки
+        X.data *= self.idf_[X.indices]
+        if self.norm is not None:
+            X = normalize(X, norm=self.norm, copy=False)
+        return X
+
+    # Функція для навчання ваг IDF та векторизації тих самих текстів
+    def fit_transform(self, texts):
+        texts = list(texts)
+        return self.fit(texts).transform(texts)
+
+    # Функція для збереження параметрів та ваг IDF (словник не зберігається)
+    def save(self, path=HASHING_VECTORIZER_PATH):
+        with open(path, 'wb') as file:
+            np.savez(file,
+                     params=np.array(json.dumps({**self.get_params(), 'ngram_range': list(self.ngram_range)})),
+                     document_frequency=self.document_frequency,
+                     n_documents=np.array(self.n_documents))
+
+    # Функція для завантаження векторизатора з файлу
+    @classmethod
+    def load(cls, path=HASHING_VECTORIZER_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            vectorizer = cls(**json.loads(str(data['params'])))
+            vectorizer.document_frequency = data['document_frequency'].astype(np.int64)
+            vectorizer.n_documents = int(data['n_documents'])
+        vectorizer.update_idf()
+        return vectorizer
 
 class TextVectorizer:
-    def __init__(self):    
+    def __init__(self, load=True, hashing=False, n_features=2 ** 18):    
+        # Режим хешування ознак: фіксована кількість ознак замість словника
+        self.hashing = hashing
+        self.n_features = n_features
+
         # Ініціалізація класу TextVectorizer
-        self.load_vectorizer()  # Завантаження моделі для векторизації тексту
+        if load:
+            self.load_vectorizer()  # Завантаження моделі для векторизації тексту
+        else:
+            self.vectorizer = None  # Модель буде встановлена пізніше (наприклад, з артефакту)
         self.textPreprocessor = TextPreprocessor()  # Ініціалізація TextPreprocessor для попередньої обробки тексту
         
     # Функція для встановлення моделі для векторизації тексту
-    def set_vectorizer(self, ngram_range=(1, 1), max_df=1.0, min_df=0, norm='l2'):
-        # Створення об'єкта TfidfVectorizer для векторизації тексту з заданими параметрами
-        self.vectorizer = TfidfVectorizer(ngram_range=ngram_range,
-                                      max_df=max_df,
-                                      min_df=min_df,
-                                      norm=norm)
+    # (rebalance - стратегія балансування класів: 'smote', 'class_weight', 'random_oversample', 'sparse_smote', 'none')
+    def set_vectorizer(self, ngram_range=(1, 1), max_df=1.0, min_df=0, norm='l2', rebalance='smote'):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        if self.hashing:
+            # Хешування ознак не має словника, тому max_df та min_df не застосовуються
+            self.vectorizer = HashingTfidfVectorizer(n_features=self.n_features,
+                                                     ngram_range=ngram_range,
+                                                     norm=norm)
+        else:
+            # Створення об'єкта TfidfVectorizer для векторизації тексту з заданими параметрами
+            self.vectorizer = TfidfVectorizer(ngram_range=tuple(ngram_range),
+                                          max_df=max_df,
+                                          min_df=min_df,
+                                          norm=norm)
         
-        # Ініціалізація SMOTE для оверсемплінгу
-        self.smote = SMOTE(random_state=42, k_neighbors=1)
+        # Ініціалізація SMOTE для оверсемплінгу (imblearn потрібен лише для цієї стратегії)
+        if rebalance == 'smote':
+            from imblearn.over_sampling import SMOTE
+            self.smote = SMOTE(random_state=42, k_neighbors=1)
+        else:
+            self.smote = None
+        self.rebalance = rebalance
       
     # Функція для навчання моделі для векторизації тексту
-    def train_vectorizer(self, test_size=0.2, random_state=42):
+    def train_vectorizer(self, test_size=0.2, random_state=42, save=True, use_cache=True, vectorizer_params=None):
+        import pandas as pd
+        from sklearn.model_selection import train_test_split
+        from feature_cache import FeatureCache, feature_cache_key
+
+        # Встановлення моделі для векторизації тексту та моделі для оверсемплінгу
+        self.set_vectorizer(**(vectorizer_params or {}))
+
+        # Повторне навчання з тими самими даними та параметрами використовує збережені матриці
+        # без читання CSV, векторизації та балансування класів
+        if use_cache:
+            feature_cache = FeatureCache()
+            key = feature_cache_key(DATASET_PATH, self.vectorizer, self.smote,
+                                    rebalance=self.rebalance, test_size=test_size, random_state=random_state,
+                                    columns=["neg_cleaned_text", "label"])
+            cached = feature_cache.load(key)
+            if cached is not None:
+                self.vectorizer = cached['vectorizer']
+                self.X_train, self.X_test = cached['X_train'], cached['X_test']
+                self.y_train, self.y_test = cached['y_train'], cached['y_test']
+                if save:
+                    self.save_vectorizer()
+                return
+
         # Завантаження набору даних
-        dataset = pd.read_csv("dataset/pre_semeval_dataset.csv", delimiter='\t', encoding='utf-8')
+        dataset = pd.read_csv(DATASET_PATH, delimiter='\t', encoding='utf-8')
         dataset = dataset.dropna()
 
         # Видобуття тексту та міток з набору даних
         self.text = dataset["neg_cleaned_text"]
         self.label = dataset["label"]
 
-        # Встановлення моделі для векторизації тексту та моделі для оверсемплінгу
-        self.set_vectorizer()
+        # Векторизація тексту та балансування класів
         self.vectorized_text = self.vectorizer.fit_transform(self.text)
-        self.X, self.y = self.smote.fit_resample(self.vectorized_text, self.label)
+        self.X, self.y = rebalance(self.vectorized_text, self.label, self.rebalance, random_state=42, k_neighbors=1)
 
         # Розділення даних на навчальний та тестувальний набори
         self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(self.X,
@@ -46,18 +219,52 @@ class TextVectorizer:
                                                                                 stratify=self.y,
                                                                                 test_size=test_size,
                                                                                 random_state=random_state)
+
+        # Збереження матриць ознак для наступних запусків навчання
+        if use_cache:
+            feature_cache.save(key, self.vectorizer, self.X_train, self.X_test, self.y_train, self.y_test)
       
         # Збереження навченої моделі для векторизації тексту
-        self.save_vectorizer()
+        if save:
+            self.save_vectorizer()
+
+    # Функція для попередньої обробки тексту перед векторизацією
+    def preprocess_text(self, text):
+        text = self.textPreprocessor.cleaning_text(text)  # Очищення тексту
+        text = self.textPreprocessor.detect_negations(text)  # Виявлення заперечень у тексті
+        return text
 
     # Функція для векторизації тексту
     def vectorize_text(self, text):
         # Попередня обробка вхідного тексту
-        text = self.textPreprocessor.cleaning_text(text)  # Очищення тексту
-        text = self.textPreprocessor.detect_negations(text)  # Виявлення заперечень у тексті
+        text = self.preprocess_text(text)
         
         # Векторизація попередньо обробленого тексту
-        return self.vectorizer.transform([text])
+        return self.transform([text])
+
+    # Функція для векторизації списку текстів одним викликом transform
+    def vectorize_texts(self, texts):
+        # Очищення кожного тексту зі списку
+        texts = [self.textPreprocessor.cleaning_text(text) for text in texts]
+
+        # Векторизація очищених текстів
+        return self.vectorize_cleaned_texts(texts)
+
+    # Функція для виявлення заперечень у вже очищених текстах
+    def preprocess_cleaned_texts(self, texts):
+        return [self.textPreprocessor.detect_negations(text) for text in texts]
+
+    # Функція для векторизації вже очищених текстів
+    def vectorize_cleaned_texts(self, texts):
+        # Виявлення заперечень у кожному тексті
+        texts = self.preprocess_cleaned_texts(texts)
+
+        # Векторизація всього списку за один прохід
+        return self.transform(texts)
+
+    # Функція для перетворення попередньо оброблених текстів у матрицю TF-IDF
+    def transform(self, texts):
+        return self.vectorizer.transform(texts)
      
     # Функція для отримання навчальних та тестових наборів
     def get_train_test(self):
@@ -65,15 +272,26 @@ class TextVectorizer:
 
     # Функція для збереження навченої моделі для векторизації тексту
     def save_vectorizer(self):
-        # Збереження моделі векторизації за допомогою бібліотеки joblib
-        joblib.dump(self.vectorizer, "models/vectorizer.pkl") 
+        if self.hashing:
+            # Збереження лише параметрів та ваг IDF
+            self.vectorizer.save(HASHING_VECTORIZER_PATH)
+        else:
+            # Збереження моделі векторизації за допомогою бібліотеки joblib
+            joblib.dump(self.vectorizer, VECTORIZER_PATH) 
+
+    # Функція для отримання шляху до файлу векторизатора для поточного режиму
+    def vectorizer_path(self):
+        return HASHING_VECTORIZER_PATH if self.hashing else VECTORIZER_PATH
 
     # Функція для завантаження навченої моделі для векторизації тексту
     def load_vectorizer(self):
         # Перевірка наявності файлу з моделлю
-        if os.path.exists("models/vectorizer.pkl"): 
-            # Завантаження моделі векторизації за допомогою joblib
-            self.vectorizer = joblib.load("models/vectorizer.pkl")
+        if os.path.exists(self.vectorizer_path()): 
+            # Завантаження векторизатора з хешуванням ознак або моделі векторизації за допомогою joblib
+            if self.hashing:
+                self.vectorizer = HashingTfidfVectorizer.load(HASHING_VECTORIZER_PATH)
+            else:
+                self.vectorizer = joblib.load(VECTORIZER_PATH)
         else:
             # Повідомлення про відсутність моделі
             print("No vectorizer model found.")